@@ -0,0 +1,89 @@
+from .binary import BinaryCatalog, StringTable
+from .changes import (
+    CatalogVersion,
+    VersionHistory,
+    content_hash,
+    diff_versions,
+    model_key,
+    split_model_key,
+)
+from .compact import CompactCatalog, CompactCatalogBuilder, StringPool
+from .facets import FacetIndex, FacetResult, InvalidFilter, parse_filters
+from .matching import ReferenceIndex, lookup_key
+from .ordering import BRAND_SORT_FIELDS, BrandOrderings
+from .payloads import EncodedPayload, encode_json, etag_matches, parse_accept_encoding
+from .projection import InvalidFields, omit_fields, parse_fields, project_layout
+from .schemas import (
+    BatchLookupEntry,
+    BatchLookupItem,
+    BatchLookupRequest,
+    BatchLookupResponse,
+    BrandInfo,
+    BrandsResponse,
+    BrandWithModels,
+    CaseInfo,
+    CatalogChangesResponse,
+    CatalogResponse,
+    ChangedModel,
+    MarketPrice,
+    MarketPriceHistory,
+    MovementInfo,
+    RemovedModel,
+    WatchModelInfo,
+)
+from .search import InvalidCursor, SearchHit, SearchIndex
+from .store import LITE_LAYOUT, LITE_OMITTED_FIELDS, CatalogSnapshot, CatalogStore, build_search_text
+
+__all__ = [
+    "BinaryCatalog",
+    "StringTable",
+    "CatalogVersion",
+    "VersionHistory",
+    "content_hash",
+    "diff_versions",
+    "model_key",
+    "split_model_key",
+    "CompactCatalog",
+    "CompactCatalogBuilder",
+    "StringPool",
+    "FacetIndex",
+    "FacetResult",
+    "InvalidFilter",
+    "parse_filters",
+    "ReferenceIndex",
+    "lookup_key",
+    "BRAND_SORT_FIELDS",
+    "BrandOrderings",
+    "EncodedPayload",
+    "encode_json",
+    "etag_matches",
+    "parse_accept_encoding",
+    "InvalidFields",
+    "omit_fields",
+    "parse_fields",
+    "project_layout",
+    "BatchLookupEntry",
+    "BatchLookupItem",
+    "BatchLookupRequest",
+    "BatchLookupResponse",
+    "BrandInfo",
+    "BrandsResponse",
+    "BrandWithModels",
+    "CaseInfo",
+    "CatalogChangesResponse",
+    "CatalogResponse",
+    "ChangedModel",
+    "MarketPrice",
+    "MarketPriceHistory",
+    "MovementInfo",
+    "RemovedModel",
+    "WatchModelInfo",
+    "InvalidCursor",
+    "SearchHit",
+    "SearchIndex",
+    "LITE_LAYOUT",
+    "LITE_OMITTED_FIELDS",
+    "CatalogSnapshot",
+    "CatalogStore",
+    "build_search_text",
+]
@@ -0,0 +1,90 @@
+import json
+import mmap
+import struct
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict
+
+from .compact import CompactCatalog, storage_columns
+
+MAGIC = b"WCCAT002"
+HASH_SIZE = 8
+_PREFIX = struct.Struct("<8sQ")
+_ALIGNMENT = 8
+
+
+class StringTable(Sequence):
+    """String pool backed by an offsets array into one UTF-8 blob."""
+
+    def __init__(self, offsets: memoryview, data: memoryview) -> None:
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+
+class BinaryCatalog:
+    """A `catalog_bundle.bin` file mapped read-only into memory.
+
+    Written by the crawler's transform pipeline. Column sections are cast
+    in place, so nothing is parsed or copied at open time and every process
+    mapping the same file shares its page-cache pages. The revision and
+    per-model content hashes are stored by the writer, so opening the file
+    encodes nothing either.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        if len(buffer) < _PREFIX.size:
+            raise ValueError(f"{path} is not a binary catalog")
+        magic, header_length = _PREFIX.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary catalog (magic {magic!r})")
+        header_end = _PREFIX.size + header_length
+        header = json.loads(bytes(buffer[_PREFIX.size:header_end]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {header['byteorder']}-endian host")
+
+        data_start = header_end + (-header_end % _ALIGNMENT)
+        sections: Dict[str, memoryview] = {}
+        for name, (typecode, offset, count) in header["sections"].items():
+            start = data_start + offset
+            size = count * struct.calcsize(typecode)
+            section = buffer[start:start + size]
+            if len(section) != size:
+                raise ValueError(f"{path} is truncated in section {name!r}")
+            sections[name] = section.cast(typecode)
+
+        required = [
+            *storage_columns(),
+            ("strings.offsets", "Q"),
+            ("strings.data", "B"),
+            ("model_hashes", "B"),
+        ]
+        for name, typecode in required:
+            section = sections.get(name)
+            if section is None or section.format != typecode:
+                raise ValueError(f"{path} has no {typecode!r} section {name!r}")
+
+        self.version: str = header["version"]
+        self.revision: str = header["revision"]
+        strings = StringTable(sections.pop("strings.offsets"), sections.pop("strings.data"))
+        self._model_hashes = sections.pop("model_hashes")
+        brands = [tuple(brand) for brand in header["brands"]]
+        self.catalog = CompactCatalog(strings, sections, brands)
+        if len(self.catalog) != header["count"]:
+            raise ValueError(f"{path} has {len(self.catalog)} models, header says {header['count']}")
+        if len(self._model_hashes) != len(self.catalog) * HASH_SIZE:
+            raise ValueError(f"{path} has {len(self._model_hashes)} model hash bytes for {len(self.catalog)} models")
+
+    def model_hash(self, ordinal: int) -> bytes:
+        """Content hash of the model's serialized body, as stored by the writer."""
+        start = ordinal * HASH_SIZE
+        return bytes(self._model_hashes[start:start + HASH_SIZE])
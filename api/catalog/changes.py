@@ -0,0 +1,62 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_HISTORY_SIZE = 8
+
+
+def content_hash(data: bytes, digest_size: int = 8) -> bytes:
+    return hashlib.blake2b(data, digest_size=digest_size).digest()
+
+
+def model_key(brand_id: str, reference: str) -> str:
+    return f"{brand_id}:{reference}"
+
+
+def split_model_key(key: str) -> Tuple[str, str]:
+    brand_id, _, reference = key.partition(":")
+    return brand_id, reference
+
+
+@dataclass(frozen=True)
+class CatalogVersion:
+    revision: str
+    model_hashes: Dict[str, bytes]
+
+
+class VersionHistory:
+    """Immutable bounded ring of recently applied bundles, newest last."""
+
+    def __init__(self, size: int = DEFAULT_HISTORY_SIZE, versions: Tuple[CatalogVersion, ...] = ()) -> None:
+        self.size = max(size, 1)
+        self._versions = tuple(versions)[-self.size:]
+
+    def appended(self, version: CatalogVersion) -> "VersionHistory":
+        versions = self._versions
+        if versions and versions[-1].revision == version.revision:
+            versions = versions[:-1]
+        return VersionHistory(self.size, versions + (version,))
+
+    def get(self, revision: str) -> Optional[CatalogVersion]:
+        for version in reversed(self._versions):
+            if version.revision == revision:
+                return version
+        return None
+
+    def revisions(self) -> List[str]:
+        return [version.revision for version in self._versions]
+
+
+def diff_versions(old: CatalogVersion, new: CatalogVersion) -> Tuple[List[str], List[str], List[str]]:
+    """Return (added, changed, removed) model keys between two versions."""
+    added: List[str] = []
+    changed: List[str] = []
+    old_hashes = old.model_hashes
+    for key, digest in new.model_hashes.items():
+        previous = old_hashes.get(key)
+        if previous is None:
+            added.append(key)
+        elif previous != digest:
+            changed.append(key)
+    removed = [key for key in old_hashes if key not in new.model_hashes]
+    return added, changed, removed
@@ -0,0 +1,265 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .schemas import BrandWithModels
+
+STR = "str"
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+STR_LIST = "str_list"
+POINTS = "points"
+
+NONE_INT = -(2 ** 63)
+NONE_STR = -1
+NONE_BOOL = -1
+
+Layout = Tuple[Tuple[str, Any], ...]
+
+# Field layout of WatchModelInfo, in serialization order. Nested tuples are
+# optional sub-objects; their presence is tracked in a flag column named
+# after the object.
+MODEL_LAYOUT: Layout = (
+    ("reference", STR),
+    ("reference_aliases", STR_LIST),
+    ("display_name", STR),
+    ("collection", STR),
+    ("style", STR),
+    ("production_year_start", INT),
+    ("production_year_end", INT),
+    ("case", (
+        ("diameter_mm", FLOAT),
+        ("thickness_mm", FLOAT),
+        ("material", STR),
+        ("bezel_material", STR),
+        ("crystal", STR),
+        ("water_resistance_m", INT),
+        ("lug_width_mm", FLOAT),
+        ("dial_color", STR),
+        ("dial_numerals", STR),
+    )),
+    ("movement", (
+        ("type", STR),
+        ("caliber", STR),
+        ("power_reserve_hours", INT),
+        ("frequency_bph", INT),
+        ("jewels_count", INT),
+    )),
+    ("complications", STR_LIST),
+    ("features", STR_LIST),
+    ("retail_price_usd", INT),
+    ("catalog_image_url", STR),
+    ("market_price", (
+        ("min_usd", INT),
+        ("max_usd", INT),
+        ("median_usd", INT),
+        ("listings", INT),
+        ("updated_at", STR),
+    )),
+    ("market_price_history", (
+        ("source", STR),
+        ("points", POINTS),
+    )),
+    ("watchcharts_id", STR),
+    ("watchcharts_url", STR),
+    ("is_current", BOOL),
+)
+
+_TYPECODES = {STR: "i", INT: "q", FLOAT: "d", BOOL: "b"}
+
+
+def iter_columns(
+    layout: Layout = MODEL_LAYOUT,
+    prefix: str = "",
+) -> Iterator[Tuple[str, str]]:
+    """Yield (column name, kind) for every leaf and object flag in a layout."""
+    for name, kind in layout:
+        path = f"{prefix}{name}"
+        if isinstance(kind, tuple):
+            yield path, BOOL
+            yield from iter_columns(kind, f"{path}.")
+        else:
+            yield path, kind
+
+
+def storage_columns() -> Iterator[Tuple[str, str]]:
+    """Yield (array name, typecode) for every array a CompactCatalog holds."""
+    yield "brand", "I"
+    for path, kind in iter_columns():
+        if kind == STR_LIST:
+            yield path + ".offsets", "I"
+            yield path + ".values", "i"
+        elif kind == POINTS:
+            yield path, "b"
+            yield path + ".offsets", "I"
+            yield path + ".ts", "d"
+            yield path + ".price", "d"
+        else:
+            yield path, _TYPECODES[kind]
+
+
+class StringPool:
+    """Interns strings so repeated values (materials, calibers) are stored once."""
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE_STR
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+
+Column = Union[array, memoryview]
+
+
+class CompactCatalog:
+    """Struct-of-arrays storage for every model in a bundle.
+
+    Scalars live in typed arrays indexed by model ordinal, strings are ids
+    into a shared pool, list fields are (offsets, values) pairs, and price
+    history points are two flat float arrays. `model_dict` rebuilds the
+    plain dict a client sees; no Pydantic objects are kept.
+    """
+
+    def __init__(
+        self,
+        strings: Sequence[str],
+        columns: Dict[str, Column],
+        brands: List[Tuple[str, str, Optional[str], Optional[str], int, int]],
+    ) -> None:
+        self.strings = strings
+        self.columns = columns
+        self.brands = brands
+        self._model_brand = columns["brand"]
+        self._size = len(self._model_brand)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def brand_range(self, brand_index: int) -> range:
+        _, _, _, _, start, stop = self.brands[brand_index]
+        return range(start, stop)
+
+    def brand_info(self, brand_index: int) -> Dict[str, Optional[str]]:
+        brand_id, name, country, tier, _, _ = self.brands[brand_index]
+        return {"id": brand_id, "name": name, "country": country, "tier": tier}
+
+    def model_brand(self, ordinal: int) -> int:
+        return self._model_brand[ordinal]
+
+    def string(self, column: str, ordinal: int) -> Optional[str]:
+        string_id = self.columns[column][ordinal]
+        return None if string_id == NONE_STR else self.strings[string_id]
+
+    def string_list(self, column: str, ordinal: int) -> List[str]:
+        offsets = self.columns[column + ".offsets"]
+        values = self.columns[column + ".values"]
+        return [self.strings[values[i]] for i in range(offsets[ordinal], offsets[ordinal + 1])]
+
+    def model_dict(self, ordinal: int, layout: Layout = MODEL_LAYOUT) -> Dict[str, Any]:
+        """Rebuild one model; a pruned `layout` reads only the columns it names."""
+        return self._materialize(layout, "", ordinal)
+
+    def _materialize(self, layout: Layout, prefix: str, ordinal: int) -> Dict[str, Any]:
+        columns = self.columns
+        strings = self.strings
+        result: Dict[str, Any] = {}
+        for name, kind in layout:
+            path = prefix + name
+            if isinstance(kind, tuple):
+                if columns[path][ordinal]:
+                    result[name] = self._materialize(kind, path + ".", ordinal)
+                else:
+                    result[name] = None
+            elif kind == STR:
+                string_id = columns[path][ordinal]
+                result[name] = None if string_id == NONE_STR else strings[string_id]
+            elif kind == INT:
+                value = columns[path][ordinal]
+                result[name] = None if value == NONE_INT else value
+            elif kind == FLOAT:
+                value = columns[path][ordinal]
+                result[name] = None if value != value else value
+            elif kind == BOOL:
+                value = columns[path][ordinal]
+                result[name] = None if value == NONE_BOOL else bool(value)
+            elif kind == STR_LIST:
+                offsets = columns[path + ".offsets"]
+                values = columns[path + ".values"]
+                result[name] = [strings[values[i]] for i in range(offsets[ordinal], offsets[ordinal + 1])]
+            elif kind == POINTS:
+                if not columns[path][ordinal]:
+                    result[name] = None
+                    continue
+                offsets = columns[path + ".offsets"]
+                timestamps = columns[path + ".ts"]
+                prices = columns[path + ".price"]
+                result[name] = [
+                    [timestamps[i], prices[i]]
+                    for i in range(offsets[ordinal], offsets[ordinal + 1])
+                ]
+        return result
+
+
+class CompactCatalogBuilder:
+    """Packs validated models into a CompactCatalog, one brand at a time."""
+
+    def __init__(self) -> None:
+        self.pool = StringPool()
+        self.columns: Dict[str, array] = {}
+        for name, typecode in storage_columns():
+            self.columns[name] = array(typecode, [0] if name.endswith(".offsets") else [])
+        self.brands: List[Tuple[str, str, Optional[str], Optional[str], int, int]] = []
+        self._size = 0
+
+    def add_brand(self, brand: BrandWithModels) -> range:
+        start = self._size
+        brand_index = len(self.brands)
+        for model in brand.models:
+            self.columns["brand"].append(brand_index)
+            self._pack(MODEL_LAYOUT, "", model)
+            self._size += 1
+        self.brands.append((brand.id, brand.name, brand.country, brand.tier, start, self._size))
+        return range(start, self._size)
+
+    def _pack(self, layout: Layout, prefix: str, obj: Any) -> None:
+        columns = self.columns
+        for name, kind in layout:
+            path = prefix + name
+            value = getattr(obj, name) if obj is not None else None
+            if isinstance(kind, tuple):
+                columns[path].append(0 if value is None else 1)
+                self._pack(kind, path + ".", value)
+            elif kind == STR:
+                columns[path].append(self.pool.intern(value))
+            elif kind == INT:
+                columns[path].append(NONE_INT if value is None else value)
+            elif kind == FLOAT:
+                columns[path].append(float("nan") if value is None else value)
+            elif kind == BOOL:
+                columns[path].append(NONE_BOOL if value is None else int(value))
+            elif kind == STR_LIST:
+                values = columns[path + ".values"]
+                for item in value or ():
+                    values.append(self.pool.intern(item))
+                columns[path + ".offsets"].append(len(values))
+            elif kind == POINTS:
+                timestamps = columns[path + ".ts"]
+                prices = columns[path + ".price"]
+                columns[path].append(0 if value is None else 1)
+                for point in value or ():
+                    if len(point) != 2:
+                        raise ValueError(f"History point must be [timestamp, price], got {point!r}")
+                    timestamps.append(point[0])
+                    prices.append(point[1])
+                columns[path + ".offsets"].append(len(timestamps))
+
+    def build(self) -> CompactCatalog:
+        return CompactCatalog(self.pool.strings, self.columns, self.brands)
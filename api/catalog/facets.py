@@ -0,0 +1,217 @@
+from array import array
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .compact import NONE_INT, Column, CompactCatalog
+
+# Query name -> compact column. Missing values become NaN and never match
+# a range or sort ahead of present ones.
+RANGE_FIELDS: Dict[str, str] = {
+    "diameter_mm": "case.diameter_mm",
+    "thickness_mm": "case.thickness_mm",
+    "lug_width_mm": "case.lug_width_mm",
+    "water_resistance_m": "case.water_resistance_m",
+    "power_reserve_hours": "movement.power_reserve_hours",
+    "frequency_bph": "movement.frequency_bph",
+    "jewels_count": "movement.jewels_count",
+    "retail_price_usd": "retail_price_usd",
+    "market_price_usd": "market_price.median_usd",
+    "listings": "market_price.listings",
+}
+
+FACET_FIELDS: Dict[str, str] = {
+    "material": "case.material",
+    "bezel_material": "case.bezel_material",
+    "crystal": "case.crystal",
+    "dial_color": "case.dial_color",
+    "dial_numerals": "case.dial_numerals",
+    "movement_type": "movement.type",
+    "collection": "collection",
+    "style": "style",
+}
+
+LIST_FACET_FIELDS: Dict[str, str] = {
+    "complications": "complications",
+}
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def _parse_bound(name: str, text: str) -> Optional[float]:
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        raise InvalidFilter(f"Invalid bound {text!r} for '{name}'") from None
+
+
+def parse_filters(params: Iterable[Tuple[str, str]]) -> Tuple[Dict[str, Range], Dict[str, List[str]]]:
+    """Split query parameters into range filters and facet filters.
+
+    Ranges are written `min..max` with either side optional, or a single
+    value for an exact match. Facets may repeat (`material=Steel&material=Gold`)
+    and match any of the given values, case-insensitively.
+    """
+    ranges: Dict[str, Range] = {}
+    facets: Dict[str, List[str]] = {}
+    for name, value in params:
+        if name in RANGE_FIELDS:
+            low, separator, high = value.partition("..")
+            if not separator:
+                high = low
+            ranges[name] = (_parse_bound(name, low), _parse_bound(name, high))
+        elif name == "brand" or name in FACET_FIELDS or name in LIST_FACET_FIELDS:
+            facets.setdefault(name, []).append(value)
+        else:
+            raise InvalidFilter(f"Unknown filter '{name}'")
+    return ranges, facets
+
+
+class FacetResult(NamedTuple):
+    ordinals: List[int]
+    total: int
+    facets: Dict[str, Dict[str, int]]
+
+
+class _Facet:
+    """One categorical field as (owner ordinal, dense value code) pairs.
+
+    Single-valued fields have at most one pair per model, list fields one
+    per list item, so filtering and counting work the same for both.
+    """
+
+    def __init__(self, size: int, owners: np.ndarray, values: np.ndarray, labels: Sequence[str]) -> None:
+        unique, codes = np.unique(values, return_inverse=True)
+        self.size = size
+        self.owners = owners
+        self.codes = codes.astype(np.int32)
+        self.labels = [labels[int(value)] for value in unique]
+        self._codes_by_label: Dict[str, List[int]] = {}
+        for code, label in enumerate(self.labels):
+            self._codes_by_label.setdefault(label.lower(), []).append(code)
+        self._bitmaps: Dict[int, np.ndarray] = {}
+
+    def bitmap(self, code: int) -> np.ndarray:
+        bitmap = self._bitmaps.get(code)
+        if bitmap is None:
+            bitmap = np.zeros(self.size, dtype=bool)
+            bitmap[self.owners[self.codes == code]] = True
+            self._bitmaps[code] = bitmap
+        return bitmap
+
+    def mask(self, labels: Sequence[str]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for label in labels:
+            for code in self._codes_by_label.get(label.lower(), ()):
+                mask |= self.bitmap(code)
+        return mask
+
+    def counts(self, mask: np.ndarray) -> Dict[str, int]:
+        counts = np.bincount(self.codes[mask[self.owners]], minlength=len(self.labels))
+        order = np.lexsort((np.arange(len(counts)), -counts))
+        return {self.labels[i]: int(counts[i]) for i in order if counts[i]}
+
+
+def numeric_column(column: Column) -> np.ndarray:
+    """A numeric column as float64, NaN where the value is missing."""
+    typecode = column.typecode if isinstance(column, array) else column.format
+    if typecode == "d":
+        return np.frombuffer(column, dtype=np.float64)
+    values = np.frombuffer(column, dtype=np.int64)
+    result = values.astype(np.float64)
+    result[values == NONE_INT] = np.nan
+    return result
+
+
+class FacetIndex:
+    """NumPy columns over a CompactCatalog for filtered, sorted listings.
+
+    Numeric fields are float64 arrays (NaN when missing) and categorical
+    fields keep a bitmap per value, built on first use. A query ANDs the
+    range masks with one OR-of-bitmaps per facet; facet counts for each
+    field apply every filter except that field's own, so a client can see
+    how many models each alternative value would return.
+    """
+
+    def __init__(self, catalog: CompactCatalog) -> None:
+        size = len(catalog)
+        everyone = np.arange(size, dtype=np.int64)
+        self.size = size
+        self.ranges: Dict[str, np.ndarray] = {
+            name: numeric_column(catalog.columns[path]) for name, path in RANGE_FIELDS.items()
+        }
+
+        brand_ids = [brand[0] for brand in catalog.brands]
+        self.facets: Dict[str, _Facet] = {
+            "brand": _Facet(size, everyone, np.frombuffer(catalog.columns["brand"], dtype=np.uint32), brand_ids),
+        }
+        for name, path in FACET_FIELDS.items():
+            ids = np.frombuffer(catalog.columns[path], dtype=np.int32)
+            present = ids >= 0
+            self.facets[name] = _Facet(size, everyone[present], ids[present], catalog.strings)
+        for name, path in LIST_FACET_FIELDS.items():
+            offsets = np.frombuffer(catalog.columns[path + ".offsets"], dtype=np.uint32)
+            ids = np.frombuffer(catalog.columns[path + ".values"], dtype=np.int32)
+            owners = np.repeat(everyone, np.diff(offsets))
+            self.facets[name] = _Facet(size, owners, ids, catalog.strings)
+
+    def query(
+        self,
+        ranges: Mapping[str, Range],
+        facets: Mapping[str, Sequence[str]],
+        sort: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> FacetResult:
+        base = np.ones(self.size, dtype=bool)
+        for name, (low, high) in ranges.items():
+            column = self.ranges.get(name)
+            if column is None:
+                raise InvalidFilter(f"Unknown range filter '{name}'")
+            if low is not None:
+                base &= column >= low
+            if high is not None:
+                base &= column <= high
+
+        facet_masks: Dict[str, np.ndarray] = {}
+        for name, labels in facets.items():
+            facet = self.facets.get(name)
+            if facet is None:
+                raise InvalidFilter(f"Unknown facet '{name}'")
+            facet_masks[name] = facet.mask(labels)
+
+        mask = base.copy()
+        for facet_mask in facet_masks.values():
+            mask &= facet_mask
+
+        counts: Dict[str, Dict[str, int]] = {}
+        for name, facet in self.facets.items():
+            if name in facet_masks:
+                others = base.copy()
+                for other, facet_mask in facet_masks.items():
+                    if other != name:
+                        others &= facet_mask
+            else:
+                others = mask
+            counts[name] = facet.counts(others)
+
+        selected = np.flatnonzero(mask)
+        if sort:
+            descending = sort.startswith("-")
+            column = self.ranges.get(sort.lstrip("-"))
+            if column is None:
+                raise InvalidFilter(f"Cannot sort by '{sort}'")
+            values = column[selected]
+            # Stable sort keeps catalog order among ties; NaN sorts last
+            # both ways because -NaN is still NaN.
+            order = np.argsort(-values if descending else values, kind="stable")
+            selected = selected[order]
+
+        page = selected[offset:offset + limit]
+        return FacetResult([int(ordinal) for ordinal in page], int(len(selected)), counts)
@@ -0,0 +1,128 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, TextIO
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+EMPTY_VERSION = "0.0.0"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class CatalogBundle:
+    """A bundle that is already in memory as a dict."""
+
+    def __init__(self, catalog: Dict[str, Any]) -> None:
+        self._catalog = catalog
+
+    @property
+    def version(self) -> str:
+        return self._catalog.get("version", EMPTY_VERSION)
+
+    def iter_brands(self) -> Iterator[Dict[str, Any]]:
+        yield from self._catalog.get("brands", [])
+
+
+class _JsonStream:
+    """Incremental reader over a JSON text file.
+
+    Values are decoded with `JSONDecoder.raw_decode` from a sliding buffer.
+    When a value is cut off by the end of the buffer the next read doubles
+    in size, so a large value is re-scanned O(log n) times, not O(n).
+    """
+
+    def __init__(self, handle: TextIO, chunk_size: int) -> None:
+        self._handle = handle
+        self._base_chunk_size = chunk_size
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                raise ValueError("Unexpected end of catalog bundle")
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in catalog bundle, found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A number touching the end of the buffer may be truncated.
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    self._chunk_size = self._base_chunk_size
+                    return value
+            self._chunk_size *= 2
+            self._fill()
+
+
+class StreamingBundle:
+    """Reads `catalog_bundle.json` one brand at a time.
+
+    Only the brand being decoded is held as a dict, so the full bundle never
+    exists as a single object tree. Top-level fields other than `brands`
+    are collected in `fields` and are complete once `iter_brands` finishes.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self._path = path
+        self._chunk_size = chunk_size
+        self.fields: Dict[str, Any] = {}
+
+    @property
+    def version(self) -> str:
+        return self.fields.get("version", EMPTY_VERSION)
+
+    def iter_brands(self) -> Iterator[Dict[str, Any]]:
+        with open(self._path, "r", encoding="utf-8") as handle:
+            stream = _JsonStream(handle, self._chunk_size)
+            stream.expect("{")
+            if stream.peek() == "}":
+                return
+            while True:
+                key = stream.value()
+                stream.expect(":")
+                if key == "brands":
+                    yield from self._iter_array(stream)
+                else:
+                    self.fields[key] = stream.value()
+                if stream.peek() == "}":
+                    return
+                stream.expect(",")
+
+    def _iter_array(self, stream: _JsonStream) -> Iterator[Dict[str, Any]]:
+        stream.expect("[")
+        if stream.peek() == "]":
+            stream.expect("]")
+            return
+        while True:
+            yield stream.value()
+            if stream.peek() == "]":
+                stream.expect("]")
+                return
+            stream.expect(",")
@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional, Tuple
+
+from reference_matcher import NORMALIZATION_RULES, generate_aliases, normalize_for_matching
+
+from .compact import CompactCatalog
+
+
+def lookup_key(reference: str, brand_id: Optional[str]) -> str:
+    """Brand-specific normalized form, compared case-insensitively."""
+    return normalize_for_matching(reference.strip().upper(), brand_id).upper()
+
+
+def _rule_group(brand_id: str) -> Optional[str]:
+    """The brand whose rules normalize `brand_id`'s keys; None for plain upper-casing."""
+    return brand_id if brand_id in NORMALIZATION_RULES else None
+
+
+class ReferenceIndex:
+    """Maps from reference keys to model ordinals, per brand and catalog-wide.
+
+    There are two tiers: references and aliases compared
+    case-insensitively, then the same strings plus the aliases
+    reference_matcher generates, normalized with the brand rules the
+    crawler uses when matching crawl data. The exact tier keeps "126610LV"
+    from resolving to a sibling that only shares its normalized base.
+    Within a brand canonical references win over aliases, then catalog
+    order. Across brands the brand listed first in the catalog wins.
+
+    Catalog-wide normalized keys are grouped by rule set: each brand with
+    its own rules, and one shared group for brands without any. An
+    unscoped lookup therefore normalizes the query once per rule set, not
+    once per brand.
+    """
+
+    def __init__(self, catalog: CompactCatalog) -> None:
+        self._brand_tiers: Dict[str, Tuple[Dict[str, int], Dict[str, int]]] = {}
+        self._exact: Dict[str, int] = {}
+        self._normalized: Dict[Optional[str], Dict[str, int]] = {}
+        for brand_index, (brand_id, *_rest) in enumerate(catalog.brands):
+            exact: Dict[str, int] = {}
+            normalized: Dict[str, int] = {}
+            ordinals = catalog.brand_range(brand_index)
+            for ordinal in ordinals:
+                reference = catalog.string("reference", ordinal)
+                exact.setdefault(reference.strip().upper(), ordinal)
+                normalized.setdefault(lookup_key(reference, brand_id), ordinal)
+            for ordinal in ordinals:
+                reference = catalog.string("reference", ordinal)
+                aliases: List[str] = catalog.string_list("reference_aliases", ordinal)
+                for alias in aliases:
+                    exact.setdefault(alias.strip().upper(), ordinal)
+                aliases.extend(generate_aliases(reference, brand_id))
+                for alias in aliases:
+                    normalized.setdefault(lookup_key(alias, brand_id), ordinal)
+            self._brand_tiers.setdefault(brand_id, (exact, normalized))
+            for key, ordinal in exact.items():
+                self._exact.setdefault(key, ordinal)
+            group = self._normalized.setdefault(_rule_group(brand_id), {})
+            for key, ordinal in normalized.items():
+                group.setdefault(key, ordinal)
+
+    def lookup(self, reference: str, brand_id: Optional[str] = None) -> Optional[int]:
+        """Resolve a near-miss reference, within one brand or across all of them."""
+        upper = reference.strip().upper()
+        if brand_id is not None:
+            exact, normalized = self._brand_tiers.get(brand_id, ({}, {}))
+            ordinal = exact.get(upper)
+            return ordinal if ordinal is not None else normalized.get(lookup_key(reference, brand_id))
+
+        ordinal = self._exact.get(upper)
+        if ordinal is not None:
+            return ordinal
+        # Ordinals follow catalog order and brands are contiguous, so the
+        # lowest match across rule sets belongs to the first-listed brand.
+        matches = [
+            ordinal
+            for group, keys in self._normalized.items()
+            if (ordinal := keys.get(lookup_key(reference, group))) is not None
+        ]
+        return min(matches) if matches else None
@@ -0,0 +1,61 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from .compact import NONE_STR, CompactCatalog
+from .facets import InvalidFilter, numeric_column
+
+# Sort name -> compact column for brand model listings. Names match the
+# /models sort fields where they overlap.
+BRAND_SORT_FIELDS: Dict[str, str] = {
+    "market_price_usd": "market_price.median_usd",
+    "retail_price_usd": "retail_price_usd",
+    "production_year_start": "production_year_start",
+    "display_name": "display_name",
+}
+
+
+def _string_ranks(catalog: CompactCatalog, column: str) -> np.ndarray:
+    """Case-insensitive collation rank of each model's string, NaN when missing."""
+    ids = np.frombuffer(catalog.columns[column], dtype=np.int32)
+    present = ids != NONE_STR
+    unique = np.unique(ids[present])
+    labels = [catalog.strings[int(string_id)].casefold() for string_id in unique]
+    rank_of_unique = np.empty(len(unique), dtype=np.float64)
+    rank_of_unique[sorted(range(len(unique)), key=labels.__getitem__)] = np.arange(len(unique))
+    ranks = np.full(len(ids), np.nan)
+    ranks[present] = rank_of_unique[np.searchsorted(unique, ids[present])]
+    return ranks
+
+
+class BrandOrderings:
+    """Precomputed model orderings for every brand and sort.
+
+    Each sort and direction is one stable lexsort by (brand, key) over the
+    whole catalog. Brands occupy contiguous ordinal ranges, so a brand's
+    ordering is simply the slice of that permutation at the brand's range
+    and a page is a slice of the slice. Missing values sort last in both
+    directions; ties keep catalog order.
+    """
+
+    def __init__(self, catalog: CompactCatalog) -> None:
+        self._catalog = catalog
+        brands = np.frombuffer(catalog.columns["brand"], dtype=np.uint32)
+        self._orders: Dict[str, np.ndarray] = {}
+        for name, path in BRAND_SORT_FIELDS.items():
+            if path == "display_name":
+                keys = _string_ranks(catalog, path)
+            else:
+                keys = numeric_column(catalog.columns[path])
+            self._orders[name] = np.lexsort((keys, brands)).astype(np.int32)
+            self._orders["-" + name] = np.lexsort((-keys, brands)).astype(np.int32)
+
+    def ordinals(self, brand_index: int, sort: Optional[str] = None) -> np.ndarray:
+        """The brand's model ordinals in `sort` order (catalog order if None)."""
+        ordinals = self._catalog.brand_range(brand_index)
+        if not sort:
+            return np.arange(ordinals.start, ordinals.stop, dtype=np.int32)
+        order = self._orders.get(sort)
+        if order is None:
+            raise InvalidFilter(f"Cannot sort brand models by '{sort}'")
+        return order[ordinals.start:ordinals.stop]
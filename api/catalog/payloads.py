@@ -0,0 +1,87 @@
+import gzip
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9
+
+
+def encode_json(value: Any) -> bytes:
+    """Compact UTF-8 JSON, byte-compatible with Pydantic's model_dump_json."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for item in (header or "").split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in parts[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+_ENTITY_TAG = re.compile(r'\s*(\*|(?:W/)?"[^"]*")\s*(?:,|$)')
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Weak comparison of `etag` against an If-None-Match header (RFC 9110).
+
+    The header may list several tags or be `*`; `W/` prefixes are ignored
+    on both sides. Malformed members are skipped rather than matched.
+    """
+    if not if_none_match or not etag:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for match in _ENTITY_TAG.finditer(if_none_match):
+        candidate = match.group(1)
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class EncodedPayload:
+    """A JSON body serialized once and compressed ahead of time.
+
+    Built when a catalog bundle is applied so requests only pick a variant
+    and hand the bytes to the response.
+    """
+
+    def __init__(self, body: bytes) -> None:
+        self.identity = body
+        self.variants: Dict[str, bytes] = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        weights = parse_accept_encoding(accept_encoding)
+        candidates: List[Tuple[float, int, str]] = []
+        for preference, coding in enumerate(("br", "gzip")):
+            if coding not in self.variants:
+                continue
+            weight = weights.get(coding, weights.get("*", 0.0))
+            if weight > 0:
+                candidates.append((weight, -preference, coding))
+        if candidates:
+            coding = max(candidates)[2]
+            return self.variants[coding], coding
+        return self.identity, None
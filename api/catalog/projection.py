@@ -0,0 +1,89 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .compact import MODEL_LAYOUT, Layout
+
+# Pruned layouts are tiny and shared by every endpoint and snapshot; the
+# bound only guards against clients inventing endless field combinations.
+LAYOUT_CACHE_SIZE = 256
+
+Fields = Tuple[str, ...]
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def parse_fields(text: Optional[str]) -> Optional[Fields]:
+    """Parse a `fields=` value into a canonical field set, or None for all fields.
+
+    Fields are comma-separated model field names; nested objects can be
+    selected whole (`market_price`) or by member (`market_price.median_usd`).
+    The result is canonical, so equivalent requests share cached
+    serializers, payloads and ETags: members of an object that is also
+    named whole are dropped, and an object whose members are all named is
+    collapsed to its name.
+    """
+    if text is None:
+        return None
+    paths = {path.strip() for path in text.split(",") if path.strip()}
+    if not paths:
+        return None
+    for path in paths:
+        _check_path(path)
+    return tuple(sorted(_canonical_paths(project_layout(tuple(sorted(paths))), MODEL_LAYOUT, "")))
+
+
+def _canonical_paths(pruned: Layout, full: Layout, prefix: str) -> Iterable[str]:
+    kinds = dict(full)
+    for name, kind in pruned:
+        if isinstance(kind, tuple) and kind != kinds[name]:
+            yield from _canonical_paths(kind, kinds[name], f"{prefix}{name}.")
+        else:
+            yield prefix + name
+
+
+def _check_path(path: str) -> None:
+    layout: Optional[Layout] = MODEL_LAYOUT
+    for name in path.split("."):
+        kinds = dict(layout) if layout is not None else {}
+        if name not in kinds:
+            raise InvalidFields(f"Unknown field '{path}'")
+        kind = kinds[name]
+        layout = kind if isinstance(kind, tuple) else None
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def project_layout(fields: Fields) -> Layout:
+    """MODEL_LAYOUT pruned to `fields`, keeping serialization order."""
+    tree: Dict[str, Any] = {}
+    for path in fields:
+        node = tree
+        *parents, leaf = path.split(".")
+        for name in parents:
+            child = node.setdefault(name, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[leaf] = None
+    return _prune(MODEL_LAYOUT, tree)
+
+
+def omit_fields(layout: Layout, names: Iterable[str]) -> Layout:
+    """`layout` without the given top-level fields."""
+    omitted = set(names)
+    return tuple((name, kind) for name, kind in layout if name not in omitted)
+
+
+def _prune(layout: Layout, tree: Dict[str, Any]) -> Layout:
+    pruned = []
+    for name, kind in layout:
+        if name not in tree:
+            continue
+        subtree = tree[name]
+        if subtree is None or not isinstance(kind, tuple):
+            pruned.append((name, kind))
+        else:
+            pruned.append((name, _prune(kind, subtree)))
+    return tuple(pruned)
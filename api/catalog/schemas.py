@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BrandInfo(BaseModel):
+    id: str
+    name: str
+    country: Optional[str] = None
+    tier: Optional[str] = None
+
+
+class MarketPrice(BaseModel):
+    min_usd: Optional[int] = None
+    max_usd: Optional[int] = None
+    median_usd: Optional[int] = None
+    listings: Optional[int] = None
+    updated_at: Optional[str] = None
+
+
+class MarketPriceHistory(BaseModel):
+    source: Optional[str] = None
+    points: Optional[List[List[float]]] = None
+
+
+class CaseInfo(BaseModel):
+    diameter_mm: Optional[float] = None
+    thickness_mm: Optional[float] = None
+    material: Optional[str] = None
+    bezel_material: Optional[str] = None
+    crystal: Optional[str] = None
+    water_resistance_m: Optional[int] = None
+    lug_width_mm: Optional[float] = None
+    dial_color: Optional[str] = None
+    dial_numerals: Optional[str] = None
+
+
+class MovementInfo(BaseModel):
+    type: Optional[str] = None
+    caliber: Optional[str] = None
+    power_reserve_hours: Optional[int] = None
+    frequency_bph: Optional[int] = None
+    jewels_count: Optional[int] = None
+
+
+class WatchModelInfo(BaseModel):
+    reference: str
+    reference_aliases: List[str] = []
+    display_name: str
+    collection: Optional[str] = None
+    style: Optional[str] = None
+    production_year_start: Optional[int] = None
+    production_year_end: Optional[int] = None
+    case: Optional[CaseInfo] = None
+    movement: Optional[MovementInfo] = None
+    complications: List[str] = []
+    features: List[str] = []
+    retail_price_usd: Optional[int] = None
+    catalog_image_url: Optional[str] = None
+    market_price: Optional[MarketPrice] = None
+    market_price_history: Optional[MarketPriceHistory] = None
+    watchcharts_id: Optional[str] = None
+    watchcharts_url: Optional[str] = None
+    is_current: Optional[bool] = None
+
+
+class BrandWithModels(BaseModel):
+    id: str
+    name: str
+    country: Optional[str] = None
+    tier: Optional[str] = None
+    models: List[WatchModelInfo]
+
+
+class CatalogResponse(BaseModel):
+    version: str
+    brands: List[BrandWithModels]
+
+
+class BrandsResponse(BaseModel):
+    brands: List[BrandInfo]
+
+
+class ChangedModel(WatchModelInfo):
+    brand_id: str
+
+
+class RemovedModel(BaseModel):
+    brand_id: str
+    reference: str
+
+
+class CatalogChangesResponse(BaseModel):
+    version: str
+    revision: str
+    since: str
+    brands: List[BrandInfo]
+    added: List[ChangedModel]
+    changed: List[ChangedModel]
+    removed: List[RemovedModel]
+
+
+class BatchLookupItem(BaseModel):
+    reference: Optional[str] = None
+    watchcharts_id: Optional[str] = None
+    brand: Optional[str] = None
+    etag: Optional[str] = None
+
+
+class BatchLookupRequest(BaseModel):
+    items: List[BatchLookupItem] = Field(..., max_length=200)
+    include_market: bool = True
+
+
+class BatchLookupEntry(BaseModel):
+    index: int
+    etag: str
+    model: ChangedModel
+    market: Optional[Dict[str, Any]] = None
+
+
+class BatchLookupResponse(BaseModel):
+    revision: str
+    results: List[BatchLookupEntry]
+    not_modified: List[int]
+    not_found: List[int]
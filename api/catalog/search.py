@@ -0,0 +1,203 @@
+import base64
+import heapq
+import json
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+TRIGRAM_SIZE = 3
+
+# Relevance tiers, best first.
+SCORE_REFERENCE = 4
+SCORE_NAME_PREFIX = 3
+SCORE_TOKENS = 2
+SCORE_SUBSTRING = 1
+SCORE_PIECES = 0
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+class SearchHit(NamedTuple):
+    score: int
+    ordinal: int
+
+
+def _rank(hit: SearchHit) -> Tuple[int, int]:
+    # Higher score first, then catalog order, so every hit has a unique
+    # position and pages never overlap or skip.
+    return -hit.score, hit.ordinal
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_token(values: List[Any]) -> str:
+    """Opaque URL-safe cursor holding a small JSON list."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_token(cursor: str) -> List[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(values, list):
+        raise ValueError("cursor is not a list")
+    return values
+
+
+def encode_cursor(revision: str, hit: SearchHit) -> str:
+    return encode_token([revision, hit.score, hit.ordinal])
+
+
+def decode_cursor(cursor: str, revision: str) -> SearchHit:
+    try:
+        cursor_revision, score, ordinal = decode_token(cursor)
+        hit = SearchHit(int(score), int(ordinal))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Malformed search cursor") from exc
+    if cursor_revision != revision:
+        raise InvalidCursor("Search cursor belongs to a previous catalog revision; restart from the first page")
+    return hit
+
+
+class SearchIndex:
+    """Inverted index over the lowercased search text of each catalog model.
+
+    Search texts are whitespace-joined tokens, so any whitespace-free piece of
+    a query must sit inside a single token. Tokens map to postings of model
+    ordinals, and a trigram index over the token vocabulary finds the tokens
+    containing a piece without scanning every model.
+
+    A model matches when every piece of the query occurs in its text. Hits
+    are scored (exact reference or alias, display-name prefix, whole-token
+    match, whole-query substring, scattered pieces) and the best `limit`
+    are kept with a bounded heap.
+    """
+
+    def __init__(
+        self,
+        texts: Sequence[str],
+        names: Sequence[str] = (),
+        references: Sequence[Iterable[str]] = (),
+    ) -> None:
+        self._texts = list(texts)
+        self._names = [name.lower() for name in names]
+        self._references: Dict[str, List[int]] = {}
+        for ordinal, model_references in enumerate(references):
+            for reference in model_references:
+                self._references.setdefault(reference.lower(), []).append(ordinal)
+
+        token_ids: Dict[str, int] = {}
+        token_postings: List[array] = []
+
+        for ordinal, text in enumerate(self._texts):
+            for token in set(text.split()):
+                token_id = token_ids.get(token)
+                if token_id is None:
+                    token_id = len(token_postings)
+                    token_ids[token] = token_id
+                    token_postings.append(array("I"))
+                token_postings[token_id].append(ordinal)
+
+        trigram_postings: Dict[str, array] = {}
+        for token, token_id in token_ids.items():
+            for gram in _trigrams(token):
+                postings = trigram_postings.get(gram)
+                if postings is None:
+                    postings = trigram_postings[gram] = array("I")
+                postings.append(token_id)
+
+        self._tokens: List[str] = list(token_ids)
+        self._token_ids = token_ids
+        self._token_postings = token_postings
+        self._trigram_postings = trigram_postings
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        after: Optional[SearchHit] = None,
+    ) -> List[SearchHit]:
+        """Return the best hits for `query`, ranked, starting after `after`."""
+        lowered = query.lower().strip()
+        candidates = self._candidates(lowered.split())
+        ordinals = range(len(self._texts)) if candidates is None else candidates
+
+        hits = self._hits(ordinals, lowered)
+        if after is not None:
+            floor = _rank(after)
+            hits = (hit for hit in hits if _rank(hit) > floor)
+        if limit is None:
+            return sorted(hits, key=_rank)
+        return heapq.nsmallest(limit, hits, key=_rank)
+
+    def _hits(self, ordinals: Iterable[int], lowered: str) -> Iterator[SearchHit]:
+        pieces = lowered.split()
+        exact = set(self._references.get(lowered, ()))
+        whole_tokens = self._whole_token_matches(pieces)
+        texts = self._texts
+        names = self._names
+        for ordinal in ordinals:
+            text = texts[ordinal]
+            if lowered in text:
+                score = SCORE_SUBSTRING
+            elif len(pieces) > 1 and all(piece in text for piece in pieces):
+                score = SCORE_PIECES
+            else:
+                continue
+            if ordinal in exact:
+                score = SCORE_REFERENCE
+            elif names and names[ordinal].startswith(lowered):
+                score = SCORE_NAME_PREFIX
+            elif ordinal in whole_tokens:
+                score = SCORE_TOKENS
+            yield SearchHit(score, ordinal)
+
+    def _whole_token_matches(self, pieces: List[str]) -> Set[int]:
+        """Ordinals whose text has every piece as a complete token."""
+        matches: Optional[Set[int]] = None
+        for piece in pieces:
+            token_id = self._token_ids.get(piece)
+            if token_id is None:
+                return set()
+            postings = self._token_postings[token_id]
+            matches = set(postings) if matches is None else matches.intersection(postings)
+        return matches or set()
+
+    def _candidates(self, pieces: Iterable[str]) -> Optional[Set[int]]:
+        candidates: Optional[Set[int]] = None
+        for piece in sorted(set(pieces), key=len, reverse=True):
+            if len(piece) < TRIGRAM_SIZE:
+                # Short pieces match too many tokens to narrow anything
+                # cheaply; scoring still checks them.
+                break
+            ordinals: Set[int] = set()
+            for token_id in self._tokens_containing(piece):
+                ordinals.update(self._token_postings[token_id])
+            if candidates is None:
+                candidates = ordinals
+            else:
+                candidates &= ordinals
+            if not candidates:
+                break
+        return candidates
+
+    def _tokens_containing(self, piece: str) -> List[int]:
+        grams = sorted(
+            (self._trigram_postings.get(gram) for gram in _trigrams(piece)),
+            key=lambda postings: len(postings) if postings is not None else 0,
+        )
+        if grams[0] is None:
+            return []
+
+        token_ids = set(grams[0])
+        for postings in grams[1:]:
+            token_ids.intersection_update(postings)
+            if not token_ids:
+                break
+        return [i for i in token_ids if piece in self._tokens[i]]
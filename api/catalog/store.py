@@ -0,0 +1,649 @@
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from .changes import (
+    CatalogVersion,
+    VersionHistory,
+    content_hash,
+    diff_versions,
+    model_key,
+    split_model_key,
+)
+from .binary import BinaryCatalog
+from .compact import MODEL_LAYOUT, CompactCatalog, CompactCatalogBuilder, Layout
+from .loader import CatalogBundle, StreamingBundle
+from .matching import ReferenceIndex
+from .payloads import EncodedPayload, encode_json
+from .projection import Fields, omit_fields, project_layout
+from .schemas import (
+    BrandInfo,
+    BrandsResponse,
+    BrandWithModels,
+)
+from .facets import FacetIndex, FacetResult, Range
+from .ordering import BrandOrderings
+from .search import InvalidCursor, SearchIndex, decode_cursor, decode_token, encode_cursor, encode_token
+
+EMPTY_CATALOG = {"version": "0.0.0", "brands": []}
+
+# Dropped from every model in the lite variant. History is served on demand
+# by /market/history/{watch_id} and the URL is derivable from watchcharts_id.
+LITE_OMITTED_FIELDS = ("market_price_history", "features", "watchcharts_url")
+LITE_LAYOUT = omit_fields(MODEL_LAYOUT, LITE_OMITTED_FIELDS)
+
+# Projected bodies kept per snapshot, so they are dropped with the bundle
+# they were built from.
+PROJECTION_CACHE_SIZE = 128
+
+T = TypeVar("T")
+
+Bundle = Union[CatalogBundle, StreamingBundle]
+Signature = Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]
+
+
+def _brand_body(catalog: CompactCatalog, brand_index: int, model_bodies: List[bytes]) -> bytes:
+    header = encode_json(catalog.brand_info(brand_index))
+    return header[:-1] + b',"models":[' + b",".join(model_bodies) + b"]}"
+
+
+def _model_bodies(catalog: CompactCatalog, brand_index: int, layout: Layout = MODEL_LAYOUT) -> List[bytes]:
+    return [encode_json(catalog.model_dict(ordinal, layout)) for ordinal in catalog.brand_range(brand_index)]
+
+
+def _layout(variant: str = "full", fields: Optional[Fields] = None) -> Layout:
+    if fields:
+        return project_layout(fields)
+    return LITE_LAYOUT if variant == "lite" else MODEL_LAYOUT
+
+
+def _catalog_body(version: str, brand_bodies: List[bytes]) -> bytes:
+    return b'{"version":' + encode_json(version) + b',"brands":[' + b",".join(brand_bodies) + b"]}"
+
+
+def build_search_text(catalog: CompactCatalog, ordinal: int) -> str:
+    parts = [
+        catalog.brands[catalog.model_brand(ordinal)][1],
+        catalog.string("display_name", ordinal),
+        catalog.string("reference", ordinal),
+        catalog.string("collection", ordinal),
+        catalog.string("style", ordinal),
+    ]
+    parts.extend(catalog.string_list("reference_aliases", ordinal))
+    parts.extend([
+        catalog.string("case.material", ordinal),
+        catalog.string("case.dial_color", ordinal),
+        catalog.string("movement.caliber", ordinal),
+        catalog.string("movement.type", ordinal),
+    ])
+    parts.extend(catalog.string_list("complications", ordinal))
+    parts.extend(catalog.string_list("features", ordinal))
+    return " ".join(part for part in parts if part).lower()
+
+
+class CatalogSnapshot:
+    """Everything derived from one catalog bundle.
+
+    Never mutated once published, apart from caches that are filled on
+    first use, such as the per-revision delta payloads. Build one with
+    `from_bundle` or `from_binary`.
+    """
+
+    def __init__(
+        self,
+        catalog: CompactCatalog,
+        bundle_version: str,
+        version: CatalogVersion,
+        signature: Optional[Signature],
+        last_modified: Optional[str],
+        history: VersionHistory,
+        catalog_payload: Optional[EncodedPayload] = None,
+    ) -> None:
+        self.catalog = catalog
+        self.bundle_version = bundle_version
+        self.brands_response = BrandsResponse(
+            brands=[BrandInfo(**catalog.brand_info(i)) for i in range(len(catalog.brands))]
+        )
+        self.brands_by_id: Dict[str, int] = {
+            brand_id: index for index, (brand_id, *_rest) in enumerate(catalog.brands)
+        }
+        self.models_by_reference: Dict[str, int] = {}
+        self.models_by_key: Dict[str, int] = {}
+        self.models_by_watchcharts_id: Dict[str, int] = {}
+        for brand_index, (brand_id, *_rest) in enumerate(catalog.brands):
+            for ordinal in catalog.brand_range(brand_index):
+                reference = catalog.string("reference", ordinal)
+                self.models_by_reference[reference] = ordinal
+                for alias in catalog.string_list("reference_aliases", ordinal):
+                    self.models_by_reference.setdefault(alias, ordinal)
+                self.models_by_key[model_key(brand_id, reference)] = ordinal
+                watchcharts_id = catalog.string("watchcharts_id", ordinal)
+                if watchcharts_id is not None:
+                    self.models_by_watchcharts_id.setdefault(watchcharts_id, ordinal)
+
+        self.version = version
+        self.history = history.appended(version)
+        # Digests behind the per-resource ETags, so conditional requests are
+        # answered without serializing anything.
+        self.brands_body = encode_json(self.brands_response.model_dump())
+        self.brands_hash = content_hash(self.brands_body)
+        self.brand_hashes: Dict[str, bytes] = {}
+        for brand_index, (brand_id, *_rest) in enumerate(catalog.brands):
+            parts = [encode_json(catalog.brand_info(brand_index))]
+            parts.extend(self.model_hash(ordinal) for ordinal in catalog.brand_range(brand_index))
+            self.brand_hashes[brand_id] = content_hash(b"".join(parts))
+        self.signature = signature
+        # Derived from the content, not the file, so the JSON bundle and the
+        # binary file of the same catalog share one validator.
+        self.etag = None if signature is None else f'W/"{version.revision}"'
+        self.last_modified = last_modified
+        self._catalog_payload = catalog_payload
+        self._lite_payload: Optional[EncodedPayload] = None
+        self._search_index: Optional[SearchIndex] = None
+        self._facet_index: Optional[FacetIndex] = None
+        self._reference_index: Optional[ReferenceIndex] = None
+        self._brand_orderings: Optional[BrandOrderings] = None
+        self._build_lock = threading.Lock()
+        self._changes_payloads: Dict[Tuple[str, str], EncodedPayload] = {}
+        self._projected: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._projected_lock = threading.Lock()
+
+    @classmethod
+    def from_bundle(
+        cls,
+        bundle: Bundle,
+        signature: Optional[Signature],
+        last_modified: Optional[str],
+        history: VersionHistory,
+    ) -> "CatalogSnapshot":
+        """Validate and pack a JSON bundle one brand at a time."""
+        builder = CompactCatalogBuilder()
+        model_hashes: Dict[str, bytes] = {}
+        brand_bodies: List[bytes] = []
+
+        for raw_brand in bundle.iter_brands():
+            brand = BrandWithModels(**raw_brand)
+            # Release the decoded dict before the next brand is parsed.
+            del raw_brand
+            ordinals = builder.add_brand(brand)
+            packed = builder.build()
+            model_bodies: List[bytes] = []
+            for ordinal, model in zip(ordinals, brand.models):
+                body = encode_json(packed.model_dict(ordinal))
+                model_hashes[model_key(brand.id, model.reference)] = content_hash(body)
+                model_bodies.append(body)
+            brand_bodies.append(_brand_body(packed, len(packed.brands) - 1, model_bodies))
+
+        catalog_payload = EncodedPayload(_catalog_body(bundle.version, brand_bodies))
+        del brand_bodies
+        version = CatalogVersion(
+            revision=content_hash(catalog_payload.identity).hex(),
+            model_hashes=model_hashes,
+        )
+        snapshot = cls(builder.build(), bundle.version, version, signature, last_modified, history, catalog_payload)
+        # Reloads already run off the request path; index now rather than on first query.
+        snapshot.warm()
+        return snapshot
+
+    @classmethod
+    def from_binary(
+        cls,
+        binary: BinaryCatalog,
+        signature: Optional[Signature],
+        last_modified: Optional[str],
+        history: VersionHistory,
+    ) -> "CatalogSnapshot":
+        """Wrap a mapped catalog and index it without encoding any bodies.
+
+        The revision and model hashes come from the file, where the crawler
+        stored the same digests `from_bundle` computes. The indexes are
+        built here, on the reload thread, so no request builds one on the
+        event loop; the `/catalog` bodies are encoded on first request.
+        """
+        catalog = binary.catalog
+        model_hashes: Dict[str, bytes] = {}
+        for brand_index, (brand_id, *_rest) in enumerate(catalog.brands):
+            for ordinal in catalog.brand_range(brand_index):
+                model_hashes[model_key(brand_id, catalog.string("reference", ordinal))] = binary.model_hash(ordinal)
+        version = CatalogVersion(revision=binary.revision, model_hashes=model_hashes)
+        snapshot = cls(catalog, binary.version, version, signature, last_modified, history)
+        snapshot.warm_indexes()
+        return snapshot
+
+    def warm(self) -> None:
+        """Build the lite body and the lazily created indexes now."""
+        self.lite_payload
+        self.warm_indexes()
+
+    def warm_indexes(self) -> None:
+        """Build the indexes that search, filtering and lookups query."""
+        self.search_index
+        self.facet_index
+        self.reference_index
+        self.brand_orderings
+
+    @property
+    def catalog_payload(self) -> EncodedPayload:
+        payload = self._catalog_payload
+        if payload is None:
+            with self._build_lock:
+                payload = self._catalog_payload
+                if payload is None:
+                    payload = self._catalog_payload = self._encode_catalog()
+        return payload
+
+    @property
+    def lite_payload(self) -> EncodedPayload:
+        payload = self._lite_payload
+        if payload is None:
+            with self._build_lock:
+                payload = self._lite_payload
+                if payload is None:
+                    payload = self._lite_payload = self._encode_catalog(LITE_LAYOUT)
+        return payload
+
+    def variant_payload(self, variant: str) -> EncodedPayload:
+        """The `/catalog` body for `variant`, encoding it if needed.
+
+        Blocking on first use for snapshots mapped from the binary file:
+        call it from a worker thread unless `cached_variant_payload` hit.
+        """
+        return self.lite_payload if variant == "lite" else self.catalog_payload
+
+    def cached_variant_payload(self, variant: str) -> Optional[EncodedPayload]:
+        """The `/catalog` body for `variant` if it is built, else None."""
+        return self._lite_payload if variant == "lite" else self._catalog_payload
+
+    def cached_catalog_projection(self, fields: Fields) -> Optional[bytes]:
+        """The `/catalog?fields=` body if it is cached, else None."""
+        return self._cached_value(("catalog", fields))
+
+    def build_catalog_projection(self, fields: Fields) -> bytes:
+        """Encode the whole catalog projected to `fields` and cache it.
+
+        Blocking and proportional to the catalog size: call it from a
+        worker thread. The body is kept uncompressed; the response
+        middleware gzips it on the way out.
+        """
+        return self._cached(("catalog", fields), lambda: self._encode_catalog_body(project_layout(fields)))
+
+    def _cached_value(self, key: Hashable) -> Any:
+        with self._projected_lock:
+            value = self._projected.get(key)
+            if value is not None:
+                self._projected.move_to_end(key)
+            return value
+
+    def _cached(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Small LRU for projected bodies; building happens outside the lock."""
+        value = self._cached_value(key)
+        if value is not None:
+            return value
+        value = build()
+        with self._projected_lock:
+            self._projected[key] = value
+            while len(self._projected) > PROJECTION_CACHE_SIZE:
+                self._projected.popitem(last=False)
+        return value
+
+    @property
+    def search_index(self) -> SearchIndex:
+        index = self._search_index
+        if index is None:
+            with self._build_lock:
+                index = self._search_index
+                if index is None:
+                    catalog = self.catalog
+                    ordinals = range(len(catalog))
+                    index = self._search_index = SearchIndex(
+                        [build_search_text(catalog, ordinal) for ordinal in ordinals],
+                        names=[catalog.string("display_name", ordinal) for ordinal in ordinals],
+                        references=[
+                            [catalog.string("reference", ordinal), *catalog.string_list("reference_aliases", ordinal)]
+                            for ordinal in ordinals
+                        ],
+                    )
+        return index
+
+    @property
+    def facet_index(self) -> FacetIndex:
+        index = self._facet_index
+        if index is None:
+            with self._build_lock:
+                index = self._facet_index
+                if index is None:
+                    index = self._facet_index = FacetIndex(self.catalog)
+        return index
+
+    @property
+    def reference_index(self) -> ReferenceIndex:
+        index = self._reference_index
+        if index is None:
+            with self._build_lock:
+                index = self._reference_index
+                if index is None:
+                    index = self._reference_index = ReferenceIndex(self.catalog)
+        return index
+
+    @property
+    def brand_orderings(self) -> BrandOrderings:
+        orderings = self._brand_orderings
+        if orderings is None:
+            with self._build_lock:
+                orderings = self._brand_orderings
+                if orderings is None:
+                    orderings = self._brand_orderings = BrandOrderings(self.catalog)
+        return orderings
+
+    def _encode_catalog(self, layout: Layout = MODEL_LAYOUT) -> EncodedPayload:
+        return EncodedPayload(self._encode_catalog_body(layout))
+
+    def _encode_catalog_body(self, layout: Layout) -> bytes:
+        catalog = self.catalog
+        brand_bodies = [
+            _brand_body(catalog, brand_index, _model_bodies(catalog, brand_index, layout))
+            for brand_index in range(len(catalog.brands))
+        ]
+        return _catalog_body(self.bundle_version, brand_bodies)
+
+    @property
+    def revision(self) -> str:
+        return self.version.revision
+
+    def brand(self, brand_id: str) -> Optional[Dict[str, Any]]:
+        brand_index = self.brands_by_id.get(brand_id)
+        if brand_index is None:
+            return None
+        brand = self.catalog.brand_info(brand_index)
+        brand["models"] = self.brand_models(brand_id)
+        return brand
+
+    def brand_models(self, brand_id: str) -> Optional[List[Dict[str, Any]]]:
+        brand_index = self.brands_by_id.get(brand_id)
+        if brand_index is None:
+            return None
+        return [self.catalog.model_dict(i) for i in self.catalog.brand_range(brand_index)]
+
+    def brand_payload(self, brand_id: str, fields: Optional[Fields] = None) -> Optional[bytes]:
+        """Encoded `/brands/{brand_id}` body, models projected to `fields`."""
+        brand_index = self.brands_by_id.get(brand_id)
+        if brand_index is None:
+            return None
+        return self._cached(
+            ("brand", brand_id, fields),
+            lambda: _brand_body(
+                self.catalog, brand_index, _model_bodies(self.catalog, brand_index, _layout(fields=fields))
+            ),
+        )
+
+    def brand_models_payload(
+        self,
+        brand_id: str,
+        fields: Optional[Fields] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Encoded `/brands/{brand_id}/models` body and the next page's cursor.
+
+        Without `limit` and `cursor` the whole (sorted, projected) list is
+        served from the per-revision cache. Pages slice the precomputed
+        ordering and encode only the models on the page. Raises
+        InvalidFilter for an unknown sort and InvalidCursor for a cursor
+        issued for another revision or listing.
+        """
+        brand_index = self.brands_by_id.get(brand_id)
+        if brand_index is None:
+            return None
+        ordinals = self.brand_orderings.ordinals(brand_index, sort)
+        layout = _layout(fields=fields)
+        if limit is None and cursor is None:
+            body = self._cached(
+                ("brand_models", brand_id, fields, sort),
+                lambda: self._encode_models(ordinals, layout),
+            )
+            return body, None
+
+        start = self._decode_page_cursor(cursor, brand_id, sort) if cursor else 0
+        stop = len(ordinals) if limit is None else min(start + limit, len(ordinals))
+        next_cursor = None
+        if stop < len(ordinals):
+            next_cursor = encode_token([self.revision, brand_id, sort or "", stop])
+        return self._encode_models(ordinals[start:stop], layout), next_cursor
+
+    def _encode_models(self, ordinals: Iterable[int], layout: Layout) -> bytes:
+        catalog = self.catalog
+        return b"[" + b",".join(encode_json(catalog.model_dict(int(o), layout)) for o in ordinals) + b"]"
+
+    def _decode_page_cursor(self, cursor: str, brand_id: str, sort: Optional[str]) -> int:
+        try:
+            revision, cursor_brand, cursor_sort, position = decode_token(cursor)
+            position = int(position)
+        except (ValueError, TypeError) as exc:
+            raise InvalidCursor("Malformed page cursor") from exc
+        if revision != self.revision:
+            raise InvalidCursor("Page cursor belongs to a previous catalog revision; restart from the first page")
+        if cursor_brand != brand_id or cursor_sort != (sort or "") or position < 0:
+            raise InvalidCursor("Page cursor was issued for a different listing")
+        return position
+
+    def resolve(self, reference: str, brand_id: Optional[str] = None) -> Optional[int]:
+        """Exact reference or alias first, then the normalized per-brand keys."""
+        ordinal = self.models_by_reference.get(reference)
+        if ordinal is not None and brand_id is not None:
+            if self.catalog.brands[self.catalog.model_brand(ordinal)][0] != brand_id:
+                ordinal = None
+        if ordinal is None:
+            ordinal = self.reference_index.lookup(reference, brand_id)
+        return ordinal
+
+    def model(self, reference: str, brand_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        ordinal = self.resolve(reference, brand_id)
+        return None if ordinal is None else self.catalog.model_dict(ordinal)
+
+    def model_hash(self, ordinal: int) -> bytes:
+        brand_id = self.catalog.brands[self.catalog.model_brand(ordinal)][0]
+        return self.version.model_hashes[model_key(brand_id, self.catalog.string("reference", ordinal))]
+
+    def model_etag(self, ordinal: int, market: Optional[Dict[str, Any]] = None) -> str:
+        """Weak validator for one model plus the market summary served with it."""
+        market_digest = content_hash(encode_json(market)).hex() if market else "none"
+        return f'W/"{self.model_hash(ordinal).hex()}-{market_digest}"'
+
+    @staticmethod
+    def resource_etag(tag: str, *params: Any) -> str:
+        """Weak ETag for a resource digest and the query parameters shaping it."""
+        if any(param is not None for param in params):
+            tag += "-" + content_hash(encode_json(list(params)), 4).hex()
+        return f'W/"{tag}"'
+
+    def resource_headers(self, etag: str, max_age: int) -> Dict[str, str]:
+        return {
+            "Cache-Control": f"public, max-age={max_age}",
+            "X-Catalog-Revision": self.revision,
+            "ETag": etag,
+        }
+
+    def search(self, query: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """One page of ranked results and the cursor for the next page, if any.
+
+        Raises InvalidCursor if `cursor` is malformed or was issued for
+        another revision, since ordinals are only stable within one bundle.
+        """
+        after = decode_cursor(cursor, self.revision) if cursor else None
+        hits = self.search_index.search(query, limit + 1, after)
+        next_cursor = encode_cursor(self.revision, hits[limit - 1]) if len(hits) > limit else None
+        return [self.listing_entry(hit.ordinal) for hit in hits[:limit]], next_cursor
+
+    def query_models(
+        self,
+        ranges: Dict[str, Range],
+        facets: Dict[str, List[str]],
+        sort: Optional[str],
+        offset: int,
+        limit: int,
+    ) -> Tuple[List[dict], FacetResult]:
+        result = self.facet_index.query(ranges, facets, sort, offset, limit)
+        return [self.listing_entry(ordinal) for ordinal in result.ordinals], result
+
+    def listing_entry(self, ordinal: int) -> Dict[str, Any]:
+        brand_id, brand_name, *_ = self.catalog.brands[self.catalog.model_brand(ordinal)]
+        payload = self.catalog.model_dict(ordinal)
+        payload["brand_id"] = brand_id
+        payload["brand_name"] = brand_name
+        return payload
+
+    def changes_payload(self, since: str, variant: str = "full") -> Optional[EncodedPayload]:
+        """Delta from `since` to this snapshot, or None once it aged out."""
+        cached = self._changes_payloads.get((since, variant))
+        if cached is not None:
+            return cached
+        previous = self.history.get(since)
+        if previous is None:
+            return None
+
+        added, changed, removed = diff_versions(previous, self.version)
+        layout = _layout(variant)
+        response = {
+            "version": self.bundle_version,
+            "revision": self.revision,
+            "since": since,
+            "brands": [brand.model_dump() for brand in self.brands_response.brands],
+            "added": [self._changed_model(key, layout) for key in added],
+            "changed": [self._changed_model(key, layout) for key in changed],
+            "removed": [
+                {"brand_id": brand_id, "reference": reference}
+                for brand_id, reference in map(split_model_key, removed)
+            ],
+        }
+        payload = EncodedPayload(encode_json(response))
+        self._changes_payloads[(since, variant)] = payload
+        return payload
+
+    def _changed_model(self, key: str, layout: Layout = MODEL_LAYOUT) -> Dict[str, Any]:
+        ordinal = self.models_by_key[key]
+        payload = self.catalog.model_dict(ordinal, layout)
+        payload["brand_id"] = self.catalog.brands[self.catalog.model_brand(ordinal)][0]
+        return payload
+
+    def cache_headers(
+        self,
+        max_age: int,
+        variant: str = "full",
+        fields: Optional[Fields] = None,
+    ) -> Dict[str, str]:
+        headers = {
+            "Cache-Control": f"public, max-age={max_age}",
+            "X-Catalog-Revision": self.revision,
+        }
+        if self.etag:
+            # Each variant or projection is a different representation, so it
+            # needs its own validator.
+            if fields:
+                suffix = "-fields-" + content_hash(",".join(fields).encode("utf-8"), 4).hex()
+            else:
+                suffix = "" if variant == "full" else f"-{variant}"
+            headers["ETag"] = f'{self.etag[:-1]}{suffix}"' if suffix else self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        return headers
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _file_signature(stat: Optional[os.stat_result]) -> Optional[Tuple[int, int]]:
+    return None if stat is None else (stat.st_mtime_ns, stat.st_size)
+
+
+def _last_modified(stat: os.stat_result) -> str:
+    """Last-Modified for the file a snapshot was built from."""
+    return formatdate(stat.st_mtime, usegmt=True)
+
+
+class CatalogStore:
+    """Serves the current CatalogSnapshot and swaps in new ones.
+
+    Readers only dereference `self._snapshot`; they never stat the bundle
+    or take a lock. Change detection runs in `watch()`, which builds the
+    next snapshot in a worker thread and publishes it with one assignment.
+    """
+
+    def __init__(self, data_dir: Path, history_size: int = 8) -> None:
+        self._bundle_file = data_dir / "catalog_bundle.json"
+        self._binary_file = data_dir / "catalog_bundle.bin"
+        self._reload_lock = threading.Lock()
+        self._snapshot = CatalogSnapshot.from_bundle(
+            CatalogBundle(EMPTY_CATALOG), None, None, VersionHistory(history_size)
+        )
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def refresh(self) -> None:
+        self.reload(force=True)
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild the snapshot if the bundle changed. Returns True on swap.
+
+        `catalog_bundle.bin` is preferred when it is at least as new as the
+        JSON bundle: it is mapped rather than parsed, so every worker shares
+        one copy and only builds its indexes. The JSON bundle is the
+        fallback when the binary file is missing, stale or unreadable.
+        """
+        with self._reload_lock:
+            current = self._snapshot
+            json_stat = _stat(self._bundle_file)
+            binary_stat = _stat(self._binary_file)
+            if json_stat is None and binary_stat is None:
+                if current.signature is not None or force:
+                    self._snapshot = CatalogSnapshot.from_bundle(
+                        CatalogBundle(EMPTY_CATALOG), None, None, current.history
+                    )
+                    return True
+                return False
+
+            signature = (_file_signature(json_stat), _file_signature(binary_stat))
+            if not force and signature == current.signature:
+                return False
+
+            candidates = []
+            if binary_stat is not None and (json_stat is None or binary_stat.st_mtime_ns >= json_stat.st_mtime_ns):
+                candidates.append((self._binary_file, binary_stat))
+            if json_stat is not None:
+                candidates.append((self._bundle_file, json_stat))
+
+            for path, stat in candidates:
+                last_modified = _last_modified(stat)
+                try:
+                    if path == self._binary_file:
+                        snapshot = CatalogSnapshot.from_binary(
+                            BinaryCatalog(path), signature, last_modified, current.history
+                        )
+                    else:
+                        snapshot = CatalogSnapshot.from_bundle(
+                            StreamingBundle(path), signature, last_modified, current.history
+                        )
+                except Exception as exc:
+                    print(f"Failed to load {path.name}: {exc}")
+                    continue
+                self._snapshot = snapshot
+                return True
+            return False
+
+    async def watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception as exc:
+                print(f"Catalog reload failed: {exc}")
@@ -0,0 +1,24 @@
+"""Access to pure helpers that live in the sibling crawler package.
+
+The API and the crawler sit side by side in this repository. Deploys ship
+only api/, so code the API needs at runtime (downsample.py,
+reference_matcher.py) is copied here; tests use this module to check the
+copies against the crawler's, and the benchmarks to build fixtures with
+the crawler's writers. Set CRAWLER_DIR when the crawler is checked out
+somewhere else; callers skip when it is absent.
+"""
+import os
+import sys
+from pathlib import Path
+
+CRAWLER_DIR = Path(os.getenv("CRAWLER_DIR", str(Path(__file__).resolve().parent.parent / "crawler")))
+
+
+def ensure_crawler_on_path() -> bool:
+    """Make `watchcollection_crawler` importable. Returns False if it is missing."""
+    if not (CRAWLER_DIR / "watchcollection_crawler").is_dir():
+        return False
+    path = str(CRAWLER_DIR)
+    if path not in sys.path:
+        sys.path.append(path)
+    return True
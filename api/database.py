@@ -1,13 +1,19 @@
+import hashlib
 import os
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator, Optional, List, Dict, Any
+from typing import Generator, NamedTuple, Optional, List, Dict, Any, Tuple
 import json
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 
+from downsample import downsample_indices, weekly_indices
+from middleware.executor import BlockingExecutor
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/api.sqlite")
 
 engine = create_engine(
@@ -35,18 +41,215 @@ def get_marketdata_db_path() -> Path:
     return Path(__file__).parent.parent / "crawler" / "output" / "marketdata.sqlite"
 
 
+MARKETDATA_MMAP_SIZE = int(os.getenv("MARKETDATA_MMAP_SIZE", str(256 * 1024 * 1024)))
+MARKETDATA_CACHE_KIB = int(os.getenv("MARKETDATA_CACHE_KIB", str(64 * 1024)))
+MARKETDATA_WORKERS = int(os.getenv("MARKETDATA_WORKERS", "4"))
+MARKETDATA_MAX_QUEUE = int(os.getenv("MARKETDATA_MAX_QUEUE", "64"))
+MARKETDATA_VERSION_TTL = float(os.getenv("MARKETDATA_VERSION_TTL", "1.0"))
+
+# Async handlers run marketdata queries on these threads, never on the
+# event loop. Admin aggregations get their own single worker so a slow
+# coverage scan cannot hold up /market requests.
+marketdata_executor = BlockingExecutor("marketdata", MARKETDATA_WORKERS, MARKETDATA_MAX_QUEUE)
+admin_executor = BlockingExecutor("marketdata-admin", 1, 8)
+
+# (path, device, inode, pool generation)
+FileIdentity = Tuple[str, int, int, int]
+
+
+class _MarketdataConnections(threading.local):
+    """One pooled read-only connection per thread, with the file it was opened on."""
+
+    conn: Optional[sqlite3.Connection] = None
+    identity: Optional[FileIdentity] = None
+
+
+_marketdata_local = _MarketdataConnections()
+_marketdata_open: List[sqlite3.Connection] = []
+_marketdata_lock = threading.Lock()
+_marketdata_generation = 0
+
+
+def _open_marketdata_conn(db_path: Path) -> sqlite3.Connection:
+    # check_same_thread is off only so close_marketdata_connections can
+    # close every pooled connection; each one is used by its own thread.
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute(f"PRAGMA mmap_size = {MARKETDATA_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{MARKETDATA_CACHE_KIB}")
+    return conn
+
+
+def _discard_marketdata_conn() -> None:
+    conn = _marketdata_local.conn
+    _marketdata_local.conn = None
+    _marketdata_local.identity = None
+    if conn is not None:
+        with _marketdata_lock:
+            if conn in _marketdata_open:
+                _marketdata_open.remove(conn)
+        conn.close()
+
+
 @contextmanager
 def get_marketdata_conn() -> Generator[sqlite3.Connection, None, None]:
+    """Read-only marketdata connection, reused by later requests on this thread.
+
+    Connections are reopened when the database file is replaced (a new
+    inode) and after a SQLite error. Raises FileNotFoundError when the
+    database is missing.
+    """
     db_path = get_marketdata_db_path()
-    if not db_path.exists():
-        raise FileNotFoundError(f"marketdata.sqlite not found at {db_path}")
+    try:
+        stat = db_path.stat()
+    except FileNotFoundError:
+        _discard_marketdata_conn()
+        raise FileNotFoundError(f"marketdata.sqlite not found at {db_path}") from None
+
+    identity = (str(db_path), stat.st_dev, stat.st_ino, _marketdata_generation)
+    if _marketdata_local.conn is None or _marketdata_local.identity != identity:
+        _discard_marketdata_conn()
+        conn = _open_marketdata_conn(db_path)
+        _marketdata_local.conn = conn
+        _marketdata_local.identity = identity
+        with _marketdata_lock:
+            _marketdata_open.append(conn)
 
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
     try:
-        yield conn
-    finally:
+        yield _marketdata_local.conn
+    except sqlite3.Error:
+        _discard_marketdata_conn()
+        raise
+
+
+def close_marketdata_connections() -> None:
+    """Close every pooled marketdata connection, e.g. at shutdown.
+
+    Threads notice the new generation and open a fresh connection on
+    their next request.
+    """
+    global _marketdata_generation
+    with _marketdata_lock:
+        _marketdata_generation += 1
+        connections = list(_marketdata_open)
+        _marketdata_open.clear()
+    for conn in connections:
         conn.close()
+    _version_probe.close()
+
+
+class MarketdataVersion(NamedTuple):
+    """What the marketdata file currently holds, for cache keys and ETags."""
+
+    token: str
+    # finished_at of the latest ingest run (ISO 8601, UTC), if any
+    last_modified: Optional[str]
+    # Whether summaries come from the crawler's market_summary table rather
+    # than being computed against today's date on each request
+    summaries_materialized: bool
+    # time.monotonic() when this process first saw the token
+    observed_at: float
+
+
+class _VersionProbe:
+    """Tracks the marketdata version on a dedicated read-only connection.
+
+    PRAGMA data_version is per connection and changes whenever another
+    connection commits to the file, so one connection is kept just for it.
+    Only when it changes (or the file is replaced) is the token re-derived
+    from ingest_run, market_snapshot and market_summary. The token depends
+    on the data alone, so every worker process computes the same ETags.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._identity: Optional[FileIdentity] = None
+        self._data_version: Optional[int] = None
+        self._version: Optional[MarketdataVersion] = None
+        self._checked_at = 0.0
+
+    def cached(self, max_age: float) -> Optional[MarketdataVersion]:
+        if self._version is not None and time.monotonic() - self._checked_at < max_age:
+            return self._version
+        return None
+
+    def check(self) -> MarketdataVersion:
+        with self._lock:
+            db_path = get_marketdata_db_path()
+            try:
+                stat = db_path.stat()
+            except FileNotFoundError:
+                self._close()
+                raise FileNotFoundError(f"marketdata.sqlite not found at {db_path}") from None
+
+            identity = (str(db_path), stat.st_dev, stat.st_ino, _marketdata_generation)
+            if self._conn is None or self._identity != identity:
+                self._close()
+                self._conn = _open_marketdata_conn(db_path)
+                self._identity = identity
+            try:
+                data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                if self._version is None or data_version != self._data_version:
+                    version = _read_marketdata_version(self._conn)
+                    if self._version is None or version.token != self._version.token:
+                        self._version = version
+                    self._data_version = data_version
+            except sqlite3.Error:
+                self._close()
+                raise
+            self._checked_at = time.monotonic()
+            return self._version
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._identity = None
+        self._data_version = None
+        self._version = None
+
+
+def _read_marketdata_version(conn: sqlite3.Connection) -> MarketdataVersion:
+    run_id, finished_at, snapshot_rowid = conn.execute(
+        """
+        SELECT (SELECT MAX(run_id) FROM ingest_run),
+               (SELECT MAX(finished_at) FROM ingest_run),
+               (SELECT MAX(rowid) FROM market_snapshot)
+        """
+    ).fetchone()
+    try:
+        refreshed_at = conn.execute("SELECT MAX(refreshed_at) FROM market_summary").fetchone()[0]
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        refreshed_at = None
+    state = f"{run_id}|{finished_at}|{snapshot_rowid}|{refreshed_at}"
+    token = hashlib.blake2b(state.encode(), digest_size=8).hexdigest()
+    return MarketdataVersion(
+        token=token,
+        last_modified=finished_at,
+        summaries_materialized=refreshed_at is not None,
+        observed_at=time.monotonic(),
+    )
+
+
+_version_probe = _VersionProbe()
+
+
+def cached_marketdata_version() -> Optional[MarketdataVersion]:
+    """The last checked version if it is under MARKETDATA_VERSION_TTL old; never touches SQLite."""
+    return _version_probe.cached(MARKETDATA_VERSION_TTL)
+
+
+def get_marketdata_version() -> MarketdataVersion:
+    """Current marketdata version. Raises FileNotFoundError when the database is missing."""
+    return cached_marketdata_version() or _version_probe.check()
 
 
 def fetch_ingest_runs(
@@ -100,12 +303,93 @@ def fetch_ingest_runs(
         return runs, total
 
 
+# A gap is more than this many days between consecutive observed days;
+# matches the crawler's snapshot_coverage table.
+COVERAGE_GAP_DAYS = 7
+
+
 def fetch_coverage_stats(
     brand: Optional[str] = None,
     min_points: Optional[int] = None,
 ) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
     with get_marketdata_conn() as conn:
-        query = """
+        try:
+            rows, source_bits = _materialized_coverage(conn, brand, min_points)
+        except sqlite3.OperationalError as e:
+            if "no such table" not in str(e):
+                raise
+            rows, source_bits = _scanned_coverage(conn, brand, min_points), None
+
+    coverage = []
+    for row in rows:
+        if source_bits is None:
+            sources = row["sources"].split(",") if row["sources"] else []
+        else:
+            sources = [source for bit, source in source_bits if row["sources"] & bit]
+        coverage.append({
+            "watchcharts_id": row["watchcharts_id"],
+            "brand_slug": row["brand_slug"],
+            "reference": row["reference"],
+            "start_date": row["start_date"],
+            "end_date": row["end_date"],
+            "points": row["points"],
+            "sources": sources,
+            "gaps": row["gaps"],
+            "largest_gap_days": row["largest_gap_days"],
+        })
+
+    total_watches = len(coverage)
+    with_10_plus = sum(1 for c in coverage if c["points"] >= 10)
+    coverage_pct = (with_10_plus / total_watches * 100) if total_watches > 0 else 0.0
+
+    summary = {
+        "total_watches": total_watches,
+        "with_10_plus_points": with_10_plus,
+        "coverage_pct": round(coverage_pct, 1),
+        "with_gaps": sum(1 for c in coverage if c["gaps"]),
+        "gap_days_threshold": COVERAGE_GAP_DAYS,
+    }
+
+    return coverage, summary
+
+
+def _materialized_coverage(
+    conn: sqlite3.Connection,
+    brand: Optional[str],
+    min_points: Optional[int],
+) -> tuple[List[sqlite3.Row], List[tuple[int, str]]]:
+    """Rows of the crawler's snapshot_coverage table, plus its (bit, source) pairs."""
+    source_bits = [
+        (row["bit"], row["source"]) for row in conn.execute("SELECT bit, source FROM snapshot_source ORDER BY bit")
+    ]
+    query = """
+        SELECT watchcharts_id, brand_slug, reference,
+               first_date AS start_date, last_date AS end_date, points, sources,
+               gap_count AS gaps, largest_gap_days
+        FROM snapshot_coverage
+        WHERE 1=1
+    """
+    params: List[Any] = []
+    if brand:
+        query += " AND brand_slug = ?"
+        params.append(brand)
+    if min_points:
+        query += " AND points >= ?"
+        params.append(min_points)
+    query += " ORDER BY brand_slug, reference"
+    return conn.execute(query, params).fetchall(), source_bits
+
+
+def _scanned_coverage(
+    conn: sqlite3.Connection,
+    brand: Optional[str],
+    min_points: Optional[int],
+) -> List[sqlite3.Row]:
+    """Coverage aggregated from market_snapshot, for databases without snapshot_coverage."""
+    brand_filter = " AND brand_slug = ?" if brand else ""
+    having = " HAVING COUNT(*) >= ?" if min_points else ""
+    query = f"""
+        WITH base AS (
             SELECT
                 watchcharts_id,
                 brand_slug,
@@ -115,51 +399,49 @@ def fetch_coverage_stats(
                 COUNT(*) as points,
                 GROUP_CONCAT(DISTINCT source) as sources
             FROM market_snapshot
-            WHERE 1=1
-        """
-        params: List[Any] = []
-
-        if brand:
-            query += " AND brand_slug = ?"
-            params.append(brand)
-
-        query += " GROUP BY watchcharts_id, brand_slug, reference"
-
-        if min_points:
-            query += " HAVING COUNT(*) >= ?"
-            params.append(min_points)
-
-        query += " ORDER BY brand_slug, reference"
-
-        rows = conn.execute(query, params).fetchall()
-
-        coverage = []
-        for row in rows:
-            sources = row["sources"].split(",") if row["sources"] else []
-            coverage.append({
-                "watchcharts_id": row["watchcharts_id"],
-                "brand_slug": row["brand_slug"],
-                "reference": row["reference"],
-                "start_date": row["start_date"],
-                "end_date": row["end_date"],
-                "points": row["points"],
-                "sources": sources,
-            })
-
-        total_watches = len(coverage)
-        with_10_plus = sum(1 for c in coverage if c["points"] >= 10)
-        coverage_pct = (with_10_plus / total_watches * 100) if total_watches > 0 else 0.0
-
-        summary = {
-            "total_watches": total_watches,
-            "with_10_plus_points": with_10_plus,
-            "coverage_pct": round(coverage_pct, 1),
-        }
-
-        return coverage, summary
-
-
-def get_market_history(watch_id: str, downsample: bool = True) -> Dict[str, Any]:
+            WHERE 1=1{brand_filter}
+            GROUP BY watchcharts_id, brand_slug, reference{having}
+        ),
+        days AS (
+            SELECT watchcharts_id,
+                   julianday(as_of_date)
+                   - julianday(LAG(as_of_date) OVER (PARTITION BY watchcharts_id ORDER BY as_of_date)) AS gap
+            FROM (SELECT DISTINCT watchcharts_id, as_of_date FROM market_snapshot WHERE 1=1{brand_filter})
+        ),
+        gaps AS (
+            SELECT watchcharts_id,
+                   COUNT(CASE WHEN gap > {COVERAGE_GAP_DAYS} THEN 1 END) AS gaps,
+                   IFNULL(CAST(MAX(gap) AS INTEGER), 0) AS largest_gap_days
+            FROM days
+            GROUP BY watchcharts_id
+        )
+        SELECT b.*, g.gaps, g.largest_gap_days
+        FROM base b
+        JOIN gaps g ON g.watchcharts_id = b.watchcharts_id
+        ORDER BY b.brand_slug, b.reference
+    """
+    params: List[Any] = []
+    if brand:
+        params.append(brand)
+    if min_points:
+        params.append(min_points)
+    if brand:
+        params.append(brand)
+    return conn.execute(query, params).fetchall()
+
+
+def get_market_history(
+    watch_id: str,
+    downsample: bool = True,
+    points: Optional[int] = None,
+    mode: str = "lttb",
+) -> Dict[str, Any]:
+    """Price history of one watch.
+
+    With `points`, at most that many points chosen by `mode` (see
+    downsample); otherwise, with `downsample`, the last
+    point of each ISO week once the series is longer than 52 points.
+    """
     with get_marketdata_conn() as conn:
         query = """
             SELECT as_of_date, median_usd, source
@@ -169,93 +451,214 @@ def get_market_history(watch_id: str, downsample: bool = True) -> Dict[str, Any]
             ORDER BY as_of_date ASC
         """
         rows = conn.execute(query, (watch_id,)).fetchall()
+    return _history(rows, downsample, points, mode)
 
-        if not rows:
-            return {}
 
-        from datetime import datetime
+def get_market_histories(watch_ids: List[str], downsample: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Price histories for many watches in one query, keyed by watchcharts id.
 
-        points = []
-        sources = set()
-        for row in rows:
-            date_str = row["as_of_date"]
-            try:
-                dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                ts = int(dt.timestamp())
-            except (ValueError, AttributeError):
-                continue
-            points.append([ts, row["median_usd"]])
-            sources.add(row["source"])
-
-        if downsample and len(points) > 52:
-            weekly = {}
-            for ts, price in points:
-                week_key = ts // (7 * 24 * 3600)
-                weekly[week_key] = [ts, price]
-            points = list(weekly.values())
-
-        if not points:
-            return {}
-
-        return {
-            "points": points,
-            "source": "+".join(sorted(sources)),
-            "start_date": datetime.fromtimestamp(points[0][0]).date().isoformat(),
-            "end_date": datetime.fromtimestamp(points[-1][0]).date().isoformat(),
-            "points_count": len(points),
-        }
+    Same shape as get_market_history; ids without snapshots are left out.
+    """
+    if not watch_ids:
+        return {}
 
-
-def get_market_summary(watch_id: str) -> Dict[str, Any]:
+    placeholders = ",".join("?" for _ in watch_ids)
     with get_marketdata_conn() as conn:
-        query = """
-            SELECT as_of_date, median_usd, min_usd, max_usd, listings_count, source
+        query = f"""
+            SELECT watchcharts_id, as_of_date, median_usd, source
             FROM market_snapshot
-            WHERE watchcharts_id = ?
+            WHERE watchcharts_id IN ({placeholders})
               AND median_usd IS NOT NULL
-            ORDER BY as_of_date DESC
-            LIMIT 1
+            ORDER BY watchcharts_id, as_of_date ASC
         """
-        row = conn.execute(query, (watch_id,)).fetchone()
+        rows = conn.execute(query, watch_ids).fetchall()
 
-        if not row:
-            return {}
+    from itertools import groupby
 
-        current_price = row["median_usd"]
+    histories: Dict[str, Dict[str, Any]] = {}
+    for watch_id, watch_rows in groupby(rows, key=lambda row: row["watchcharts_id"]):
+        history = _history(list(watch_rows), downsample)
+        if history:
+            histories[watch_id] = history
+    return histories
+
+
+def get_market_price_rows(watch_ids: List[str]) -> Dict[str, List[Tuple[str, int]]]:
+    """Raw (as_of_date, median_usd) rows per watch in date order, from one query.
+
+    Rows of the same day come in descending source order, so the last one,
+    which weekly_series keeps, is from the same source summaries pick
+    (`ORDER BY as_of_date DESC, source`).
+    """
+    if not watch_ids:
+        return {}
+
+    placeholders = ",".join("?" for _ in watch_ids)
+    with get_marketdata_conn() as conn:
+        cursor = conn.cursor()
+        # Plain tuples: building sqlite3.Row objects dominates for long series.
+        cursor.row_factory = None
+        rows = cursor.execute(
+            f"""
+            SELECT watchcharts_id, as_of_date, median_usd
+            FROM market_snapshot
+            WHERE watchcharts_id IN ({placeholders})
+              AND median_usd IS NOT NULL
+            ORDER BY watchcharts_id, as_of_date ASC, source DESC
+            """,
+            watch_ids,
+        ).fetchall()
+
+    from itertools import groupby
+
+    return {
+        watch_id: [row[1:] for row in watch_rows]
+        for watch_id, watch_rows in groupby(rows, key=lambda row: row[0])
+    }
+
+
+def _history(
+    rows: List[sqlite3.Row],
+    downsample: bool,
+    points_limit: Optional[int] = None,
+    mode: str = "lttb",
+) -> Dict[str, Any]:
+    if not rows:
+        return {}
+
+    from datetime import datetime
+
+    points = []
+    sources = set()
+    for row in rows:
+        date_str = row["as_of_date"]
+        try:
+            dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            ts = int(dt.timestamp())
+        except (ValueError, AttributeError):
+            continue
+        points.append([ts, row["median_usd"]])
+        sources.add(row["source"])
+
+    if points_limit:
+        if len(points) > points_limit:
+            timestamps, prices = zip(*points)
+            points = [points[i] for i in downsample_indices(timestamps, prices, points_limit, mode)]
+    elif downsample and len(points) > 52:
+        points = [points[i] for i in weekly_indices([ts for ts, _ in points])]
+
+    if not points:
+        return {}
+
+    return {
+        "points": points,
+        "source": "+".join(sorted(sources)),
+        "start_date": datetime.fromtimestamp(points[0][0]).date().isoformat(),
+        "end_date": datetime.fromtimestamp(points[-1][0]).date().isoformat(),
+        "points_count": len(points),
+    }
+
+
+def get_market_summaries(watch_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Market summaries for many watches, keyed by watchcharts id.
+
+    Reads the materialized market_summary rows the crawler refreshes after
+    each ingest run (a primary-key lookup per watch) and computes any
+    watches missing from it from market_snapshot. Same shape as
+    get_market_summary; ids without snapshots are left out.
+    """
+    if not watch_ids:
+        return {}
+
+    with get_marketdata_conn() as conn:
+        summaries = _materialized_summaries(conn, watch_ids)
+        missing = [watch_id for watch_id in watch_ids if watch_id not in summaries]
+        if missing:
+            summaries.update(_computed_summaries(conn, missing))
+    return summaries
 
-        from datetime import datetime, timedelta
-
-        now = datetime.utcnow()
-
-        def get_price_at(days_ago: int) -> Optional[int]:
-            target = (now - timedelta(days=days_ago)).date().isoformat()
-            r = conn.execute(
-                """
-                SELECT median_usd FROM market_snapshot
-                WHERE watchcharts_id = ?
-                  AND as_of_date <= ?
-                  AND median_usd IS NOT NULL
-                ORDER BY as_of_date DESC
-                LIMIT 1
-                """,
-                (watch_id, target),
-            ).fetchone()
-            return r[0] if r else None
+
+def _materialized_summaries(conn: sqlite3.Connection, watch_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    placeholders = ",".join("?" for _ in watch_ids)
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT watchcharts_id, as_of_date, median_usd, min_usd, max_usd, listings_count,
+                   change_1m_pct, change_6m_pct, change_1y_pct
+            FROM market_summary
+            WHERE watchcharts_id IN ({placeholders})
+            """,
+            watch_ids,
+        ).fetchall()
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        return {}
+    return {
+        row["watchcharts_id"]: _summary(
+            row, (row["change_1m_pct"], row["change_6m_pct"], row["change_1y_pct"])
+        )
+        for row in rows
+    }
+
+
+def _computed_summaries(conn: sqlite3.Connection, watch_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    from datetime import datetime, timedelta, timezone
+
+    now = datetime.now(timezone.utc)
+    targets = [(now - timedelta(days=days)).date().isoformat() for days in (30, 180, 365)]
+
+    # Every lookup is an index range scan of one watch's snapshots; a CTE
+    # over all requested watches would be rescanned by each subquery.
+    values = ",".join("(?)" for _ in watch_ids)
+    price_at = """
+        (SELECT p.median_usd FROM market_snapshot p
+         WHERE p.watchcharts_id = w.watchcharts_id AND p.median_usd IS NOT NULL AND p.as_of_date <= ?
+         ORDER BY p.as_of_date DESC, p.source LIMIT 1)
+    """
+    query = f"""
+        WITH ids(watchcharts_id) AS (VALUES {values}),
+        latest AS (
+            SELECT w.watchcharts_id,
+                   (SELECT s.id FROM market_snapshot s
+                    WHERE s.watchcharts_id = w.watchcharts_id AND s.median_usd IS NOT NULL
+                    ORDER BY s.as_of_date DESC, s.source LIMIT 1) AS snapshot_id,
+                   {price_at} AS price_1m,
+                   {price_at} AS price_6m,
+                   {price_at} AS price_1y
+            FROM ids w
+        )
+        SELECT l.watchcharts_id, s.as_of_date, s.median_usd, s.min_usd, s.max_usd, s.listings_count,
+               l.price_1m, l.price_6m, l.price_1y
+        FROM latest l
+        JOIN market_snapshot s ON s.id = l.snapshot_id
+    """
+    rows = conn.execute(query, [*watch_ids, *targets]).fetchall()
+
+    summaries: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        current_price = row["median_usd"]
 
         def calc_pct(old: Optional[int]) -> Optional[float]:
             if old is None or old == 0:
                 return None
             return round(((current_price - old) / old) * 100, 2)
 
-        return {
-            "price": current_price,
-            "min_usd": row["min_usd"],
-            "max_usd": row["max_usd"],
-            "listings": row["listings_count"],
-            "change_pct": {
-                "1m": calc_pct(get_price_at(30)),
-                "6m": calc_pct(get_price_at(180)),
-                "1y": calc_pct(get_price_at(365)),
-            },
-            "last_updated": row["as_of_date"],
-        }
+        changes = (calc_pct(row["price_1m"]), calc_pct(row["price_6m"]), calc_pct(row["price_1y"]))
+        summaries[row["watchcharts_id"]] = _summary(row, changes)
+    return summaries
+
+
+def _summary(row: sqlite3.Row, changes: Tuple[Optional[float], ...]) -> Dict[str, Any]:
+    return {
+        "price": row["median_usd"],
+        "min_usd": row["min_usd"],
+        "max_usd": row["max_usd"],
+        "listings": row["listings_count"],
+        "change_pct": dict(zip(("1m", "6m", "1y"), changes)),
+        "last_updated": row["as_of_date"],
+    }
+
+
+def get_market_summary(watch_id: str) -> Dict[str, Any]:
+    return get_market_summaries([watch_id]).get(watch_id, {})
@@ -0,0 +1,105 @@
+"""Downsampling for /market/history series.
+
+Every function takes time-ordered unix timestamps (seconds) and prices and
+returns the indices of the points to keep, so callers can carry any other
+per-point data along.
+
+A copy of the crawler's marketdata/downsample.py, which buckets the
+bundle's weekly histories, so the API does not need the crawler checkout
+at runtime. tests/test_downsample.py checks that the two agree.
+"""
+from typing import Sequence
+
+import numpy as np
+
+DAY_SECONDS = 24 * 3600
+# 1970-01-01 was a Thursday; shifting by three days starts weeks on Monday,
+# so buckets are ISO weeks (in UTC).
+WEEK_OFFSET_DAYS = 3
+MODES = ("lttb", "minmax")
+
+
+def week_numbers(timestamps: Sequence[int]) -> np.ndarray:
+    """ISO week of each timestamp, counted from the week of the epoch."""
+    return (np.asarray(timestamps, dtype=np.int64) // DAY_SECONDS + WEEK_OFFSET_DAYS) // 7
+
+
+def weekly_indices(timestamps: Sequence[int]) -> np.ndarray:
+    """The last point of each ISO week."""
+    weeks = week_numbers(timestamps)
+    if not len(weeks):
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero(np.append(weeks[1:] != weeks[:-1], True))
+
+
+def _bucket_edges(n: int, buckets: int) -> np.ndarray:
+    """Equal-count buckets over the interior points 1..n-2; bucket i is [edges[i], edges[i+1])."""
+    return np.linspace(1, n - 1, buckets + 1).astype(np.intp)
+
+
+def lttb_indices(timestamps: Sequence[int], prices: Sequence[float], threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: `threshold` points that keep the visual shape.
+
+    The first and last points are always kept. Each interior bucket keeps
+    the point forming the largest triangle with the previously kept point
+    and the average of the next bucket. The choice depends on the previous
+    one, so buckets are walked in order, with the work inside each bucket
+    and the bucket averages done on arrays.
+    """
+    x = np.asarray(timestamps, dtype=np.float64)
+    y = np.asarray(prices, dtype=np.float64)
+    n = len(x)
+    if threshold < 3 or threshold >= n:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, threshold - 2)
+    counts = np.diff(edges)
+    next_x = np.append((np.add.reduceat(x[:n - 1], edges[:-1]) / counts)[1:], x[-1])
+    next_y = np.append((np.add.reduceat(y[:n - 1], edges[:-1]) / counts)[1:], y[-1])
+
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0] = selected = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        ax, ay = x[selected], y[selected]
+        areas = np.abs((ax - next_x[bucket]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[bucket] - ay))
+        selected = lo + int(np.argmax(areas))
+        keep[bucket + 1] = selected
+    keep[-1] = n - 1
+    return keep
+
+
+def minmax_indices(timestamps: Sequence[int], prices: Sequence[float], threshold: int) -> np.ndarray:
+    """The lowest and highest point of each bucket, plus the first and last points.
+
+    Unlike picking one point per bucket, peaks and troughs always survive.
+    At most `threshold` points are returned (for `threshold` >= 4).
+    """
+    y = np.asarray(prices, dtype=np.float64)
+    n = len(y)
+    if threshold >= n:
+        return np.arange(n)
+
+    buckets = max((threshold - 2) // 2, 1)
+    edges = _bucket_edges(n, buckets)
+    bucket_of = np.repeat(np.arange(buckets), np.diff(edges))
+    # Sorted by bucket, then price: each bucket's first entry is its minimum
+    # and its last entry its maximum.
+    order = np.lexsort((y[1:n - 1], bucket_of)) + 1
+    lowest = order[edges[:-1] - 1]
+    highest = order[edges[1:] - 2]
+    return np.unique(np.concatenate(([0], lowest, highest, [n - 1])))
+
+
+def downsample_indices(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    points: int,
+    mode: str = "lttb",
+) -> np.ndarray:
+    """Indices of at most `points` points chosen by `mode` ("lttb" or "minmax")."""
+    if mode == "lttb":
+        return lttb_indices(timestamps, prices, points)
+    if mode == "minmax":
+        return minmax_indices(timestamps, prices, points)
+    raise ValueError(f"Unknown downsampling mode '{mode}'")
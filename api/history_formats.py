@@ -0,0 +1,94 @@
+"""Compact encodings of /market/history series.
+
+`columnar` is JSON with the timestamps as day deltas and the prices as
+integers in separate arrays, about a third of the size of `[ts, price]`
+pairs. `binary` packs the same columns little-endian:
+
+    offset  type        field
+    0       4 bytes     magic b"WCMH"
+    4       uint32      point count n
+    8       int64       t0, timestamp of the first point (unix seconds)
+    16      uint16 * n  days since the previous point (0 for the first)
+    16+2n   int32 * n   prices in USD
+
+Timestamp i is t0 + 86400 * (sum of the first i + 1 day deltas). The
+binary body carries no metadata; source and date range are sent in
+X-History-* headers. A series with a gap longer than 65535 days or a
+price outside int32 raises HistoryEncodingError; callers send it as
+columnar instead.
+"""
+import struct
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from catalog import encode_json
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.watchcollection.history+json"
+BINARY_MEDIA_TYPE = "application/vnd.watchcollection.history+octet-stream"
+BINARY_MAGIC = b"WCMH"
+DAY_SECONDS = 24 * 3600
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "columnar": COLUMNAR_MEDIA_TYPE,
+    "binary": BINARY_MEDIA_TYPE,
+}
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """History format named by an Accept header; plain JSON unless a compact type is listed."""
+    for item in (accept or "").split(","):
+        media_type = item.split(";")[0].strip().lower()
+        for name, candidate in MEDIA_TYPES.items():
+            if name != "json" and media_type == candidate:
+                return name
+    return "json"
+
+
+class HistoryEncodingError(ValueError):
+    """The series does not fit the binary format's field widths."""
+
+
+def _fits(values: np.ndarray, dtype: str) -> bool:
+    info = np.iinfo(dtype)
+    return len(values) == 0 or (int(values.min()) >= info.min and int(values.max()) <= info.max)
+
+
+def _columns(history: Dict[str, Any]) -> tuple:
+    points = np.asarray(history["points"], dtype=np.int64).reshape(-1, 2)
+    timestamps, prices = points[:, 0], points[:, 1]
+    day_deltas = np.rint(np.diff(timestamps, prepend=timestamps[:1]) / DAY_SECONDS).astype(np.int64)
+    return int(timestamps[0]), day_deltas, prices
+
+
+def encode_columnar(history: Dict[str, Any]) -> bytes:
+    t0, day_deltas, prices = _columns(history)
+    return encode_json({
+        "t0": t0,
+        "day_deltas": day_deltas.tolist(),
+        "prices": prices.tolist(),
+        "source": history["source"],
+        "start_date": history.get("start_date"),
+        "end_date": history.get("end_date"),
+        "points_count": history["points_count"],
+    })
+
+
+def encode_binary(history: Dict[str, Any]) -> bytes:
+    t0, day_deltas, prices = _columns(history)
+    if not _fits(day_deltas, "<u2"):
+        raise HistoryEncodingError("Day deltas must be 0-65535 for the binary history format")
+    if not _fits(prices, "<i4"):
+        raise HistoryEncodingError("Prices must fit in int32 for the binary history format")
+    header = struct.pack("<4sIq", BINARY_MAGIC, len(prices), t0)
+    return header + day_deltas.astype("<u2").tobytes() + prices.astype("<i4").tobytes()
+
+
+def binary_headers(history: Dict[str, Any]) -> Dict[str, str]:
+    headers = {"X-History-Source": history["source"]}
+    if history.get("start_date"):
+        headers["X-History-Start-Date"] = history["start_date"]
+    if history.get("end_date"):
+        headers["X-History-End-Date"] = history["end_date"]
+    return headers
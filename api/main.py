@@ -1,20 +1,37 @@
-from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from pydantic import BaseModel
-from typing import Dict, List, Optional, Tuple
-from email.utils import formatdate
-import json
+from typing import Dict, List, Literal, Optional, Tuple
+import asyncio
 import os
 import uuid
 import time
 from pathlib import Path
-import threading
 
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
 
-from middleware import limiter, setup_logging
+from catalog import (
+    BatchLookupRequest,
+    BatchLookupResponse,
+    BrandsResponse,
+    BrandWithModels,
+    CatalogChangesResponse,
+    CatalogResponse,
+    CatalogSnapshot,
+    CatalogStore,
+    EncodedPayload,
+    InvalidCursor,
+    InvalidFields,
+    InvalidFilter,
+    WatchModelInfo,
+    encode_json,
+    etag_matches,
+    parse_fields,
+    parse_filters,
+)
+from database import admin_executor, close_marketdata_connections, get_market_summaries, marketdata_executor
+from middleware import BlockingExecutor, ExecutorSaturated, SingleFlight, limiter, setup_logging
 from routes import auth_router, market_router, admin_router, ai_router
 
 app = FastAPI(
@@ -84,251 +101,35 @@ app.include_router(admin_router)
 app.include_router(ai_router)
 
 DATA_DIR = Path(__file__).parent / "data"
+CATALOG_HISTORY_SIZE = int(os.getenv("CATALOG_HISTORY_SIZE", "8"))
+CATALOG_RELOAD_INTERVAL = float(os.getenv("CATALOG_RELOAD_INTERVAL", "30"))
 
-
-class BrandInfo(BaseModel):
-    id: str
-    name: str
-    country: Optional[str] = None
-    tier: Optional[str] = None
-
-
-class MarketPrice(BaseModel):
-    min_usd: Optional[int] = None
-    max_usd: Optional[int] = None
-    median_usd: Optional[int] = None
-    listings: Optional[int] = None
-    updated_at: Optional[str] = None
-
-
-class MarketPriceHistory(BaseModel):
-    source: Optional[str] = None
-    points: Optional[List[List[float]]] = None
-
-
-class CaseInfo(BaseModel):
-    diameter_mm: Optional[float] = None
-    thickness_mm: Optional[float] = None
-    material: Optional[str] = None
-    bezel_material: Optional[str] = None
-    crystal: Optional[str] = None
-    water_resistance_m: Optional[int] = None
-    lug_width_mm: Optional[float] = None
-    dial_color: Optional[str] = None
-    dial_numerals: Optional[str] = None
-
-
-class MovementInfo(BaseModel):
-    type: Optional[str] = None
-    caliber: Optional[str] = None
-    power_reserve_hours: Optional[int] = None
-    frequency_bph: Optional[int] = None
-    jewels_count: Optional[int] = None
-
-
-class WatchModelInfo(BaseModel):
-    reference: str
-    reference_aliases: List[str] = []
-    display_name: str
-    collection: Optional[str] = None
-    style: Optional[str] = None
-    production_year_start: Optional[int] = None
-    production_year_end: Optional[int] = None
-    case: Optional[CaseInfo] = None
-    movement: Optional[MovementInfo] = None
-    complications: List[str] = []
-    features: List[str] = []
-    retail_price_usd: Optional[int] = None
-    catalog_image_url: Optional[str] = None
-    market_price: Optional[MarketPrice] = None
-    market_price_history: Optional[MarketPriceHistory] = None
-    watchcharts_id: Optional[str] = None
-    watchcharts_url: Optional[str] = None
-    is_current: Optional[bool] = None
-
-
-class BrandWithModels(BaseModel):
-    id: str
-    name: str
-    country: Optional[str] = None
-    tier: Optional[str] = None
-    models: List[WatchModelInfo]
-
-
-class CatalogResponse(BaseModel):
-    version: str
-    brands: List[BrandWithModels]
-
-
-class BrandsResponse(BaseModel):
-    brands: List[BrandInfo]
-
-
-class CatalogStore:
-    def __init__(self, data_dir: Path) -> None:
-        self._bundle_file = data_dir / "catalog_bundle.json"
-        self._lock = threading.Lock()
-        self._signature: Optional[Tuple[int, int]] = None
-        self._catalog_response: CatalogResponse = CatalogResponse(version="0.0.0", brands=[])
-        self._brands_response: BrandsResponse = BrandsResponse(brands=[])
-        self._brands_by_id: Dict[str, BrandWithModels] = {}
-        self._brand_models_by_id: Dict[str, List[WatchModelInfo]] = {}
-        self._models_by_reference: Dict[str, WatchModelInfo] = {}
-        self._search_index: List[Tuple[str, str, WatchModelInfo, str]] = []
-        self._etag: Optional[str] = None
-        self._last_modified: Optional[str] = None
-
-    def refresh(self) -> None:
-        self._ensure_loaded(force=True)
-
-    def get_catalog(self) -> CatalogResponse:
-        self._ensure_loaded()
-        return self._catalog_response
-
-    def get_brands(self) -> BrandsResponse:
-        self._ensure_loaded()
-        return self._brands_response
-
-    def get_brand(self, brand_id: str) -> Optional[BrandWithModels]:
-        self._ensure_loaded()
-        return self._brands_by_id.get(brand_id)
-
-    def get_brand_models(self, brand_id: str) -> Optional[List[WatchModelInfo]]:
-        self._ensure_loaded()
-        return self._brand_models_by_id.get(brand_id)
-
-    def get_model(self, reference: str) -> Optional[WatchModelInfo]:
-        self._ensure_loaded()
-        return self._models_by_reference.get(reference)
-
-    def search(self, query: str, limit: int) -> List[dict]:
-        self._ensure_loaded()
-        lowered = query.lower()
-        results: List[dict] = []
-        for brand_id, brand_name, model, search_text in self._search_index:
-            if lowered in search_text:
-                payload = model.model_dump()
-                payload["brand_id"] = brand_id
-                payload["brand_name"] = brand_name
-                results.append(payload)
-                if len(results) >= limit:
-                    break
-        return results
-
-    def cache_headers(self, max_age: int) -> Dict[str, str]:
-        self._ensure_loaded()
-        headers = {"Cache-Control": f"public, max-age={max_age}"}
-        if self._etag:
-            headers["ETag"] = self._etag
-        if self._last_modified:
-            headers["Last-Modified"] = self._last_modified
-        return headers
-
-    def _ensure_loaded(self, force: bool = False) -> None:
-        try:
-            stat = self._bundle_file.stat()
-        except FileNotFoundError:
-            with self._lock:
-                if self._signature is not None or force:
-                    self._apply_catalog({"version": "0.0.0", "brands": []}, None, None, None)
-            return
-
-        signature = (stat.st_mtime_ns, stat.st_size)
-        with self._lock:
-            if not force and signature == self._signature:
-                return
-            try:
-                with open(self._bundle_file, "r", encoding="utf-8") as f:
-                    catalog = json.load(f)
-            except Exception as exc:
-                print(f"Failed to load catalog bundle: {exc}")
-                if self._signature is None:
-                    self._apply_catalog({"version": "0.0.0", "brands": []}, None, None, None)
-                return
-
-            etag = f'W/"{stat.st_mtime_ns}-{stat.st_size}"'
-            last_modified = formatdate(stat.st_mtime, usegmt=True)
-            self._apply_catalog(catalog, signature, etag, last_modified)
-
-    def _build_search_text(self, brand_name: str, model: WatchModelInfo) -> str:
-        parts = [
-            brand_name,
-            model.display_name,
-            model.reference,
-            model.collection,
-            model.style,
-        ]
-        parts.extend(model.reference_aliases)
-        if model.case:
-            parts.extend([
-                model.case.material,
-                model.case.dial_color,
-            ])
-        if model.movement:
-            parts.extend([
-                model.movement.caliber,
-                model.movement.type,
-            ])
-        parts.extend(model.complications)
-        parts.extend(model.features)
-        return " ".join(part for part in parts if part).lower()
-
-    def _apply_catalog(
-        self,
-        catalog: dict,
-        signature: Optional[Tuple[int, int]],
-        etag: Optional[str],
-        last_modified: Optional[str],
-    ) -> None:
-        brands_data = catalog.get("brands", [])
-        brands = [BrandWithModels(**b) for b in brands_data]
-
-        brand_models_by_id: Dict[str, List[WatchModelInfo]] = {}
-        models_by_reference: Dict[str, WatchModelInfo] = {}
-        search_index: List[Tuple[str, str, WatchModelInfo, str]] = []
-
-        for brand in brands:
-            brand_models_by_id[brand.id] = brand.models
-            for model in brand.models:
-                models_by_reference[model.reference] = model
-                for alias in model.reference_aliases:
-                    if alias not in models_by_reference:
-                        models_by_reference[alias] = model
-                search_text = self._build_search_text(brand.name, model)
-                search_index.append((brand.id, brand.name, model, search_text))
-
-        brands_response = BrandsResponse(
-            brands=[
-                BrandInfo(
-                    id=brand.id,
-                    name=brand.name,
-                    country=brand.country,
-                    tier=brand.tier,
-                )
-                for brand in brands
-            ]
-        )
-
-        self._signature = signature
-        self._catalog_response = CatalogResponse(
-            version=catalog.get("version", "0.0.0"),
-            brands=brands,
-        )
-        self._brands_response = brands_response
-        self._brands_by_id = {brand.id: brand for brand in brands}
-        self._brand_models_by_id = brand_models_by_id
-        self._models_by_reference = models_by_reference
-        self._search_index = search_index
-        self._etag = etag
-        self._last_modified = last_modified
+catalog_store = CatalogStore(DATA_DIR, history_size=CATALOG_HISTORY_SIZE)
+catalog_watcher: Optional[asyncio.Task] = None
+# Builds `/catalog` bodies that are not cached yet: projections, and the
+# full and lite variants of a snapshot mapped from the binary file. One
+# thread, so clients cycling field sets cannot take more than one core;
+# concurrent requests for the same body share one build.
+catalog_executor = BlockingExecutor("catalog", 1, 8)
+catalog_projections = SingleFlight("catalog-projections")
 
 
-catalog_store = CatalogStore(DATA_DIR)
+@app.on_event("startup")
+async def preload_catalog() -> None:
+    global catalog_watcher
+    await asyncio.to_thread(catalog_store.refresh)
+    if CATALOG_RELOAD_INTERVAL > 0:
+        catalog_watcher = asyncio.create_task(catalog_store.watch(CATALOG_RELOAD_INTERVAL))
 
 
-@app.on_event("startup")
-def preload_catalog() -> None:
-    catalog_store.refresh()
+@app.on_event("shutdown")
+async def release_resources() -> None:
+    if catalog_watcher is not None:
+        catalog_watcher.cancel()
+    marketdata_executor.shutdown()
+    admin_executor.shutdown()
+    catalog_executor.shutdown()
+    close_marketdata_connections()
 
 
 def not_modified_response(
@@ -337,13 +138,25 @@ def not_modified_response(
     last_modified: Optional[str],
     headers: Dict[str, str],
 ) -> Optional[Response]:
-    if etag and request.headers.get("if-none-match") == etag:
-        return Response(status_code=304, headers=headers)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence; If-Modified-Since is then ignored.
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return None
     if last_modified and request.headers.get("if-modified-since") == last_modified:
         return Response(status_code=304, headers=headers)
     return None
 
 
+RESOURCE_MAX_AGE = 300
+
+
+def json_response(content, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize catalog dicts directly, skipping response_model validation."""
+    return Response(content=encode_json(content), media_type="application/json", headers=headers)
+
+
 @app.get("/")
 async def root():
     return {"status": "ok", "service": "watch-catalog-api"}
@@ -354,9 +167,49 @@ async def health():
     return {"status": "healthy"}
 
 
+CatalogVariant = Literal["full", "lite"]
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated model fields to include, e.g. "
+    "`reference,display_name,catalog_image_url,market_price.median_usd`"
+)
+
+
+async def variant_payload(snapshot: CatalogSnapshot, variant: str) -> EncodedPayload:
+    """The snapshot's `/catalog` body, built on the catalog pool on first use."""
+    payload = snapshot.cached_variant_payload(variant)
+    if payload is not None:
+        return payload
+    try:
+        return await catalog_projections.run(
+            (snapshot.revision, variant),
+            lambda: catalog_executor.run(snapshot.variant_payload, variant),
+        )
+    except ExecutorSaturated:
+        raise HTTPException(status_code=503, detail="Catalog service busy", headers={"Retry-After": "1"})
+
+
+def projection(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields)
+    except InvalidFields as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @app.get("/catalog", response_model=CatalogResponse)
-async def get_catalog(request: Request, response: Response):
-    headers = catalog_store.cache_headers(max_age=3600)
+async def get_catalog(
+    request: Request,
+    variant: CatalogVariant = "full",
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """The whole catalog. `variant=lite` omits price history and other
+    fields list screens never render; `full` keeps them for offline use.
+    `fields` selects exactly the listed model fields and overrides `variant`.
+    """
+    selected = projection(fields)
+    snapshot = catalog_store.snapshot
+    headers = snapshot.cache_headers(max_age=3600, variant=variant, fields=selected)
+    headers["Vary"] = "Accept-Encoding"
     etag = headers.get("ETag")
     last_modified = headers.get("Last-Modified")
     not_modified = not_modified_response(
@@ -367,13 +220,31 @@ async def get_catalog(request: Request, response: Response):
     )
     if not_modified:
         return not_modified
-    response.headers.update(headers)
-    return catalog_store.get_catalog()
+
+    if selected:
+        body = snapshot.cached_catalog_projection(selected)
+        if body is None:
+            try:
+                body = await catalog_projections.run(
+                    (snapshot.revision, selected),
+                    lambda: catalog_executor.run(snapshot.build_catalog_projection, selected),
+                )
+            except ExecutorSaturated:
+                raise HTTPException(status_code=503, detail="Catalog service busy", headers={"Retry-After": "1"})
+        # Not precompressed; GZipMiddleware compresses it for clients that accept gzip.
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    payload = await variant_payload(snapshot, variant)
+    body, encoding = payload.select(request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/catalog/version")
 async def get_catalog_version(request: Request, response: Response):
-    headers = catalog_store.cache_headers(max_age=300)
+    snapshot = catalog_store.snapshot
+    headers = snapshot.cache_headers(max_age=300)
     etag = headers.get("ETag")
     last_modified = headers.get("Last-Modified")
     not_modified = not_modified_response(
@@ -385,39 +256,228 @@ async def get_catalog_version(request: Request, response: Response):
     if not_modified:
         return not_modified
     response.headers.update(headers)
-    return {"version": catalog_store.get_catalog().version}
+    return {
+        "version": snapshot.bundle_version,
+        "revision": snapshot.revision,
+    }
+
+
+@app.get("/catalog/changes", response_model=CatalogChangesResponse)
+async def get_catalog_changes(request: Request, since: str, variant: CatalogVariant = "full"):
+    """Models added, changed or removed since revision `since`.
+
+    Falls back to the whole catalog (`X-Catalog-Delta: full`) once `since`
+    has dropped out of the version history. `variant` shapes the models
+    the same way as on `/catalog`.
+    """
+    snapshot = catalog_store.snapshot
+    headers = snapshot.cache_headers(max_age=300, variant=variant)
+    headers["Vary"] = "Accept-Encoding"
+    payload = snapshot.changes_payload(since, variant)
+    if payload is None:
+        headers["X-Catalog-Delta"] = "full"
+        payload = await variant_payload(snapshot, variant)
+    else:
+        headers["X-Catalog-Delta"] = "changes"
+        headers.pop("ETag", None)
+        headers.pop("Last-Modified", None)
+
+    body, encoding = payload.select(request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/brands", response_model=BrandsResponse)
-async def get_brands():
-    return catalog_store.get_brands()
+async def get_brands(request: Request):
+    snapshot = catalog_store.snapshot
+    etag = snapshot.resource_etag(snapshot.brands_hash.hex())
+    headers = snapshot.resource_headers(etag, max_age=RESOURCE_MAX_AGE)
+    not_modified = not_modified_response(request, etag, None, headers)
+    if not_modified:
+        return not_modified
+    return Response(content=snapshot.brands_body, media_type="application/json", headers=headers)
 
 
 @app.get("/brands/{brand_id}", response_model=BrandWithModels)
-async def get_brand(brand_id: str):
-    brand = catalog_store.get_brand(brand_id)
-    if brand:
-        return brand
-    raise HTTPException(status_code=404, detail=f"Brand '{brand_id}' not found")
+async def get_brand(
+    request: Request,
+    brand_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    selected = projection(fields)
+    snapshot = catalog_store.snapshot
+    digest = snapshot.brand_hashes.get(brand_id)
+    if digest is None:
+        raise HTTPException(status_code=404, detail=f"Brand '{brand_id}' not found")
+    etag = snapshot.resource_etag(digest.hex(), selected)
+    headers = snapshot.resource_headers(etag, max_age=RESOURCE_MAX_AGE)
+    not_modified = not_modified_response(request, etag, None, headers)
+    if not_modified:
+        return not_modified
+    body = snapshot.brand_payload(brand_id, selected)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/brands/{brand_id}/models", response_model=List[WatchModelInfo])
-async def get_brand_models(brand_id: str):
-    models = catalog_store.get_brand_models(brand_id)
-    if models is not None:
-        return models
-    raise HTTPException(status_code=404, detail=f"Brand '{brand_id}' not found")
+async def get_brand_models(
+    request: Request,
+    brand_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    sort: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+):
+    """A brand's models, optionally sorted and paginated.
+
+    `sort` is one of `market_price_usd`, `retail_price_usd`,
+    `production_year_start` or `display_name`, prefixed with `-` for
+    descending. With `limit` the body holds one page and `X-Next-Cursor`
+    carries the cursor for the next one, absent on the last page.
+    """
+    selected = projection(fields)
+    snapshot = catalog_store.snapshot
+    digest = snapshot.brand_hashes.get(brand_id)
+    if digest is None:
+        raise HTTPException(status_code=404, detail=f"Brand '{brand_id}' not found")
+    etag = snapshot.resource_etag(digest.hex(), "models", selected, sort, limit, cursor)
+    headers = snapshot.resource_headers(etag, max_age=RESOURCE_MAX_AGE)
+    not_modified = not_modified_response(request, etag, None, headers)
+    if not_modified:
+        return not_modified
+    try:
+        body, next_cursor = snapshot.brand_models_payload(brand_id, selected, sort, limit, cursor)
+    except (InvalidFilter, InvalidCursor) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
-@app.get("/models/{reference}", response_model=WatchModelInfo)
-async def get_model(reference: str):
-    model = catalog_store.get_model(reference)
-    if model:
-        return model
-    raise HTTPException(status_code=404, detail=f"Model '{reference}' not found")
+MODEL_QUERY_PARAMS = {"sort", "offset", "limit"}
+
+
+@app.get("/models")
+async def query_models(
+    request: Request,
+    sort: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Filter, sort and facet the catalog.
+
+    Range filters take `min..max` (either side optional), e.g.
+    `diameter_mm=38..41&market_price_usd=..10000`. Facet filters may repeat,
+    e.g. `material=Stainless Steel&movement_type=Automatic`. `sort` names a
+    range field, prefixed with `-` for descending.
+    """
+    try:
+        ranges, facets = parse_filters(
+            (name, value) for name, value in request.query_params.multi_items() if name not in MODEL_QUERY_PARAMS
+        )
+        results, result = catalog_store.snapshot.query_models(ranges, facets, sort, offset, limit)
+    except InvalidFilter as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return json_response({
+        "total": result.total,
+        "offset": offset,
+        "limit": limit,
+        "results": results,
+        "facets": result.facets,
+    })
+
+
+@app.post("/models/batch", response_model=BatchLookupResponse)
+async def lookup_models(body: BatchLookupRequest):
+    """Resolve many models at once, returning only the ones that changed.
+
+    Each item names a `reference` (optionally scoped to `brand`) or a
+    `watchcharts_id`, plus the `etag` from a previous response. Items whose
+    model and market summary still match that ETag are listed in
+    `not_modified`; unresolvable items in `not_found`. Market summaries for
+    the whole batch come from a single query.
+    """
+    snapshot = catalog_store.snapshot
+    ordinals: List[Optional[int]] = []
+    watch_ids: List[Optional[str]] = []
+    for item in body.items:
+        if item.watchcharts_id is not None:
+            ordinal = snapshot.models_by_watchcharts_id.get(item.watchcharts_id)
+        elif item.reference is not None:
+            ordinal = snapshot.resolve(item.reference, item.brand)
+        else:
+            raise HTTPException(status_code=400, detail="Each item needs a reference or a watchcharts_id")
+        ordinals.append(ordinal)
+        watch_ids.append(None if ordinal is None else snapshot.catalog.string("watchcharts_id", ordinal))
+
+    summaries: Dict[str, dict] = {}
+    if body.include_market:
+        try:
+            summaries = await marketdata_executor.run(get_market_summaries, sorted(set(filter(None, watch_ids))))
+        except FileNotFoundError:
+            summaries = {}
+        except ExecutorSaturated:
+            # A transient overload must not change the items' ETags.
+            raise HTTPException(status_code=503, detail="Market data service busy", headers={"Retry-After": "1"})
+
+    results = []
+    not_modified: List[int] = []
+    not_found: List[int] = []
+    for index, (item, ordinal, watch_id) in enumerate(zip(body.items, ordinals, watch_ids)):
+        if ordinal is None:
+            not_found.append(index)
+            continue
+        market = summaries.get(watch_id) if watch_id else None
+        etag = snapshot.model_etag(ordinal, market)
+        if etag_matches(item.etag, etag):
+            not_modified.append(index)
+            continue
+        results.append({
+            "index": index,
+            "etag": etag,
+            "model": snapshot.listing_entry(ordinal),
+            "market": market,
+        })
+
+    return json_response({
+        "revision": snapshot.revision,
+        "results": results,
+        "not_modified": not_modified,
+        "not_found": not_found,
+    })
+
+
+@app.get("/models/{reference:path}", response_model=WatchModelInfo)
+async def get_model(request: Request, reference: str, brand: Optional[str] = None):
+    snapshot = catalog_store.snapshot
+    ordinal = snapshot.resolve(reference, brand)
+    if ordinal is None:
+        raise HTTPException(status_code=404, detail=f"Model '{reference}' not found")
+    etag = snapshot.resource_etag(snapshot.model_hash(ordinal).hex())
+    headers = snapshot.resource_headers(etag, max_age=RESOURCE_MAX_AGE)
+    not_modified = not_modified_response(request, etag, None, headers)
+    if not_modified:
+        return not_modified
+    return json_response(snapshot.catalog.model_dict(ordinal), headers)
 
 
 @app.get("/search")
-async def search_models(q: str, limit: int = 20):
-    results = catalog_store.search(q, limit)
-    return {"query": q, "count": len(results), "results": results}
+async def search_models(
+    request: Request,
+    q: str,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = None,
+):
+    # Results depend only on the revision and the parameters, so a repeat
+    # query is answered without searching.
+    snapshot = catalog_store.snapshot
+    etag = snapshot.resource_etag(snapshot.revision, q, limit, cursor)
+    headers = snapshot.resource_headers(etag, max_age=RESOURCE_MAX_AGE)
+    not_modified = not_modified_response(request, etag, None, headers)
+    if not_modified:
+        return not_modified
+    try:
+        results, next_cursor = snapshot.search(q, limit, cursor)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return json_response({"query": q, "count": len(results), "results": results, "next_cursor": next_cursor}, headers)
@@ -1,6 +1,9 @@
 from .rate_limit import limiter, get_rate_limit_key
 from .logging import setup_logging, get_logger
 from .circuit_breaker import CircuitBreaker, CircuitState
+from .executor import BlockingExecutor, ExecutorSaturated
+from .cache import LRUCache
+from .singleflight import SingleFlight
 
 __all__ = [
     "limiter",
@@ -9,4 +12,8 @@ __all__ = [
     "get_logger",
     "CircuitBreaker",
     "CircuitState",
+    "BlockingExecutor",
+    "ExecutorSaturated",
+    "LRUCache",
+    "SingleFlight",
 ]
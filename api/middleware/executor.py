@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, TypeVar
+
+T = TypeVar("T")
+
+
+class ExecutorSaturated(RuntimeError):
+    pass
+
+
+class BlockingExecutor:
+    """Bounded thread pool for blocking calls made from async handlers.
+
+    Calls run on `workers` dedicated threads so the event loop keeps
+    serving other requests. At most `max_queue` calls may wait for a
+    thread; beyond that `run` fails fast with ExecutorSaturated instead of
+    letting latency grow without bound. Queue depth, wait time and run
+    time are tracked for the admin stats endpoint, which reports every
+    pool listed by `live()`.
+    """
+
+    _live: List["BlockingExecutor"] = []
+    _live_lock = threading.Lock()
+
+    def __init__(self, name: str, workers: int, max_queue: int) -> None:
+        self.name = name
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._run_ms_total = 0.0
+        self._run_ms_max = 0.0
+        with BlockingExecutor._live_lock:
+            BlockingExecutor._live.append(self)
+
+    @classmethod
+    def live(cls) -> List["BlockingExecutor"]:
+        """Pools created and not shut down yet, oldest first."""
+        with cls._live_lock:
+            return list(cls._live)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self._queued + self._running >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturated(f"{self.name} executor is saturated ({self._queued} calls queued)")
+            self._queued += 1
+            self._submitted += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        enqueued = time.perf_counter()
+        # The queue slot is released once, by whichever comes first: the
+        # worker starting the call, or the caller giving up on it.
+        dequeued = False
+
+        def dequeue() -> None:
+            nonlocal dequeued
+            if not dequeued:
+                dequeued = True
+                self._queued -= 1
+
+        def call() -> T:
+            started = time.perf_counter()
+            wait_ms = (started - enqueued) * 1000
+            with self._lock:
+                dequeue()
+                self._running += 1
+                self._wait_ms_total += wait_ms
+                self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                run_ms = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._failed += failed
+                    self._run_ms_total += run_ms
+                    self._run_ms_max = max(self._run_ms_max, run_ms)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            # A caller cancelled while the call was still queued (client
+            # disconnect, timeout) must not leak its slot.
+            with self._lock:
+                dequeue()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "max_queued": self._max_queued,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "wait_ms_avg": round(self._wait_ms_total / started, 3) if started else 0.0,
+                "wait_ms_max": round(self._wait_ms_max, 3),
+                "run_ms_avg": round(self._run_ms_total / self._completed, 3) if self._completed else 0.0,
+                "run_ms_max": round(self._run_ms_max, 3),
+            }
+
+    def shutdown(self) -> None:
+        with BlockingExecutor._live_lock:
+            if self in BlockingExecutor._live:
+                BlockingExecutor._live.remove(self)
+        self._executor.shutdown(wait=False, cancel_futures=True)
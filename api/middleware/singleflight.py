@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from .logging import get_logger
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent async computations that share a key.
+
+    The first caller for a key starts the computation as a task; callers
+    arriving while it runs await the same task instead of starting their
+    own. Each waiter is shielded, so a disconnecting client does not cancel
+    the work for the others. Exceptions reach every waiter.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._started = 0
+        self._coalesced = 0
+        self._background_failures = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task, _started = self._task(key, func)
+        return await asyncio.shield(task)
+
+    def spawn(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> None:
+        """Start the computation in the background unless it is already running.
+
+        Failures of computations started here are logged once; a running
+        one is left to the caller that started it.
+        """
+        task, started = self._task(key, func)
+        if started:
+            task.add_done_callback(self._log_background_failure)
+
+    def _task(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> Tuple["asyncio.Task[T]", bool]:
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced += 1
+            return task, False
+        task = asyncio.ensure_future(func())
+        self._started += 1
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return task, True
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away.
+            task.exception()
+
+    def _log_background_failure(self, task: "asyncio.Task[Any]") -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        self._background_failures += 1
+        get_logger().warning(
+            "background_refresh_failed",
+            extra={"flight": self.name, "error": str(task.exception())},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inflight": len(self._inflight),
+            "started": self._started,
+            "coalesced": self._coalesced,
+            "background_failures": self._background_failures,
+        }
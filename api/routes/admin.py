@@ -3,7 +3,10 @@ from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Header
 
-from database import fetch_ingest_runs, fetch_coverage_stats
+from database import admin_executor, fetch_ingest_runs, fetch_coverage_stats
+from middleware import BlockingExecutor, ExecutorSaturated
+
+from .market import market_cache, market_loads, series_cache
 
 router = APIRouter(prefix="/stats", tags=["admin"])
 
@@ -33,9 +36,9 @@ async def get_ingest_runs(
         raise HTTPException(status_code=403, detail="Unauthorized")
 
     try:
-        runs, total = fetch_ingest_runs(pipeline=pipeline, limit=limit)
+        runs, total = await admin_executor.run(fetch_ingest_runs, pipeline=pipeline, limit=limit)
         return {"runs": runs, "total": total}
-    except FileNotFoundError as e:
+    except (FileNotFoundError, ExecutorSaturated) as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -52,9 +55,31 @@ async def get_coverage_stats(
         raise HTTPException(status_code=403, detail="Unauthorized")
 
     try:
-        coverage, summary = fetch_coverage_stats(brand=brand, min_points=min_points)
+        coverage, summary = await admin_executor.run(fetch_coverage_stats, brand=brand, min_points=min_points)
         return {"coverage": coverage, "summary": summary}
-    except FileNotFoundError as e:
+    except (FileNotFoundError, ExecutorSaturated) as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/executors")
+async def get_executor_stats(x_admin_key: Optional[str] = Header(None)):
+    """Queue depth, wait and run times of every blocking-call thread pool."""
+    admin_key = os.environ.get("ADMIN_API_KEY")
+    if admin_key and x_admin_key != admin_key:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    return {executor.name: executor.stats() for executor in BlockingExecutor.live()}
+
+
+@router.get("/caches")
+async def get_cache_stats(x_admin_key: Optional[str] = Header(None)):
+    """Size and hit rate of the in-process response caches."""
+    admin_key = os.environ.get("ADMIN_API_KEY")
+    if admin_key and x_admin_key != admin_key:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+    stats = {cache.name: cache.stats() for cache in (market_cache, series_cache)}
+    stats[market_loads.name] = market_loads.stats()
+    return stats
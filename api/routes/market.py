@@ -1,14 +1,74 @@
-from datetime import datetime
-from typing import Optional, List
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Literal, NamedTuple, Optional, List
 
-from fastapi import APIRouter, HTTPException, Request, Response
-from pydantic import BaseModel
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
 from email.utils import formatdate
 
-from database import get_market_history, get_market_summary
+from catalog import encode_json, etag_matches
+from database import (
+    MarketdataVersion,
+    cached_marketdata_version,
+    get_market_histories,
+    get_market_history,
+    get_market_summaries,
+    get_market_summary,
+    get_marketdata_version,
+    marketdata_executor,
+)
+from history_formats import (
+    MEDIA_TYPES,
+    HistoryEncodingError,
+    binary_headers,
+    encode_binary,
+    encode_columnar,
+    negotiate_format,
+)
+from middleware import ExecutorSaturated, LRUCache, SingleFlight
+from valuation import WeeklySeries, load_weekly_series, portfolio_value
 
 router = APIRouter(prefix="/market", tags=["market"])
 
+DownsampleMode = Literal["lttb", "minmax"]
+HistoryFormat = Literal["json", "columnar", "binary"]
+
+MARKET_CACHE_SIZE = int(os.getenv("MARKET_CACHE_SIZE", "4096"))
+MARKET_MAX_AGE = 300
+MARKET_STALE_SECONDS = float(os.getenv("MARKET_STALE_SECONDS", "60"))
+MARKET_BATCH_MAX = 500
+MAX_HISTORY_POINTS = 5000
+MARKET_SERIES_CACHE_SIZE = int(os.getenv("MARKET_SERIES_CACHE_SIZE", "4096"))
+
+
+class CachedMarketResponse(NamedTuple):
+    token: str
+    # Encoded body; b"" marks a watch with no data (404)
+    body: bytes
+    headers: Dict[str, str]
+    media_type: str = "application/json"
+
+
+# Latest response per (kind, watch id, variant). An entry whose token differs from
+# the current version is stale: it is served only while a refresh runs
+# and is then overwritten.
+market_cache: "LRUCache[CachedMarketResponse]" = LRUCache("market", MARKET_CACHE_SIZE)
+# Concurrent loads of the same (kind, watch id, token), and of the version
+# itself, share one marketdata query.
+market_loads = SingleFlight("market-loads")
+
+
+class CachedSeries(NamedTuple):
+    token: str
+    # None when the watch has no price data
+    series: Optional[WeeklySeries]
+
+
+# Weekly-aligned, forward-filled price arrays per watch for /market/portfolio.
+series_cache: "LRUCache[CachedSeries]" = LRUCache("market-series", MARKET_SERIES_CACHE_SIZE)
+
 
 class MarketHistoryResponse(BaseModel):
     points: List[List[float]]
@@ -36,36 +96,88 @@ class MarketSummaryResponse(BaseModel):
     last_updated: str
 
 
-def get_cache_headers(watch_id: str, max_age: int = 3600) -> dict:
-    now = datetime.utcnow()
-    bucket = int(now.timestamp()) // max_age
-    etag = f'W/"market-{watch_id}-{bucket}"'
-    last_modified = formatdate(now.timestamp(), usegmt=True)
-    return {
-        "Cache-Control": f"public, max-age={max_age}",
+class MarketBatchRequest(BaseModel):
+    watch_ids: List[str] = Field(..., min_length=1, max_length=MARKET_BATCH_MAX)
+    include_history: bool = False
+
+
+class MarketBatchResponse(BaseModel):
+    summaries: Dict[str, MarketSummaryResponse]
+    history: Optional[Dict[str, MarketHistoryResponse]] = None
+    not_found: List[str]
+
+
+class PortfolioItem(BaseModel):
+    watch_id: str
+    quantity: int = Field(1, ge=1, le=1000)
+
+
+class PortfolioRequest(BaseModel):
+    items: List[PortfolioItem] = Field(..., min_length=1, max_length=MARKET_BATCH_MAX)
+
+
+class PortfolioValueResponse(BaseModel):
+    points: List[List[float]]
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    points_count: int
+    missing: List[str]
+
+
+def _http_date(timestamp: Optional[str]) -> Optional[str]:
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return formatdate(parsed.timestamp(), usegmt=True)
+
+
+def get_cache_headers(etag: str, version: MarketdataVersion, max_age: int = MARKET_MAX_AGE) -> Dict[str, str]:
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={int(MARKET_STALE_SECONDS)}",
         "ETag": etag,
-        "Last-Modified": last_modified,
     }
+    last_modified = _http_date(version.last_modified)
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
 
 
-@router.get("/history/{watch_id}", response_model=MarketHistoryResponse)
-async def market_history(watch_id: str, request: Request, response: Response):
+async def _run_marketdata(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
     try:
-        data = get_market_history(watch_id, downsample=True)
+        return await marketdata_executor.run(func, *args, **kwargs)
     except FileNotFoundError:
         raise HTTPException(status_code=503, detail="Market data service unavailable")
+    except ExecutorSaturated:
+        raise HTTPException(status_code=503, detail="Market data service busy", headers={"Retry-After": "1"})
 
-    if not data:
-        raise HTTPException(status_code=404, detail=f"No market data for '{watch_id}'")
 
-    headers = get_cache_headers(watch_id)
-    etag = headers.get("ETag")
+async def _current_version() -> MarketdataVersion:
+    version = cached_marketdata_version()
+    if version is None:
+        version = await market_loads.run("version", lambda: _run_marketdata(get_marketdata_version))
+    return version
 
-    if request.headers.get("if-none-match") == etag:
-        return Response(status_code=304, headers=headers)
 
-    response.headers.update(headers)
+def _token(kind: str, version: MarketdataVersion) -> str:
+    if kind == "summary" and not version.summaries_materialized:
+        # Summaries computed on the fly compare against dates relative to
+        # today; materialized ones only change with an ingest.
+        return f"{version.token}-{datetime.now(timezone.utc):%Y%m%d}"
+    return version.token
 
+
+def _etag(kind: str, watch_id: str, token: str, variant: str = "") -> str:
+    if variant:
+        kind = f"{kind}-{variant}"
+    return f'W/"market-{kind}-{watch_id}-{token}"'
+
+
+def _render_history(data: Dict[str, Any]) -> BaseModel:
     return MarketHistoryResponse(
         points=data["points"],
         source=data["source"],
@@ -75,24 +187,7 @@ async def market_history(watch_id: str, request: Request, response: Response):
     )
 
 
-@router.get("/summary/{watch_id}", response_model=MarketSummaryResponse)
-async def market_summary(watch_id: str, request: Request, response: Response):
-    try:
-        data = get_market_summary(watch_id)
-    except FileNotFoundError:
-        raise HTTPException(status_code=503, detail="Market data service unavailable")
-
-    if not data:
-        raise HTTPException(status_code=404, detail=f"No market data for '{watch_id}'")
-
-    headers = get_cache_headers(watch_id)
-    etag = headers.get("ETag")
-
-    if request.headers.get("if-none-match") == etag:
-        return Response(status_code=304, headers=headers)
-
-    response.headers.update(headers)
-
+def _render_summary(data: Dict[str, Any]) -> BaseModel:
     return MarketSummaryResponse(
         price=data["price"],
         min_usd=data.get("min_usd"),
@@ -101,3 +196,223 @@ async def market_summary(watch_id: str, request: Request, response: Response):
         change_pct=data["change_pct"],
         last_updated=data["last_updated"],
     )
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any]], BaseModel]] = {
+    "history": _render_history,
+    "summary": _render_summary,
+}
+
+# Compact history encodings (see history_formats), keyed by ?format=
+HISTORY_ENCODERS: Dict[str, Callable[[Dict[str, Any]], bytes]] = {
+    "columnar": encode_columnar,
+    "binary": encode_binary,
+}
+
+
+def _store(
+    kind: str,
+    watch_id: str,
+    version: MarketdataVersion,
+    data: Optional[Dict[str, Any]],
+    variant: str = "",
+    fmt: str = "json",
+) -> CachedMarketResponse:
+    token = _token(kind, version)
+    headers = {**get_cache_headers(_etag(kind, watch_id, token, variant), version), **_vary(kind)}
+    if not data:
+        body = b""
+    elif fmt == "json":
+        body = encode_json(RENDERERS[kind](data).model_dump())
+    else:
+        try:
+            body = HISTORY_ENCODERS[fmt](data)
+        except HistoryEncodingError:
+            # Gaps or prices too wide for the binary layout; columnar has no limits.
+            fmt = "columnar"
+            body = encode_columnar(data)
+        if fmt == "binary":
+            headers.update(binary_headers(data))
+    entry = CachedMarketResponse(token, body, headers, MEDIA_TYPES[fmt])
+    market_cache.put((kind, watch_id, variant), entry)
+    return entry
+
+
+def _vary(kind: str) -> Dict[str, str]:
+    # History bodies are negotiated on Accept when ?format= is absent.
+    return {"Vary": "Accept"} if kind == "history" else {}
+
+
+async def _versioned_response(
+    request: Request,
+    kind: str,
+    watch_id: str,
+    load: Callable[[], Dict[str, Any]],
+    variant: str = "",
+    fmt: str = "json",
+) -> Response:
+    """Serve a market resource from the data-versioned cache.
+
+    The ETag is derived from the marketdata version, so a 304 means the
+    data really is unchanged. A fresh version and a cached body answer the
+    request without touching SQLite. Concurrent misses for the same watch
+    share one query. For MARKET_STALE_SECONDS after the version changes,
+    the previous body is served immediately while one background load
+    replaces it. `variant` names other renditions of the same resource,
+    which are cached and tagged separately; `fmt` is the body encoding.
+    """
+    version = await _current_version()
+    token = _token(kind, version)
+    etag = _etag(kind, watch_id, token, variant)
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={**get_cache_headers(etag, version), **_vary(kind)})
+
+    async def refresh() -> CachedMarketResponse:
+        return _store(kind, watch_id, version, await _run_marketdata(load), variant, fmt)
+
+    entry = market_cache.get((kind, watch_id, variant))
+    if entry is None or entry.token != token:
+        if entry is not None and time.monotonic() - version.observed_at < MARKET_STALE_SECONDS:
+            market_loads.spawn((kind, watch_id, variant, token), refresh)
+        else:
+            entry = await market_loads.run((kind, watch_id, variant, token), refresh)
+
+    if etag_matches(if_none_match, entry.headers["ETag"]):
+        return Response(status_code=304, headers=entry.headers)
+    if not entry.body:
+        raise HTTPException(status_code=404, detail=f"No market data for '{watch_id}'")
+    return Response(content=entry.body, media_type=entry.media_type, headers=entry.headers)
+
+
+async def _batch_bodies(
+    kind: str,
+    watch_ids: List[str],
+    version: MarketdataVersion,
+    load_many: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+) -> Dict[str, bytes]:
+    """Encoded bodies for many watches: current cache entries, the rest from one query.
+
+    Loaded bodies go into the per-watch cache, so batch and single-watch
+    requests warm each other.
+    """
+    token = _token(kind, version)
+    bodies: Dict[str, bytes] = {}
+    missing: List[str] = []
+    for watch_id in watch_ids:
+        entry = market_cache.get((kind, watch_id, ""))
+        if entry is not None and entry.token == token:
+            bodies[watch_id] = entry.body
+        else:
+            missing.append(watch_id)
+    if missing:
+        loaded = await market_loads.run(
+            (kind, tuple(missing), token), lambda: _run_marketdata(load_many, missing)
+        )
+        for watch_id in missing:
+            bodies[watch_id] = _store(kind, watch_id, version, loaded.get(watch_id)).body
+    return bodies
+
+
+def _json_object(bodies: Dict[str, bytes]) -> bytes:
+    return b"{" + b",".join(encode_json(key) + b":" + body for key, body in bodies.items() if body) + b"}"
+
+
+@router.get("/history/{watch_id}", response_model=MarketHistoryResponse)
+async def market_history(
+    watch_id: str,
+    request: Request,
+    points: Optional[int] = Query(
+        None, ge=4, le=MAX_HISTORY_POINTS, description="Return at most this many points, chosen by `mode`"
+    ),
+    mode: DownsampleMode = Query(
+        "lttb", description="`lttb` keeps the visual shape; `minmax` keeps each bucket's low and high"
+    ),
+    fmt: Optional[HistoryFormat] = Query(
+        None,
+        alias="format",
+        description="`columnar` or `binary` for a compact body; defaults to the Accept header, else `json`",
+    ),
+):
+    fmt = fmt or negotiate_format(request.headers.get("accept"))
+    variant = "-".join(part for part in (f"{mode}{points}" if points else "", fmt if fmt != "json" else "") if part)
+    return await _versioned_response(
+        request,
+        "history",
+        watch_id,
+        lambda: get_market_history(watch_id, downsample=True, points=points, mode=mode),
+        variant,
+        fmt,
+    )
+
+
+@router.get("/summary/{watch_id}", response_model=MarketSummaryResponse)
+async def market_summary(watch_id: str, request: Request):
+    return await _versioned_response(request, "summary", watch_id, lambda: get_market_summary(watch_id))
+
+
+@router.post("/summaries", response_model=MarketBatchResponse)
+async def market_summaries(body: MarketBatchRequest):
+    """Summaries (and optionally weekly histories) for many watches, keyed by watch id.
+
+    Watches already cached for the current data version are served from
+    memory; all others are fetched with one query per kind. Ids without
+    market data are listed in `not_found`.
+    """
+    watch_ids = list(dict.fromkeys(body.watch_ids))
+    version = await _current_version()
+    summaries = await _batch_bodies("summary", watch_ids, version, get_market_summaries)
+    parts = [b'{"summaries":', _json_object(summaries)]
+    if body.include_history:
+        histories = await _batch_bodies("history", watch_ids, version, get_market_histories)
+        parts += [b',"history":', _json_object(histories)]
+    not_found = [watch_id for watch_id in watch_ids if not summaries[watch_id]]
+    parts += [b',"not_found":', encode_json(not_found), b"}"]
+    return Response(content=b"".join(parts), media_type="application/json")
+
+
+@router.post("/portfolio", response_model=PortfolioValueResponse)
+async def market_portfolio(body: PortfolioRequest):
+    """Total value over time of a collection, one point per week.
+
+    Each watch's history is aligned to a Monday-based weekly grid with gaps
+    forward-filled, multiplied by its quantity and summed. Aligned arrays
+    are cached per watch and data version, so only watches not seen since
+    the last ingest are read from SQLite (in one query). Watches without
+    market data are listed in `missing`.
+    """
+    quantities: Dict[str, int] = {}
+    for item in body.items:
+        quantities[item.watch_id] = quantities.get(item.watch_id, 0) + item.quantity
+
+    version = await _current_version()
+    series: Dict[str, Optional[WeeklySeries]] = {}
+    uncached: List[str] = []
+    for watch_id in quantities:
+        entry = series_cache.get(watch_id)
+        if entry is not None and entry.token == version.token:
+            series[watch_id] = entry.series
+        else:
+            uncached.append(watch_id)
+    if uncached:
+        loaded = await market_loads.run(
+            ("series", tuple(uncached), version.token), lambda: _run_marketdata(load_weekly_series, uncached)
+        )
+        for watch_id in uncached:
+            series[watch_id] = loaded.get(watch_id)
+            series_cache.put(watch_id, CachedSeries(version.token, series[watch_id]))
+
+    holdings = [
+        (series[watch_id], quantity) for watch_id, quantity in quantities.items() if series[watch_id] is not None
+    ]
+    missing = [watch_id for watch_id in quantities if series[watch_id] is None]
+    valuation: Dict[str, Any] = {"points": [], "points_count": 0, "missing": missing}
+    if holdings:
+        timestamps, values = portfolio_value(holdings)
+        valuation.update(
+            points=[list(point) for point in zip(timestamps.tolist(), np.round(values, 2).tolist())],
+            start_date=datetime.fromtimestamp(int(timestamps[0]), timezone.utc).date().isoformat(),
+            end_date=datetime.fromtimestamp(int(timestamps[-1]), timezone.utc).date().isoformat(),
+            points_count=len(timestamps),
+        )
+    return Response(content=encode_json(valuation), media_type="application/json")
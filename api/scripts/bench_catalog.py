@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""Benchmarks for the in-process catalog store.
+
+Run from the api directory:
+
+    python scripts/bench_catalog.py search --models 100000
+    python scripts/bench_catalog.py facets --models 100000
+    python scripts/bench_catalog.py reload --models 20000
+"""
+import argparse
+import gc
+import heapq
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+sys.path.insert(0, str(API_DIR.parent / "crawler"))
+
+from watchcollection_crawler.catalog_binary import write_catalog_binary  # noqa: E402
+
+BRANDS = [
+    ("rolex", "Rolex", "Switzerland", "luxury", ["Submariner", "Datejust", "Daytona", "GMT-Master II", "Explorer"]),
+    ("omega", "Omega", "Switzerland", "premium", ["Speedmaster", "Seamaster", "Constellation", "De Ville"]),
+    ("tudor", "Tudor", "Switzerland", "upper_mid", ["Black Bay", "Pelagos", "Ranger", "Royal"]),
+    ("seiko", "Seiko", "Japan", "accessible", ["Prospex", "Presage", "5 Sports", "Astron"]),
+    ("panerai", "Panerai", "Italy", "premium", ["Luminor", "Radiomir", "Submersible"]),
+    ("iwc", "IWC Schaffhausen", "Switzerland", "premium", ["Portugieser", "Pilot's Watch", "Portofino"]),
+]
+MATERIALS = ["Stainless Steel", "Yellow Gold", "Rose Gold", "Titanium", "Ceramic", "Platinum"]
+DIALS = ["Black", "Blue", "White", "Green", "Silver", "Champagne"]
+MOVEMENTS = ["Automatic", "Manual", "Quartz"]
+COMPLICATIONS = ["Date", "Chronograph", "GMT", "Moon Phase", "Power Reserve"]
+
+
+def synthetic_catalog(model_count: int, seed: int = 7, history_points: int = 52) -> dict:
+    rng = random.Random(seed)
+    per_brand = model_count // len(BRANDS)
+    brands = []
+    ordinal = 0
+    for index, (brand_id, name, country, tier, collections) in enumerate(BRANDS):
+        count = per_brand if index < len(BRANDS) - 1 else model_count - per_brand * index
+        models = []
+        for _ in range(count):
+            ordinal += 1
+            reference = f"{rng.randint(100, 999)}{ordinal:06d}"
+            collection = rng.choice(collections)
+            price = rng.randint(500, 60000)
+            start = 1704067200 - history_points * 604800
+            models.append({
+                "reference": reference,
+                "reference_aliases": [f"{reference}LN", f"M{reference}"],
+                "display_name": f"{collection} {reference}",
+                "collection": collection,
+                "style": rng.choice(["Diver", "Dress", "Pilot", "Sport"]),
+                "production_year_start": rng.randint(1990, 2024),
+                "production_year_end": None,
+                "case": {
+                    "diameter_mm": rng.choice([36, 38, 39, 40, 41, 42, 44]),
+                    "thickness_mm": round(rng.uniform(8, 15), 1),
+                    "material": rng.choice(MATERIALS),
+                    "water_resistance_m": rng.choice([30, 50, 100, 300]),
+                    "dial_color": rng.choice(DIALS),
+                },
+                "movement": {
+                    "type": rng.choice(MOVEMENTS),
+                    "caliber": f"Cal. {rng.randint(1000, 9999)}",
+                    "power_reserve_hours": rng.choice([38, 48, 70]),
+                },
+                "complications": rng.sample(COMPLICATIONS, rng.randint(0, 2)),
+                "features": [],
+                "retail_price_usd": price,
+                "catalog_image_url": f"https://images.example.com/{brand_id}/{reference}.jpg",
+                "market_price": {
+                    "min_usd": int(price * 0.8),
+                    "max_usd": int(price * 1.3),
+                    "median_usd": price,
+                    "listings": rng.randint(1, 80),
+                    "updated_at": "2025-12-31",
+                },
+                "market_price_history": {
+                    "source": "watchcharts_csv",
+                    "points": [
+                        [start + week * 604800, price + rng.randint(-500, 500)]
+                        for week in range(history_points)
+                    ],
+                },
+                "watchcharts_id": str(ordinal),
+                "watchcharts_url": f"https://watchcharts.com/watch_model/{ordinal}",
+                "is_current": rng.random() > 0.3,
+            })
+        brands.append({"id": brand_id, "name": name, "country": country, "tier": tier, "models": models})
+    return {"version": "4.0.0", "brands": brands}
+
+
+def write_bundle(catalog: dict, data_dir: Path) -> Path:
+    bundle = data_dir / "catalog_bundle.json"
+    with open(bundle, "w", encoding="utf-8") as f:
+        json.dump(catalog, f)
+    return bundle
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench_search(args: argparse.Namespace) -> None:
+    from catalog import CatalogStore, SearchHit
+    from catalog.search import _rank
+
+    queries: List[str] = args.queries or ["126610", "submariner", "rolex blue", "cal. 3", "gmt", "zz"]
+    with tempfile.TemporaryDirectory() as tmp:
+        write_bundle(synthetic_catalog(args.models, history_points=0), Path(tmp))
+        store = CatalogStore(Path(tmp))
+        start = time.perf_counter()
+        store.refresh()
+        print(f"load+index {args.models} models: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        snapshot = store.snapshot
+        index = snapshot.search_index
+        for query in queries:
+
+            lowered = query.lower().strip()
+
+            def linear() -> List[SearchHit]:
+                # Score every model's text, as search did before the index.
+                return heapq.nsmallest(args.limit, index._hits(range(len(index)), lowered), key=_rank)
+
+            def full_sort() -> List[SearchHit]:
+                return index.search(query)
+
+            ranked = full_sort()
+            assert index.search(query, args.limit) == ranked[:args.limit], f"top-k disagrees for {query!r}"
+            assert linear() == ranked[:args.limit], f"index disagrees with linear scan for {query!r}"
+            paged, cursor = [], None
+            for _ in range(3):
+                page, cursor = snapshot.search(query, args.limit, cursor)
+                paged.extend(page)
+                if cursor is None:
+                    break
+            expected = [snapshot.catalog.string("reference", hit.ordinal) for hit in ranked[:len(paged)]]
+            assert [model["reference"] for model in paged] == expected, f"pages disagree for {query!r}"
+            print(
+                f"{query!r:>14}: {len(ranked):6d} hits  linear {timed(linear, args.repeat):8.3f} ms"
+                f"  full sort {timed(full_sort, args.repeat):8.3f} ms"
+                f"  top-k {timed(lambda: index.search(query, args.limit), args.repeat):8.3f} ms"
+                f"  snapshot.search {timed(lambda: snapshot.search(query, args.limit), args.repeat):8.3f} ms"
+            )
+
+
+def bench_facets(args: argparse.Namespace) -> None:
+    from catalog import BinaryCatalog, CatalogSnapshot, VersionHistory, parse_filters
+    from catalog.facets import FACET_FIELDS, LIST_FACET_FIELDS, RANGE_FIELDS
+
+    queries = args.queries or [
+        "material=Stainless Steel&diameter_mm=38..41&movement_type=Automatic&market_price_usd=..10000",
+        "brand=rolex&complications=GMT&sort=-market_price_usd",
+        "dial_color=Blue&dial_color=Green&sort=retail_price_usd",
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = synthetic_catalog(args.models, history_points=0)
+        write_catalog_binary(catalog, Path(tmp) / "catalog_bundle.bin")
+        models = [(brand["id"], model) for brand in catalog["brands"] for model in brand["models"]]
+        del catalog
+        snapshot = CatalogSnapshot.from_binary(
+            BinaryCatalog(Path(tmp) / "catalog_bundle.bin"), None, None, VersionHistory()
+        )
+        start = time.perf_counter()
+        index = snapshot.facet_index
+        print(f"facet index over {args.models} models: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        def field(brand_id: str, model: dict, name: str):
+            if name == "brand":
+                return brand_id
+            path = (RANGE_FIELDS.get(name) or FACET_FIELDS.get(name) or LIST_FACET_FIELDS[name]).split(".")
+            value = model
+            for part in path:
+                value = (value or {}).get(part)
+            return value
+
+        for query in queries:
+            params = [tuple(item.split("=", 1)) for item in query.split("&")]
+            sort = dict(params).get("sort")
+            ranges, facets = parse_filters((k, v) for k, v in params if k != "sort")
+
+            def loop() -> List[int]:
+                hits = []
+                for ordinal, (brand_id, model) in enumerate(models):
+                    ok = all(
+                        (value := field(brand_id, model, name)) is not None
+                        and (low is None or value >= low) and (high is None or value <= high)
+                        for name, (low, high) in ranges.items()
+                    ) and all(
+                        any(
+                            label.lower() in {v.lower() for v in (value if isinstance(value, list) else [value]) if v}
+                            for label in labels
+                        )
+                        for name, labels in facets.items()
+                        for value in (field(brand_id, model, name),)
+                    )
+                    if ok:
+                        hits.append(ordinal)
+                if sort:
+                    name = sort.lstrip("-")
+                    present = [o for o in hits if field(*models[o], name) is not None]
+                    missing = [o for o in hits if field(*models[o], name) is None]
+                    present.sort(key=lambda o: field(*models[o], name), reverse=sort.startswith("-"))
+                    hits = present + missing
+                return hits[:args.limit]
+
+            result = index.query(ranges, facets, sort, 0, args.limit)
+            assert result.ordinals == loop(), f"facet index disagrees with loop for {query!r}"
+            print(
+                f"{result.total:6d} of {args.models}: loop {timed(loop, args.repeat):9.3f} ms"
+                f"  numpy {timed(lambda: index.query(ranges, facets, sort, 0, args.limit), args.repeat):7.3f} ms"
+                f"  {query}"
+            )
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() / 1024 / 1024
+
+
+def peak_rss_mb() -> float:
+    # VmHWM, unlike ru_maxrss, is not carried over from the parent across exec.
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def reload_child(args: argparse.Namespace) -> None:
+    from catalog import CatalogSnapshot, VersionHistory
+    from catalog.binary import BinaryCatalog
+    from catalog.loader import CatalogBundle, StreamingBundle
+
+    data_dir = Path(args.data_dir)
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    if args.mode == "binary":
+        snapshot = CatalogSnapshot.from_binary(
+            BinaryCatalog(data_dir / "catalog_bundle.bin"), None, None, VersionHistory()
+        )
+    else:
+        if args.mode == "json":
+            with open(data_dir / "catalog_bundle.json", "r", encoding="utf-8") as f:
+                bundle = CatalogBundle(json.load(f))
+        else:
+            bundle = StreamingBundle(data_dir / "catalog_bundle.json")
+        snapshot = CatalogSnapshot.from_bundle(bundle, None, None, VersionHistory())
+        del bundle
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    steady = current_rss_mb() - baseline
+    peak = peak_rss_mb() - baseline
+    print(json.dumps({
+        "mode": args.mode,
+        "models": len(snapshot.catalog),
+        "seconds": round(elapsed, 3),
+        "steady_mb": round(steady, 1),
+        "peak_mb": round(peak, 1),
+    }))
+
+
+def bench_reload(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = synthetic_catalog(args.models)
+        bundle = write_bundle(catalog, Path(tmp))
+        binary = bundle.with_suffix(".bin")
+        write_catalog_binary(catalog, binary)
+        del catalog
+        print(
+            f"bundle: {args.models} models, {bundle.stat().st_size / 1024 / 1024:.1f} MB json,"
+            f" {binary.stat().st_size / 1024 / 1024:.1f} MB binary"
+        )
+        for mode in ("json", "stream", "binary"):
+            out = subprocess.run(
+                [sys.executable, __file__, "reload-child", "--mode", mode, "--data-dir", tmp],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            print(
+                f"{mode:>6}: {result['seconds']:7.3f} s  steady {result['steady_mb']:8.1f} MB"
+                f"  peak {result['peak_mb']:8.1f} MB"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Catalog store benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    search = sub.add_parser("search", help="Indexed top-k search vs linear scan and sorting every hit")
+    search.add_argument("--models", type=int, default=100_000)
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--repeat", type=int, default=20)
+    search.add_argument("queries", nargs="*")
+    search.set_defaults(func=bench_search)
+
+    facets = sub.add_parser("facets", help="Faceted /models queries vs a Python loop")
+    facets.add_argument("--models", type=int, default=100_000)
+    facets.add_argument("--limit", type=int, default=50)
+    facets.add_argument("--repeat", type=int, default=10)
+    facets.add_argument("queries", nargs="*")
+    facets.set_defaults(func=bench_facets)
+
+    reload = sub.add_parser("reload", help="Load time and RSS: json.load vs streaming vs mapped binary")
+    reload.add_argument("--models", type=int, default=20_000)
+    reload.set_defaults(func=bench_reload)
+
+    child = sub.add_parser("reload-child")
+    child.add_argument("--mode", choices=["json", "stream", "binary"], required=True)
+    child.add_argument("--data-dir", required=True)
+    child.set_defaults(func=reload_child)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Benchmarks for the marketdata SQLite read path.
+
+Run from the api directory:
+
+    python scripts/bench_marketdata.py connections --watches 2000 --days 365
+    python scripts/bench_marketdata.py summaries --watches 2000 --days 365
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Generator, List
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+SCHEMA = API_DIR.parent / "crawler" / "watchcollection_crawler" / "marketdata" / "schema.sql"
+SOURCES = ["watchcharts", "chrono24"]
+INSERT = """
+    INSERT INTO market_snapshot
+        (watchcharts_id, brand_slug, reference, as_of_date, source, median_usd, min_usd, max_usd, listings_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def watch_ids(count: int) -> List[str]:
+    return [f"{100000 + i}" for i in range(count)]
+
+
+def synthetic_marketdata(db_path: Path, watches: int, days: int, seed: int = 7) -> List[str]:
+    """Write a marketdata DB with one snapshot per watch, source and day."""
+    rng = random.Random(seed)
+    ids = watch_ids(watches)
+    today = date.today()
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA.read_text())
+    rows = []
+    for watch_id in ids:
+        price = rng.randint(500, 60000)
+        for source in SOURCES:
+            for day in range(days):
+                price = max(100, int(price * rng.uniform(0.99, 1.01)))
+                rows.append((
+                    watch_id, "rolex", f"REF-{watch_id}", (today - timedelta(days=day)).isoformat(), source,
+                    price, int(price * 0.9), int(price * 1.1), rng.randint(1, 40),
+                ))
+        if len(rows) > 100_000:
+            conn.executemany(INSERT, rows)
+            rows.clear()
+    conn.executemany(INSERT, rows)
+    conn.execute(
+        "INSERT INTO ingest_run (pipeline, started_at, finished_at, ok, rows_out) VALUES (?, ?, ?, 1, ?)",
+        ("bench", today.isoformat(), today.isoformat(), watches * days * len(SOURCES)),
+    )
+    conn.commit()
+    conn.close()
+    return ids
+
+
+@contextmanager
+def fresh_conn() -> Generator[sqlite3.Connection, None, None]:
+    """The previous behaviour: a new connection per request."""
+    import database
+
+    conn = sqlite3.connect(str(database.get_marketdata_db_path()))
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def latencies(fn: Callable[[str], object], ids: List[str], repeat: int) -> List[float]:
+    samples = []
+    for i in range(repeat):
+        watch_id = ids[i % len(ids)]
+        start = time.perf_counter()
+        fn(watch_id)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"  {label:<8} median {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def bench_connections(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "marketdata.sqlite"
+        start = time.perf_counter()
+        ids = synthetic_marketdata(db_path, args.watches, args.days)
+        print(f"wrote {args.watches} watches x {args.days} days: {time.perf_counter() - start:.1f} s")
+        os.environ["MARKETDATA_DB_PATH"] = str(db_path)
+
+        import database
+
+        pooled_conn = database.get_marketdata_conn
+        calls = {
+            "summary": lambda watch_id: database.get_market_summary(watch_id),
+            "history": lambda watch_id: database.get_market_history(watch_id),
+            "ingest-runs": lambda _watch_id: database.fetch_ingest_runs(limit=1),
+        }
+        for name, call in calls.items():
+            print(f"{name} ({args.repeat} calls, warm)")
+            for label, conn_factory in (("fresh", fresh_conn), ("pooled", pooled_conn)):
+                database.get_marketdata_conn = conn_factory
+                try:
+                    latencies(call, ids, min(args.repeat, 50))
+                    report(label, latencies(call, ids, args.repeat))
+                finally:
+                    database.get_marketdata_conn = pooled_conn
+        database.close_marketdata_connections()
+
+
+def bench_summaries(args: argparse.Namespace) -> None:
+    from crawler_bridge import ensure_crawler_on_path
+
+    if not ensure_crawler_on_path():
+        sys.exit("crawler package not found")
+    from watchcollection_crawler.marketdata import get_conn, refresh_market_summaries
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "marketdata.sqlite"
+        ids = synthetic_marketdata(db_path, args.watches, args.days)
+        conn = get_conn(db_path)
+        start = time.perf_counter()
+        refresh_market_summaries(conn, full=True)
+        print(f"refreshed {args.watches} summaries: {time.perf_counter() - start:.2f} s")
+        conn.close()
+        os.environ["MARKETDATA_DB_PATH"] = str(db_path)
+
+        import database
+
+        def computed(watch_ids: List[str]) -> object:
+            with database.get_marketdata_conn() as read_conn:
+                return database._computed_summaries(read_conn, watch_ids)
+
+        batches = {"summary": lambda watch_id: [watch_id], "batch": lambda _watch_id: ids[:args.batch]}
+        for name, batch in batches.items():
+            print(f"{name} ({len(batch(ids[0]))} ids, {args.repeat} calls, warm)")
+            for label, call in (("computed", computed), ("table", database.get_market_summaries)):
+                latencies(lambda watch_id: call(batch(watch_id)), ids, min(args.repeat, 50))
+                report(label, latencies(lambda watch_id: call(batch(watch_id)), ids, args.repeat))
+        database.close_marketdata_connections()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Marketdata read path benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    connections = sub.add_parser("connections", help="Per-request connections vs the pooled read-only ones")
+    connections.add_argument("--watches", type=int, default=2000)
+    connections.add_argument("--days", type=int, default=365)
+    connections.add_argument("--repeat", type=int, default=2000)
+    connections.set_defaults(func=bench_connections)
+
+    summaries = sub.add_parser("summaries", help="Window-function summaries vs the materialized market_summary table")
+    summaries.add_argument("--watches", type=int, default=2000)
+    summaries.add_argument("--days", type=int, default=365)
+    summaries.add_argument("--repeat", type=int, default=200)
+    summaries.add_argument("--batch", type=int, default=50)
+    summaries.set_defaults(func=bench_summaries)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+API_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(API_DIR))
+
+from crawler_bridge import ensure_crawler_on_path  # noqa: E402
+
+
+@pytest.fixture
+def marketdata_db(tmp_path, monkeypatch):
+    """Writable connection to an empty marketdata DB with the crawler's schema.
+
+    MARKETDATA_DB_PATH points at it, so the API's read-only connections
+    open the same file.
+    """
+    if not ensure_crawler_on_path():
+        pytest.skip("crawler checkout not found")
+    from watchcollection_crawler.marketdata import get_conn, init_schema
+
+    import database
+
+    db_path = tmp_path / "marketdata.sqlite"
+    monkeypatch.setenv("MARKETDATA_DB_PATH", str(db_path))
+    conn = get_conn(db_path)
+    init_schema(conn)
+    database.close_marketdata_connections()
+    yield conn
+    conn.close()
+    database.close_marketdata_connections()
+
+
+@pytest.fixture
+def catalog_client(monkeypatch):
+    """Returns `install(catalog)`, which serves `catalog` from the app and returns a TestClient.
+
+    Startup events do not run, so nothing is read from data/ and no
+    reload task is started.
+    """
+    from fastapi.testclient import TestClient
+
+    import main
+    from catalog import CatalogSnapshot, VersionHistory
+    from catalog.loader import CatalogBundle
+
+    def install(catalog):
+        snapshot = CatalogSnapshot.from_bundle(CatalogBundle(catalog), None, None, VersionHistory())
+        monkeypatch.setattr(main.catalog_store, "_snapshot", snapshot)
+        return TestClient(main.app)
+
+    return install
+
+
+@pytest.fixture
+def market_client(marketdata_db, monkeypatch):
+    """TestClient over a temporary marketdata DB, with empty market caches."""
+    from fastapi.testclient import TestClient
+
+    import database
+    import main
+    from middleware import LRUCache, SingleFlight
+    from routes import market
+
+    monkeypatch.setattr(market, "market_cache", LRUCache("market", 64))
+    monkeypatch.setattr(market, "series_cache", LRUCache("market-series", 64))
+    monkeypatch.setattr(market, "market_loads", SingleFlight("market-loads"))
+    monkeypatch.setattr(database, "_version_probe", database._VersionProbe())
+    return TestClient(main.app)
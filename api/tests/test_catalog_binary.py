@@ -0,0 +1,151 @@
+import pytest
+
+from catalog import BinaryCatalog, CatalogSnapshot, VersionHistory
+from catalog.compact import MODEL_LAYOUT
+from catalog.loader import CatalogBundle
+from crawler_bridge import ensure_crawler_on_path
+
+if not ensure_crawler_on_path():
+    pytest.skip("crawler checkout not found", allow_module_level=True)
+
+from watchcollection_crawler import catalog_binary  # noqa: E402
+
+CATALOG = {
+    "version": "4.0.0",
+    "brands": [
+        {
+            "id": "rolex",
+            "name": "Rolex",
+            "country": "Switzerland",
+            "tier": "luxury",
+            "models": [
+                {
+                    "reference": "126610LN",
+                    "reference_aliases": ["126610", "M126610LN-0001"],
+                    "display_name": "Submariner Date",
+                    "collection": "Submariner",
+                    "production_year_start": 2020,
+                    "case": {"diameter_mm": 41, "material": "Oystersteel", "water_resistance_m": 300},
+                    "movement": {"type": "Automatic", "caliber": "3235", "power_reserve_hours": 70},
+                    "complications": ["Date"],
+                    "features": ["Cerachrom bezel"],
+                    "retail_price_usd": 10250,
+                    "market_price": {"median_usd": 14100, "listings": 812, "updated_at": "2026-10-01"},
+                    "market_price_history": {
+                        "source": "watchcharts",
+                        "points": [[1704067200, 14500], [1704672000, 14350.5]],
+                    },
+                    "watchcharts_id": "123",
+                    "is_current": True,
+                },
+                {
+                    "reference": "16610",
+                    "display_name": "Submariner Date (vintage)",
+                    "market_price_history": {"source": "watchcharts", "points": []},
+                    "is_current": False,
+                },
+            ],
+        },
+        {"id": "empty", "name": "Empty Brand", "models": []},
+        {
+            "id": "seiko",
+            "name": "Seiko",
+            "country": "Japan",
+            "models": [
+                {
+                    "reference": "SPB143",
+                    "display_name": "Prospex 62MAS",
+                    "case": {"diameter_mm": 40.5, "thickness_mm": 13.2, "lug_width_mm": 20.0},
+                    "watchcharts_url": "https://watchcharts.com/watch_model/spb143",
+                },
+            ],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    path = tmp_path / "catalog_bundle.bin"
+    catalog_binary.write_catalog_binary(CATALOG, path)
+    from_json = CatalogSnapshot.from_bundle(CatalogBundle(CATALOG), None, None, VersionHistory())
+    from_binary = CatalogSnapshot.from_binary(BinaryCatalog(path), None, None, VersionHistory())
+    return from_json, from_binary
+
+
+def test_crawler_layout_matches_api_layout():
+    assert catalog_binary.MODEL_LAYOUT == MODEL_LAYOUT
+
+
+def test_binary_models_match_json_load(snapshots):
+    from_json, from_binary = snapshots
+    assert from_binary.catalog.brands == from_json.catalog.brands
+    assert len(from_binary.catalog) == len(from_json.catalog)
+    for ordinal in range(len(from_json.catalog)):
+        assert from_binary.catalog.model_dict(ordinal) == from_json.catalog.model_dict(ordinal)
+
+
+def test_binary_hashes_and_revision_match_json_load(snapshots):
+    from_json, from_binary = snapshots
+    assert from_binary.revision == from_json.revision
+    assert from_binary.version.model_hashes == from_json.version.model_hashes
+    assert from_binary.brand_hashes == from_json.brand_hashes
+    assert from_binary.catalog_payload.identity == from_json.catalog_payload.identity
+    assert from_binary.lite_payload.identity == from_json.lite_payload.identity
+
+
+def test_binary_load_builds_indexes_before_swap(snapshots):
+    _from_json, from_binary = snapshots
+    assert from_binary._search_index is not None
+    assert from_binary._facet_index is not None
+    assert from_binary._reference_index is not None
+    assert from_binary._brand_orderings is not None
+    assert from_binary.cached_variant_payload("full") is None
+
+
+def _catalog_with(**fields):
+    model = {"reference": "126610LN", "display_name": "Submariner Date", **fields}
+    return {"version": "1", "brands": [{"id": "rolex", "name": "Rolex", "models": [model]}]}
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"is_current": "false"},
+        {"is_current": 0},
+        {"reference": 126610},
+        {"reference_aliases": [126610, "M126610LN-0001"]},
+        {"reference_aliases": "126610"},
+        {"reference_aliases": None},
+        {"display_name": None},
+        {"retail_price_usd": "10250"},
+        {"retail_price_usd": 10250.5},
+        {"retail_price_usd": True},
+        {"case": {"diameter_mm": "41"}},
+        {"case": {"diameter_mm": float("nan")}},
+        {"case": "41mm"},
+        {"market_price_history": {"points": [[1704067200, "14500"]]}},
+        {"market_price_history": {"points": [[1704067200, 14500, 1]]}},
+    ],
+)
+def test_binary_writer_rejects_values_the_schema_would_coerce(tmp_path, fields):
+    path = tmp_path / "catalog_bundle.bin"
+    with pytest.raises(ValueError):
+        catalog_binary.write_catalog_binary(_catalog_with(**fields), path)
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_binary_writer_accepts_numbers_the_schema_converts_losslessly(tmp_path):
+    catalog = _catalog_with(
+        retail_price_usd=10250.0,
+        case={"diameter_mm": 41, "water_resistance_m": 300.0},
+        market_price_history={"points": [[1704067200, 14500]]},
+        is_current=False,
+    )
+    path = tmp_path / "catalog_bundle.bin"
+    catalog_binary.write_catalog_binary(catalog, path)
+    from_json = CatalogSnapshot.from_bundle(CatalogBundle(catalog), None, None, VersionHistory())
+    from_binary = CatalogSnapshot.from_binary(BinaryCatalog(path), None, None, VersionHistory())
+    assert from_binary.catalog.model_dict(0) == from_json.catalog.model_dict(0)
+    assert from_binary.revision == from_json.revision
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import downsample
+from crawler_bridge import ensure_crawler_on_path
+
+if not ensure_crawler_on_path():
+    pytest.skip("crawler checkout not found", allow_module_level=True)
+
+from watchcollection_crawler.marketdata import downsample as crawler_downsample  # noqa: E402
+
+
+def series(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    timestamps = 1_600_000_000 + np.cumsum(rng.integers(1, 4, n)) * downsample.DAY_SECONDS
+    prices = np.round(20_000 + np.cumsum(rng.normal(0, 150, n)))
+    return timestamps.tolist(), prices.tolist()
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 53, 400, 1_000])
+def test_weekly_indices_match_crawler(n):
+    timestamps, _ = series(n, seed=n)
+    assert np.array_equal(downsample.weekly_indices(timestamps), crawler_downsample.weekly_indices(timestamps))
+
+
+@pytest.mark.parametrize("mode", downsample.MODES)
+@pytest.mark.parametrize("n, points", [(10, 4), (100, 7), (365, 52), (800, 200), (800, 800), (2_000, 5_000)])
+def test_downsample_indices_match_crawler(mode, n, points):
+    timestamps, prices = series(n, seed=points)
+    ours = downsample.downsample_indices(timestamps, prices, points, mode)
+    theirs = crawler_downsample.downsample_indices(timestamps, prices, points, mode)
+    assert np.array_equal(ours, theirs)
+    assert len(ours) <= points
+
+
+def test_unknown_mode_is_rejected_like_crawler():
+    with pytest.raises(ValueError):
+        downsample.downsample_indices([0, 1], [1.0, 2.0], 4, "median")
+    with pytest.raises(ValueError):
+        crawler_downsample.downsample_indices([0, 1], [1.0, 2.0], 4, "median")
@@ -0,0 +1,93 @@
+import pytest
+from starlette.requests import Request
+
+from catalog import etag_matches
+from main import not_modified_response
+
+CATALOG = {
+    "version": "1",
+    "brands": [
+        {
+            "id": "rolex",
+            "name": "Rolex",
+            "models": [
+                {"reference": "126610LN", "display_name": "Submariner Date"},
+                {"reference": "124060", "display_name": "Submariner"},
+            ],
+        },
+    ],
+}
+
+LAST_MODIFIED = "Thu, 01 Oct 2026 00:00:00 GMT"
+
+
+@pytest.mark.parametrize(
+    "if_none_match, etag, expected",
+    [
+        ('"abc"', '"abc"', True),
+        ('W/"abc"', '"abc"', True),
+        ('"abc"', 'W/"abc"', True),
+        ('W/"abc"', 'W/"abc"', True),
+        ('"abc"', '"abd"', False),
+        ('"xyz", W/"abc"', 'W/"abc"', True),
+        ('"xyz",W/"abc"  ', 'W/"abc"', True),
+        ('"xyz", "uvw"', 'W/"abc"', False),
+        ("*", 'W/"abc"', True),
+        # Malformed members are skipped, not matched.
+        ("abc", '"abc"', False),
+        ('abc, W/"abc"', 'W/"abc"', True),
+        ('W/"abc', 'W/"abc"', False),
+        ("", 'W/"abc"', False),
+        (None, 'W/"abc"', False),
+        ('"abc"', None, False),
+    ],
+)
+def test_etag_matches(if_none_match, etag, expected):
+    assert etag_matches(if_none_match, etag) is expected
+
+
+def request_with(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"if_none_match": 'W/"abc"'}, 304),
+        ({"if_none_match": '"abc"', "if_modified_since": "Mon, 01 Jan 2001 00:00:00 GMT"}, 304),
+        # If-None-Match takes precedence, even when If-Modified-Since would match.
+        ({"if_none_match": '"stale"', "if_modified_since": LAST_MODIFIED}, None),
+        ({"if_modified_since": LAST_MODIFIED}, 304),
+        ({"if_modified_since": "Mon, 01 Jan 2001 00:00:00 GMT"}, None),
+        ({}, None),
+    ],
+)
+def test_not_modified_response_precedence(headers, expected):
+    response = not_modified_response(request_with(**headers), 'W/"abc"', LAST_MODIFIED, {"ETag": 'W/"abc"'})
+    assert (response and response.status_code) == expected
+    if response is not None:
+        assert response.headers["ETag"] == 'W/"abc"'
+
+
+@pytest.fixture
+def client(catalog_client):
+    return catalog_client(CATALOG)
+
+
+def batch(client, etags):
+    items = [{"reference": "126610LN", "etag": etag} for etag in etags]
+    response = client.post("/models/batch", json={"items": items, "include_market": False})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_batch_compares_item_etags_weakly(client):
+    etag = batch(client, [None])["results"][0]["etag"]
+    assert etag.startswith('W/"')
+    strong = etag[2:]
+
+    body = batch(client, [etag, strong, f'"other", {etag}', "*", '"other"', strong[:-1]])
+    assert body["not_modified"] == [0, 1, 2, 3]
+    assert [result["index"] for result in body["results"]] == [4, 5]
+    assert all(result["etag"] == etag for result in body["results"])
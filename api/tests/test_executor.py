@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from middleware.executor import BlockingExecutor, ExecutorSaturated
+
+
+def run_blocked(scenario, **executor_args):
+    """Run `scenario(executor, release)`, always unblocking and stopping the pool."""
+    executor = BlockingExecutor("test", **executor_args)
+    release = threading.Event()
+    try:
+        asyncio.run(scenario(executor, release))
+    finally:
+        release.set()
+        executor.shutdown()
+    return executor.stats()
+
+
+def test_cancelled_queued_call_releases_its_slot():
+    async def scenario(executor, release):
+        blocker = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(lambda: "never"))
+        await asyncio.sleep(0.05)
+        assert executor.stats()["queued"] == 1
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(lambda: None)
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert executor.stats()["queued"] == 0
+
+        release.set()
+        await blocker
+        assert await executor.run(lambda: "ok") == "ok"
+
+    stats = run_blocked(scenario, workers=1, max_queue=1)
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["completed"] == 2
+
+
+def test_cancelled_running_call_is_counted_once():
+    async def scenario(executor, release):
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        release.set()
+        for _ in range(100):
+            if executor.stats()["running"] == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    stats = run_blocked(scenario, workers=1, max_queue=0)
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["completed"] == 1
+
+
+def test_live_lists_pools_until_shutdown():
+    executor = BlockingExecutor("test-live", workers=1, max_queue=1)
+    try:
+        assert executor in BlockingExecutor.live()
+    finally:
+        executor.shutdown()
+    assert executor not in BlockingExecutor.live()
@@ -0,0 +1,235 @@
+import pytest
+
+from catalog import BrandWithModels, CompactCatalogBuilder, FacetIndex, InvalidFilter, parse_filters
+
+BRANDS = [
+    {
+        "id": "rolex",
+        "name": "Rolex",
+        "models": [
+            {
+                "reference": "126610LN",
+                "display_name": "Submariner Date",
+                "case": {"diameter_mm": 41, "material": "Oystersteel", "dial_color": "Black", "water_resistance_m": 300},
+                "movement": {"type": "Automatic"},
+                "complications": ["Date"],
+                "retail_price_usd": 10_250,
+            },
+            {
+                "reference": "124060",
+                "display_name": "Submariner",
+                "case": {"diameter_mm": 41, "material": "Oystersteel", "dial_color": "Black", "water_resistance_m": 300},
+                "movement": {"type": "Automatic"},
+                "retail_price_usd": 9_100,
+            },
+            {
+                "reference": "126234",
+                "display_name": "Datejust 36",
+                "case": {"diameter_mm": 36, "material": "Oystersteel", "dial_color": "Blue", "water_resistance_m": 100},
+                "movement": {"type": "Automatic"},
+                "complications": ["Date"],
+                "retail_price_usd": 8_000,
+            },
+            {
+                "reference": "228238",
+                "display_name": "Day-Date 40",
+                "case": {"diameter_mm": 40, "material": "Yellow gold", "dial_color": "Champagne"},
+                "movement": {"type": "Automatic"},
+                "complications": ["Date", "Day"],
+            },
+        ],
+    },
+    {
+        "id": "omega",
+        "name": "Omega",
+        "models": [
+            {
+                "reference": "310.30.42.50.01.001",
+                "display_name": "Speedmaster Moonwatch",
+                "case": {"diameter_mm": 42, "material": "Steel", "dial_color": "Black", "water_resistance_m": 50},
+                "movement": {"type": "Manual"},
+                "complications": ["Chronograph"],
+                "retail_price_usd": 7_000,
+            },
+            {
+                "reference": "210.30.42.20.03.001",
+                "display_name": "Seamaster Diver 300M",
+                "case": {"material": "steel", "dial_color": "Blue", "water_resistance_m": 300},
+                "movement": {"type": "Automatic"},
+                "complications": ["Date"],
+                "retail_price_usd": 5_600,
+            },
+        ],
+    },
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    builder = CompactCatalogBuilder()
+    for brand in BRANDS:
+        builder.add_brand(BrandWithModels(**brand))
+    return FacetIndex(builder.build())
+
+
+def query(index, params=(), sort=None, offset=0, limit=50):
+    ranges, facets = parse_filters(params)
+    return index.query(ranges, facets, sort, offset, limit)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("38..42", (38.0, 42.0)),
+        ("..42", (None, 42.0)),
+        ("38.5..", (38.5, None)),
+        ("..", (None, None)),
+        ("40", (40.0, 40.0)),
+        ("-1..1e3", (-1.0, 1000.0)),
+    ],
+)
+def test_parse_range(value, expected):
+    assert parse_filters([("diameter_mm", value)]) == ({"diameter_mm": expected}, {})
+
+
+def test_parse_filters_groups_facets_and_keeps_the_last_range():
+    ranges, facets = parse_filters(
+        [
+            ("diameter_mm", "..40"),
+            ("material", "Steel"),
+            ("brand", "omega"),
+            ("material", "Yellow gold"),
+            ("complications", "Date"),
+            ("diameter_mm", "41.."),
+        ]
+    )
+    assert ranges == {"diameter_mm": (41.0, None)}
+    assert facets == {"material": ["Steel", "Yellow gold"], "brand": ["omega"], "complications": ["Date"]}
+
+
+@pytest.mark.parametrize(
+    "params, message",
+    [
+        ([("diameter_mm", "abc")], "Invalid bound 'abc' for 'diameter_mm'"),
+        ([("diameter_mm", "38..big")], "Invalid bound 'big' for 'diameter_mm'"),
+        ([("retail_price_usd", "1..2..3")], "Invalid bound '2..3' for 'retail_price_usd'"),
+        ([("material", "Steel"), ("colour", "Black")], "Unknown filter 'colour'"),
+    ],
+)
+def test_parse_filters_errors(params, message):
+    with pytest.raises(InvalidFilter, match=f"^{message}$"):
+        parse_filters(params)
+
+
+def test_query_rejects_unknown_names(index):
+    with pytest.raises(InvalidFilter, match="Unknown range filter 'height'"):
+        index.query({"height": (1.0, None)}, {})
+    with pytest.raises(InvalidFilter, match="Unknown facet 'colour'"):
+        index.query({}, {"colour": ["Black"]})
+    with pytest.raises(InvalidFilter, match="Cannot sort by '-colour'"):
+        index.query({}, {}, "-colour")
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        ([], [0, 1, 2, 3, 4, 5]),
+        ([("diameter_mm", "38..41")], [0, 1, 3]),
+        ([("diameter_mm", "41")], [0, 1]),
+        # Missing values never match a range, however wide.
+        ([("diameter_mm", "..1e9")], [0, 1, 2, 3, 4]),
+        ([("retail_price_usd", "..9000")], [2, 4, 5]),
+        ([("diameter_mm", "36.."), ("water_resistance_m", "100..")], [0, 1, 2]),
+        ([("diameter_mm", "42..36")], []),
+    ],
+)
+def test_ranges(index, params, expected):
+    result = query(index, params)
+    assert result.ordinals == expected
+    assert result.total == len(expected)
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        # Values of one facet are ORed, case-insensitively.
+        ([("material", "Oystersteel"), ("material", "Yellow gold")], [0, 1, 2, 3]),
+        ([("material", "STEEL")], [4, 5]),
+        ([("complications", "Date"), ("complications", "Day")], [0, 2, 3, 5]),
+        ([("complications", "Day")], [3]),
+        # Different facets and ranges are ANDed.
+        ([("material", "Oystersteel"), ("dial_color", "Black")], [0, 1]),
+        ([("brand", "omega"), ("complications", "Date")], [5]),
+        ([("dial_color", "Blue"), ("dial_color", "Black"), ("movement_type", "automatic")], [0, 1, 2, 5]),
+        ([("dial_color", "Blue"), ("diameter_mm", "..40")], [2]),
+        ([("material", "Titanium")], []),
+        ([("material", "Oystersteel"), ("brand", "omega")], []),
+    ],
+)
+def test_facets_or_within_and_across(index, params, expected):
+    assert query(index, params).ordinals == expected
+
+
+def test_facet_counts_leave_out_their_own_filter(index):
+    result = query(index, [("material", "Oystersteel"), ("dial_color", "Black"), ("diameter_mm", "..41")])
+    assert result.ordinals == [0, 1]
+    # Each filtered facet counts the models every other filter allows...
+    assert result.facets["material"] == {"Oystersteel": 2}
+    assert result.facets["dial_color"] == {"Black": 2, "Blue": 1}
+    # ...and unfiltered facets count the selection itself.
+    assert result.facets["brand"] == {"rolex": 2}
+    assert result.facets["complications"] == {"Date": 1}
+    assert result.facets["crystal"] == {}
+
+    # Ranges apply to every count; here the Speedmaster is out at 42 mm.
+    result = query(index, [("dial_color", "Black"), ("diameter_mm", "..41")])
+    assert result.facets["material"] == {"Oystersteel": 2}
+    result = query(index, [("dial_color", "Black")])
+    assert result.facets["material"] == {"Oystersteel": 2, "Steel": 1}
+
+
+def test_facet_counts_are_ordered_by_count(index):
+    counts = query(index).facets
+    assert list(counts["brand"].items()) == [("rolex", 4), ("omega", 2)]
+    assert list(counts["complications"].items())[0] == ("Date", 4)
+    assert counts["complications"] == {"Date": 4, "Day": 1, "Chronograph": 1}
+    assert list(counts["movement_type"].items()) == [("Automatic", 5), ("Manual", 1)]
+    # Labels differing only in case are separate values, but match together.
+    assert counts["material"] == {"Oystersteel": 3, "Yellow gold": 1, "Steel": 1, "steel": 1}
+
+
+@pytest.mark.parametrize(
+    "sort, expected",
+    [
+        # Ties keep catalog order; missing values sort last in both directions.
+        ("diameter_mm", [2, 3, 0, 1, 4, 5]),
+        ("-diameter_mm", [4, 0, 1, 3, 2, 5]),
+        ("retail_price_usd", [5, 4, 2, 1, 0, 3]),
+        ("-retail_price_usd", [0, 1, 2, 4, 5, 3]),
+        ("-water_resistance_m", [0, 1, 5, 2, 4, 3]),
+        ("market_price_usd", [0, 1, 2, 3, 4, 5]),
+    ],
+)
+def test_sort_puts_missing_values_last(index, sort, expected):
+    assert query(index, sort=sort).ordinals == expected
+
+
+def test_offset_and_limit_page_the_sorted_selection(index):
+    params = [("brand", "rolex")]
+    full = query(index, params, sort="-diameter_mm").ordinals
+    assert full == [0, 1, 3, 2]
+    pages = [query(index, params, sort="-diameter_mm", offset=offset, limit=3) for offset in (0, 3, 6)]
+    assert [page.ordinals for page in pages] == [[0, 1, 3], [2], []]
+    assert all(page.total == 4 for page in pages)
+
+
+def test_sort_is_stable_beyond_small_inputs():
+    models = [
+        {"reference": str(i), "display_name": str(i), "case": {"diameter_mm": [40, 42, None][i % 3]}} for i in range(90)
+    ]
+    builder = CompactCatalogBuilder()
+    builder.add_brand(BrandWithModels(id="b", name="B", models=models))
+    index = FacetIndex(builder.build())
+    by_size = {size: [i for i in range(90) if i % 3 == position] for position, size in enumerate((40, 42, None))}
+    assert query(index, sort="diameter_mm", limit=90).ordinals == by_size[40] + by_size[42] + by_size[None]
+    assert query(index, sort="-diameter_mm", limit=90).ordinals == by_size[42] + by_size[40] + by_size[None]
@@ -0,0 +1,106 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+
+import history_formats
+from database import MarketdataVersion
+from history_formats import DAY_SECONDS, HistoryEncodingError, encode_binary, encode_columnar, negotiate_format
+
+T0 = 1704067200
+
+
+def history(days, prices):
+    points = [[T0 + day * DAY_SECONDS, price] for day, price in zip(days, prices)]
+    return {
+        "points": points,
+        "source": "chrono24+watchcharts_csv",
+        "start_date": "2024-01-01",
+        "end_date": "2024-12-30",
+        "points_count": len(points),
+    }
+
+
+def timestamps_from(t0, day_deltas):
+    return (t0 + np.cumsum(day_deltas) * DAY_SECONDS).tolist()
+
+
+def decode_binary(body):
+    magic, count, t0 = struct.unpack_from("<4sIq", body)
+    assert magic == history_formats.BINARY_MAGIC
+    assert len(body) == 16 + 6 * count
+    day_deltas = np.frombuffer(body, "<u2", count, 16)
+    prices = np.frombuffer(body, "<i4", count, 16 + 2 * count)
+    return [[ts, int(price)] for ts, price in zip(timestamps_from(t0, day_deltas), prices)]
+
+
+SERIES = [
+    history([0], [24_850]),
+    history([0, 1, 2, 9, 16, 380], [24_850, 24_900, 25_010, 24_700, 0, 31_000]),
+    history(range(0, 800 * 7, 7), range(20_000, 20_800)),
+    history([0, 65_535], [1, 2_147_483_647]),
+]
+
+
+@pytest.mark.parametrize("data", SERIES)
+def test_columnar_round_trip(data):
+    body = json.loads(encode_columnar(data))
+    assert body["t0"] == T0
+    assert body["day_deltas"][0] == 0
+    points = [[ts, price] for ts, price in zip(timestamps_from(body["t0"], body["day_deltas"]), body["prices"])]
+    assert points == data["points"]
+    assert {key: body[key] for key in ("source", "start_date", "end_date", "points_count")} == {
+        key: data[key] for key in ("source", "start_date", "end_date", "points_count")
+    }
+
+
+@pytest.mark.parametrize("data", SERIES)
+def test_binary_round_trip(data):
+    assert decode_binary(encode_binary(data)) == data["points"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        history([0, 65_536], [1, 2]),
+        history([0, 1], [1, 2_147_483_648]),
+        history([0, 1], [-2_147_483_649, 2]),
+    ],
+)
+def test_binary_rejects_values_wider_than_its_fields(data):
+    with pytest.raises(HistoryEncodingError):
+        encode_binary(data)
+    # Columnar has no such limit.
+    body = json.loads(encode_columnar(data))
+    assert body["prices"] == [price for _, price in data["points"]]
+
+
+def test_store_falls_back_to_columnar_when_binary_does_not_fit():
+    from routes import market
+
+    version = MarketdataVersion(token="t", last_modified=None, summaries_materialized=True, observed_at=0.0)
+    data = history([0, 70_000], [1, 2])
+    entry = market._store("history", "w1", version, data, "binary-test", "binary")
+    assert entry.media_type == history_formats.COLUMNAR_MEDIA_TYPE
+    assert "X-History-Source" not in entry.headers
+    assert json.loads(entry.body)["day_deltas"] == [0, 70_000]
+
+    entry = market._store("history", "w1", version, history([0, 7], [1, 2]), "binary-test", "binary")
+    assert entry.media_type == history_formats.BINARY_MEDIA_TYPE
+    assert entry.headers["X-History-Source"] == "chrono24+watchcharts_csv"
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, "json"),
+        ("application/json", "json"),
+        ("*/*", "json"),
+        (history_formats.COLUMNAR_MEDIA_TYPE, "columnar"),
+        (f"application/json;q=0.5, {history_formats.BINARY_MEDIA_TYPE}", "binary"),
+        (f"{history_formats.BINARY_MEDIA_TYPE.upper()}; q=1", "binary"),
+    ],
+)
+def test_negotiate_format(accept, expected):
+    assert negotiate_format(accept) == expected
@@ -0,0 +1,124 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def marketdata(marketdata_db):
+    from watchcollection_crawler.marketdata import db
+
+    return marketdata_db, db
+
+
+def add_snapshot(conn, watch_id, days_ago, price):
+    as_of = (date.today() - timedelta(days=days_ago)).isoformat()
+    conn.execute(
+        "INSERT INTO market_snapshot (watchcharts_id, brand_slug, reference, as_of_date, source, median_usd) "
+        "VALUES (?, 'rolex', '126610LN', ?, 'watchcharts_csv', ?)",
+        (watch_id, as_of, price),
+    )
+    conn.commit()
+
+
+def finish_ingest(conn, db):
+    from watchcollection_crawler.marketdata import IngestStats
+
+    db.record_ingest_run(conn, "test", IngestStats())
+
+
+def today_suffix():
+    return f"-{datetime.now(timezone.utc):%Y%m%d}"
+
+
+@pytest.fixture
+def uncached_version(monkeypatch):
+    """Re-check the data version on every request and never serve stale bodies."""
+    from routes import market
+
+    monkeypatch.setattr(database, "MARKETDATA_VERSION_TTL", 0.0)
+    monkeypatch.setattr(market, "MARKET_STALE_SECONDS", 0.0)
+
+
+def test_summary_etag_is_date_suffixed_only_while_computed(market_client, marketdata, uncached_version):
+    conn, db = marketdata
+    add_snapshot(conn, "w1", 40, 10_000)
+    add_snapshot(conn, "w1", 1, 11_000)
+
+    computed = market_client.get("/market/summary/w1")
+    assert computed.status_code == 200
+    assert computed.headers["ETag"].endswith(f'{today_suffix()}"')
+
+    db.refresh_market_summaries(conn)
+    materialized = market_client.get("/market/summary/w1")
+    assert materialized.status_code == 200
+    assert not materialized.headers["ETag"].endswith(f'{today_suffix()}"')
+    assert materialized.json() == computed.json()
+
+    history = market_client.get("/market/history/w1")
+    assert history.headers["ETag"].startswith('W/"market-history-w1-')
+    assert not history.headers["ETag"].endswith(f'{today_suffix()}"')
+
+
+def test_etag_follows_the_data(market_client, marketdata, uncached_version):
+    conn, db = marketdata
+    add_snapshot(conn, "w1", 10, 10_000)
+    finish_ingest(conn, db)
+    db.refresh_market_summaries(conn)
+
+    first = market_client.get("/market/summary/w1")
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"].endswith(" GMT")
+    assert market_client.get("/market/summary/w1").headers["ETag"] == etag
+    assert market_client.get("/market/summary/w1", headers={"If-None-Match": etag}).status_code == 304
+
+    # Another watch's snapshot changes the version too.
+    add_snapshot(conn, "w2", 1, 5_000)
+    changed = market_client.get("/market/summary/w1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    add_snapshot(conn, "w1", 0, 12_000)
+    db.refresh_market_summaries(conn)
+    refreshed = market_client.get("/market/summary/w1")
+    assert refreshed.json()["price"] == 12_000
+    assert refreshed.headers["ETag"] not in (etag, changed.headers["ETag"])
+
+
+def test_token_is_rederived_only_when_the_file_changes(market_client, marketdata, uncached_version, monkeypatch):
+    conn, db = marketdata
+    add_snapshot(conn, "w1", 3, 10_000)
+    reads = []
+    read_version = database._read_marketdata_version
+    monkeypatch.setattr(database, "_read_marketdata_version", lambda c: reads.append(1) or read_version(c))
+
+    for _ in range(3):
+        assert market_client.get("/market/history/w1").status_code == 200
+    assert len(reads) == 1
+
+    add_snapshot(conn, "w1", 1, 10_500)
+    assert market_client.get("/market/history/w1").status_code == 200
+    assert len(reads) == 2
+
+
+def test_cached_responses_are_served_without_sqlite(market_client, marketdata, tmp_path, monkeypatch):
+    conn, db = marketdata
+    add_snapshot(conn, "w1", 3, 10_000)
+    db.refresh_market_summaries(conn)
+    monkeypatch.setattr(database, "MARKETDATA_VERSION_TTL", 60.0)
+
+    summary = market_client.get("/market/summary/w1")
+    history = market_client.get("/market/history/w1?format=columnar")
+    assert market_client.get("/market/summary/missing").status_code == 404
+
+    # Any SQLite access would now fail with 503.
+    monkeypatch.setenv("MARKETDATA_DB_PATH", str(tmp_path / "gone.sqlite"))
+    assert market_client.get("/market/summary/w1").content == summary.content
+    assert market_client.get("/market/history/w1?format=columnar").content == history.content
+    assert market_client.get("/market/summary/missing").status_code == 404
+    not_modified = market_client.get("/market/summary/w1", headers={"If-None-Match": summary.headers["ETag"]})
+    assert not_modified.status_code == 304
+
+    monkeypatch.setattr(database, "MARKETDATA_VERSION_TTL", 0.0)
+    assert market_client.get("/market/summary/w1").status_code == 503
@@ -0,0 +1,186 @@
+"""The crawler's trigger-maintained tables against the API's full recomputes.
+
+snapshot_coverage must match _scanned_coverage, and market_summary must
+match _computed_summaries, after any mix of in-order, out-of-order,
+upserted, updated and deleted snapshots.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from database import _computed_summaries, _materialized_coverage, _materialized_summaries, _scanned_coverage
+
+TODAY = date.today()
+WATCHES = {"w1": ("rolex", "126610LN"), "w2": ("omega", "210.30.42.20.01.001"), "w3": ("tudor", "79830RB")}
+
+
+@pytest.fixture
+def marketdata(marketdata_db):
+    from watchcollection_crawler.marketdata import db
+
+    return marketdata_db, db
+
+
+def day(days_ago):
+    return (TODAY - timedelta(days=days_ago)).isoformat()
+
+
+def snapshot(watch_id, days_ago, price, source="watchcharts_csv"):
+    from watchcollection_crawler.marketdata import MarketSnapshot
+
+    brand_slug, reference = WATCHES[watch_id]
+    return MarketSnapshot(
+        watchcharts_id=watch_id,
+        brand_slug=brand_slug,
+        reference=reference,
+        as_of_date=date.fromisoformat(day(days_ago)),
+        source=source,
+        median_usd=price,
+        min_usd=price - 100,
+        max_usd=price + 100,
+        listings_count=price // 1000,
+    )
+
+
+def insert(conn, db, *rows):
+    for row in rows:
+        assert db.insert_snapshot(conn, snapshot(*row))
+    conn.commit()
+
+
+def coverage(conn):
+    rows, source_bits = _materialized_coverage(conn, None, None)
+    materialized = {
+        row["watchcharts_id"]: {
+            **{key: row[key] for key in row.keys() if key != "sources"},
+            "sources": sorted(source for bit, source in source_bits if row["sources"] & bit),
+        }
+        for row in rows
+    }
+    scanned = {
+        row["watchcharts_id"]: {
+            **{key: row[key] for key in row.keys() if key != "sources"},
+            "sources": sorted(row["sources"].split(",")),
+        }
+        for row in _scanned_coverage(conn, None, None)
+    }
+    return materialized, scanned
+
+
+def assert_tables_match(conn, db):
+    db.refresh_snapshot_coverage(conn)
+    db.refresh_market_summaries(conn)
+    materialized, scanned = coverage(conn)
+    assert materialized == scanned
+    watch_ids = list(WATCHES)
+    assert _materialized_summaries(conn, watch_ids) == _computed_summaries(conn, watch_ids)
+
+
+def test_in_order_inserts_are_applied_by_the_trigger(marketdata):
+    conn, db = marketdata
+    insert(conn, db, ("w1", 400, 10_000))
+    assert_tables_match(conn, db)
+
+    insert(
+        conn,
+        db,
+        ("w1", 399, 10_050),
+        ("w1", 380, 10_100),
+        ("w1", 380, 10_000, "chrono24"),
+        ("w1", 200, 11_000, "chrono24"),
+        ("w1", 31, 12_000),
+        # Seven days apart is not a gap; eight is.
+        ("w1", 24, 12_100),
+        ("w1", 16, 12_300),
+        ("w1", 1, 12_600),
+    )
+    # Appends update the coverage row in place; nothing is queued for a recompute.
+    assert conn.execute("SELECT COUNT(*) FROM snapshot_coverage_dirty").fetchone()[0] == 0
+    materialized, scanned = coverage(conn)
+    assert materialized == scanned
+    assert materialized["w1"]["gaps"] == 5
+    assert materialized["w1"]["largest_gap_days"] == 180
+    assert materialized["w1"]["sources"] == ["chrono24", "watchcharts_csv"]
+    assert_tables_match(conn, db)
+
+
+def test_out_of_order_inserts(marketdata):
+    conn, db = marketdata
+    insert(conn, db, ("w1", 300, 9_000), ("w1", 10, 12_000), ("w2", 5, 6_000))
+    assert_tables_match(conn, db)
+
+    # Before the first day, filling a gap, and on an existing day.
+    insert(conn, db, ("w1", 500, 8_000), ("w1", 150, 10_000), ("w1", 10, 11_500, "chrono24"), ("w2", 400, 5_000))
+    assert conn.execute("SELECT COUNT(*) FROM snapshot_coverage_dirty").fetchone()[0] == 2
+    assert_tables_match(conn, db)
+
+
+def test_upserts(marketdata):
+    conn, db = marketdata
+    insert(conn, db, ("w1", 370, 10_000), ("w1", 40, 11_000), ("w1", 3, 12_000))
+    assert_tables_match(conn, db)
+
+    # Same day and source: only prices change.
+    db.upsert_snapshot(conn, snapshot("w1", 3, 12_400))
+    assert_tables_match(conn, db)
+    assert _materialized_summaries(conn, ["w1"])["w1"]["price"] == 12_400
+
+    # New rows through the upsert path, after and before the series.
+    db.upsert_snapshot(conn, snapshot("w1", 0, 12_800, "chrono24"))
+    db.upsert_snapshot(conn, snapshot("w1", 600, 9_000))
+    db.upsert_snapshot(conn, snapshot("w3", 20, 4_000))
+    assert_tables_match(conn, db)
+
+
+def test_updates_and_deletes(marketdata):
+    conn, db = marketdata
+    insert(
+        conn,
+        db,
+        ("w1", 400, 10_000),
+        ("w1", 200, 11_000),
+        ("w1", 35, 11_500),
+        ("w1", 2, 12_000),
+        ("w1", 2, 11_800, "chrono24"),
+        ("w2", 90, 6_000),
+        ("w2", 1, 6_500),
+    )
+    assert_tables_match(conn, db)
+
+    # The latest day of one source, then the only day of a watch's latest prices.
+    conn.execute("DELETE FROM market_snapshot WHERE watchcharts_id = 'w1' AND source = 'chrono24'")
+    conn.commit()
+    assert_tables_match(conn, db)
+    conn.execute("DELETE FROM market_snapshot WHERE watchcharts_id = 'w1' AND as_of_date = ?", (day(2),))
+    conn.commit()
+    assert_tables_match(conn, db)
+
+    # Moving a row to another day, source and watch.
+    conn.execute(
+        "UPDATE market_snapshot SET as_of_date = ?, source = 'chrono24' WHERE watchcharts_id = 'w1' AND as_of_date = ?",
+        (day(100), day(200)),
+    )
+    conn.execute("UPDATE market_snapshot SET median_usd = 7000 WHERE watchcharts_id = 'w2' AND as_of_date = ?", (day(1),))
+    conn.execute(
+        "UPDATE market_snapshot SET watchcharts_id = 'w3', brand_slug = 'tudor', reference = '79830RB' "
+        "WHERE watchcharts_id = 'w2' AND as_of_date = ?",
+        (day(90),),
+    )
+    conn.commit()
+    assert_tables_match(conn, db)
+
+    # Every snapshot of a watch.
+    conn.execute("DELETE FROM market_snapshot WHERE watchcharts_id = 'w1'")
+    conn.commit()
+    assert_tables_match(conn, db)
+    materialized, _scanned = coverage(conn)
+    assert "w1" not in materialized
+    assert "w1" not in _materialized_summaries(conn, ["w1"])
+
+
+def test_new_source_gets_a_bit(marketdata):
+    conn, db = marketdata
+    insert(conn, db, ("w1", 20, 10_000), ("w1", 10, 10_500, "ebay"), ("w2", 5, 6_000, "ebay"))
+    assert_tables_match(conn, db)
+    materialized, _scanned = coverage(conn)
+    assert materialized["w1"]["sources"] == ["ebay", "watchcharts_csv"]
@@ -0,0 +1,104 @@
+import pytest
+
+import reference_matcher
+from catalog import CatalogSnapshot, VersionHistory
+from catalog.loader import CatalogBundle
+from crawler_bridge import ensure_crawler_on_path
+
+REFERENCES = {
+    "omega": ["210.30.42.20.01.001", "311.30.42.30.01.5", "310.30.42.50.01.002", "2254.50"],
+    "tudor": ["79830RB", "M79830RB-0001", "79830RB-0002", "M7941A1A0RU-0001", "25600TN"],
+    "iwc": ["IW371605", "371605", "iw500710"],
+    "grand_seiko": ["SBGA211", "SBGA011", "SBGH255G", "SLGH005"],
+    "patek_philippe": ["5711/1A-010", "5711/1A", "5167A-001", "5270P"],
+    "rolex": ["126610LN", "126610LV", "116500LN", "126710BLNR", "124060", "m126610ln-0001"],
+    "audemars_piguet": ["15500ST.OO.1220ST.01", "15500ST", "26331OR", "15202IP"],
+    "panerai": ["PAM01312", "pam1312", "PAM00111", "PAM111", "PAM5"],
+    "breitling": ["AB0138241C1P1", "A17326211B1A1", "UB2010121B1S1", "ab0138"],
+    "cartier": ["WSSA0018", "CRWSSA0018"],
+    None: ["126610LN", " SPB143 ", "", "5711/1A-010"],
+    "seiko": ["SPB143", "SBGA211"],
+}
+
+CASES = [(brand_id, reference) for brand_id, references in REFERENCES.items() for reference in references]
+
+
+def test_every_brand_rule_is_covered():
+    assert set(reference_matcher.NORMALIZATION_RULES) <= set(REFERENCES)
+
+
+@pytest.fixture(scope="module")
+def crawler_matcher():
+    if not ensure_crawler_on_path():
+        pytest.skip("crawler checkout not found")
+    from watchcollection_crawler import reference_matcher as crawler_matcher
+
+    return crawler_matcher
+
+
+def test_rules_match_crawler(crawler_matcher):
+    assert reference_matcher.NORMALIZATION_RULES == crawler_matcher.NORMALIZATION_RULES
+
+
+@pytest.mark.parametrize("brand_id, reference", CASES)
+def test_normalize_and_aliases_match_crawler(crawler_matcher, brand_id, reference):
+    assert reference_matcher.normalize_for_matching(reference, brand_id) == crawler_matcher.normalize_for_matching(
+        reference, brand_id
+    )
+    assert reference_matcher.generate_aliases(reference, brand_id) == crawler_matcher.generate_aliases(
+        reference, brand_id
+    )
+
+
+@pytest.mark.parametrize("brand_id, references", [(b, r) for b, r in REFERENCES.items() if b is not None])
+def test_refs_match_matches_crawler(crawler_matcher, brand_id, references):
+    for left in references:
+        for right in references:
+            assert reference_matcher.refs_match(left, right, brand_id) == crawler_matcher.refs_match(
+                left, right, brand_id
+            )
+
+
+def _model(reference, **extra):
+    return {"reference": reference, "display_name": reference, **extra}
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    catalog = {
+        "version": "1",
+        "brands": [
+            {"id": "panerai", "name": "Panerai", "models": [_model("PAM01312")]},
+            {"id": "iwc", "name": "IWC", "models": [_model("371605")]},
+            {
+                "id": "tudor",
+                "name": "Tudor",
+                "models": [_model("79830RB"), _model("79360N", reference_aliases=["M79360N-0001"])],
+            },
+            {"id": "rolex", "name": "Rolex", "models": [_model("126610LN"), _model("126610LV")]},
+        ],
+    }
+    return CatalogSnapshot.from_bundle(CatalogBundle(catalog), None, None, VersionHistory())
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("pam1312", "PAM01312"),
+        ("iw371605", "371605"),
+        ("M79830RB-0001", "79830RB"),
+        ("m79360n-0001", "79360N"),
+        ("126610lv", "126610LV"),
+        ("126610", "126610LN"),
+    ],
+)
+def test_near_miss_references_resolve_without_crawler(snapshot, query, expected):
+    ordinal = snapshot.resolve(query)
+    assert ordinal is not None
+    assert snapshot.catalog.string("reference", ordinal) == expected
+    assert snapshot.resolve(query, snapshot.catalog.brands[snapshot.catalog.model_brand(ordinal)][0]) == ordinal
+
+
+def test_unknown_reference_does_not_resolve(snapshot):
+    assert snapshot.resolve("pam1312", "rolex") is None
+    assert snapshot.resolve("XYZ999") is None
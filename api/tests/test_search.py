@@ -0,0 +1,187 @@
+import pytest
+
+from catalog.search import (
+    SCORE_NAME_PREFIX,
+    SCORE_PIECES,
+    SCORE_REFERENCE,
+    SCORE_SUBSTRING,
+    SCORE_TOKENS,
+    SearchHit,
+    SearchIndex,
+    _rank,
+    encode_cursor,
+    encode_token,
+)
+
+# (search text, display name, reference and aliases), as build_search_text lays them out.
+MODELS = [
+    ("rolex submariner date 126610ln 126610", "Submariner Date", ["126610LN", "126610"]),
+    ("rolex submariner 124060", "Submariner", ["124060"]),
+    ("rolex sea-dweller 126600 submariner", "Sea-Dweller", ["126600"]),
+    ("tudor black bay submariner-style 79230n", "Black Bay", ["79230N"]),
+    ("rolex datejust 126234 jubilee", "Datejust", ["126234"]),
+    ("rolex submariner 126610lv green date", "Submariner Date", ["126610LV"]),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    texts, names, references = zip(*MODELS)
+    return SearchIndex(texts, names=names, references=references)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        # Name prefixes tie and fall back to catalog order, then whole tokens, then substrings.
+        (
+            "submariner",
+            [
+                (SCORE_NAME_PREFIX, 0),
+                (SCORE_NAME_PREFIX, 1),
+                (SCORE_NAME_PREFIX, 5),
+                (SCORE_TOKENS, 2),
+                (SCORE_SUBSTRING, 3),
+            ],
+        ),
+        # An alias matches exactly; a longer reference only as a substring.
+        ("126610", [(SCORE_REFERENCE, 0), (SCORE_SUBSTRING, 5)]),
+        ("126610LV", [(SCORE_REFERENCE, 5)]),
+        ("  Submariner Date ", [(SCORE_NAME_PREFIX, 0), (SCORE_NAME_PREFIX, 5)]),
+        # Every word as a whole token, in any order.
+        ("date submariner", [(SCORE_TOKENS, 0), (SCORE_TOKENS, 5)]),
+        # Every word somewhere in the text, but not as whole tokens.
+        ("dat sub", [(SCORE_PIECES, 0), (SCORE_PIECES, 5)]),
+        ("sea-dweller 126600", [(SCORE_TOKENS, 2)]),
+        ("dweller 126600", [(SCORE_SUBSTRING, 2)]),
+        ("rolex jubilee", [(SCORE_TOKENS, 4)]),
+        # One missing word excludes the model.
+        ("submariner daytona", []),
+        ("daytona", []),
+        ("zz", []),
+    ],
+)
+def test_ranking_tiers(index, query, expected):
+    assert [tuple(hit) for hit in index.search(query)] == expected
+
+
+@pytest.mark.parametrize("query", ["submariner", "sub", "ro", "126", "date sub", "rolex 6", "er d", "-", "n"])
+def test_candidates_match_a_full_scan(index, query):
+    lowered = query.lower().strip()
+    assert index.search(query) == sorted(index._hits(range(len(index)), lowered), key=_rank)
+
+
+def test_limit_keeps_the_best_hits(index):
+    full = index.search("submariner")
+    for limit in range(1, len(full) + 2):
+        assert index.search("submariner", limit) == full[:limit]
+
+
+def test_pages_after_a_hit_continue_without_overlap(index):
+    for query in ("submariner", "r", "126"):
+        full = index.search(query)
+        pages = []
+        after = None
+        while True:
+            page = index.search(query, 2, after)
+            pages.extend(page)
+            if len(page) < 2:
+                break
+            after = page[-1]
+        assert pages == full
+
+
+CATALOG = {
+    "version": "1",
+    "brands": [
+        {
+            "id": "rolex",
+            "name": "Rolex",
+            "models": [
+                {"reference": "126610LN", "display_name": "Submariner Date", "reference_aliases": ["126610"]},
+                {"reference": "124060", "display_name": "Submariner"},
+                {"reference": "126600", "display_name": "Sea-Dweller", "collection": "Submariner"},
+                {"reference": "126610LV", "display_name": "Submariner Date", "case": {"dial_color": "Green"}},
+                {"reference": "126234", "display_name": "Datejust"},
+            ],
+        },
+        {
+            "id": "tudor",
+            "name": "Tudor",
+            "models": [
+                {"reference": "79230N", "display_name": "Black Bay", "style": "Submariner-style"},
+                {"reference": "M79030N", "display_name": "Submariner Homage", "collection": "Black Bay"},
+            ],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def client(catalog_client):
+    return catalog_client(CATALOG)
+
+
+def search(client, **params):
+    response = client.get("/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_route_ranks_and_pages(client):
+    everything = search(client, q="submariner", limit=200)
+    references = [result["reference"] for result in everything["results"]]
+    assert references == ["126610LN", "124060", "126610LV", "M79030N", "126600", "79230N"]
+    assert everything["next_cursor"] is None
+    assert everything["results"][0]["brand_id"] == "rolex"
+
+    for limit in (1, 2, 4, 5):
+        paged = []
+        cursor = None
+        while True:
+            params = {"q": "submariner", "limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+            page = search(client, **params)
+            assert page["count"] == len(page["results"]) <= limit
+            paged.extend(result["reference"] for result in page["results"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert paged == references
+
+    # The same cursor always yields the same page.
+    first = search(client, q="submariner", limit=2)
+    again = search(client, q="submariner", limit=2, cursor=first["next_cursor"])
+    assert again == search(client, q="submariner", limit=2, cursor=first["next_cursor"])
+    assert [result["reference"] for result in again["results"]] == ["126610LV", "M79030N"]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        "!!!",
+        encode_token(["only-revision"]),
+        encode_token(["rev", "high", 3]),
+        encode_token(["rev", 1, None]),
+        "eyJ",
+    ],
+)
+def test_malformed_cursors_are_rejected(client, cursor):
+    response = client.get("/search", params={"q": "submariner", "cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Malformed search cursor"
+
+
+def test_cursors_from_another_revision_are_rejected(catalog_client):
+    client = catalog_client(CATALOG)
+    cursor = search(client, q="submariner", limit=2)["next_cursor"]
+    assert client.get("/search", params={"q": "submariner", "limit": 2, "cursor": cursor}).status_code == 200
+
+    changed = {**CATALOG, "version": "2", "brands": CATALOG["brands"][:1]}
+    client = catalog_client(changed)
+    for stale in (cursor, encode_cursor("some-other-revision", SearchHit(SCORE_NAME_PREFIX, 0))):
+        response = client.get("/search", params={"q": "submariner", "limit": 2, "cursor": stale})
+        assert response.status_code == 400
+        assert "previous catalog revision" in response.json()["detail"]
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from starlette.requests import Request
+
+from database import MarketdataVersion
+from middleware import LRUCache, SingleFlight
+from routes import market
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def load(key):
+        calls.append(key)
+        await asyncio.sleep(0.02)
+        return f"value-{key}"
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.run(key, lambda key=key: load(key)) for key in "aaaab"))
+        assert results == ["value-a"] * 4 + ["value-b"]
+        assert flight.stats() == {"inflight": 0, "started": 2, "coalesced": 3, "background_failures": 0}
+        # Finished keys are released, so a later call computes again.
+        assert await flight.run("a", lambda: load("a")) == "value-a"
+
+    asyncio.run(scenario())
+    assert calls == ["a", "b", "a"]
+
+
+def test_exceptions_reach_every_waiter():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise LookupError("boom")
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.run("k", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, LookupError) for result in results)
+        assert flight.stats()["inflight"] == 0
+
+    asyncio.run(scenario())
+    assert calls == [1]
+
+
+def test_cancelled_waiter_does_not_cancel_the_computation():
+    flight = SingleFlight("test")
+    finished = []
+
+    async def load():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.run("k", load))
+        second = asyncio.ensure_future(flight.run("k", load))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "done"
+        # Even when every waiter leaves, the computation runs to completion.
+        abandoned = asyncio.ensure_future(flight.run("j", load))
+        await asyncio.sleep(0.01)
+        abandoned.cancel()
+        await asyncio.sleep(0.08)
+
+    asyncio.run(scenario())
+    assert finished == [1, 1]
+
+
+def test_spawn_runs_in_the_background_and_counts_failures():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise LookupError("boom")
+
+    async def scenario():
+        flight.spawn("k", fail)
+        flight.spawn("k", fail)
+        assert flight.stats()["inflight"] == 1
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert calls == [1]
+    assert flight.stats() == {"inflight": 0, "started": 1, "coalesced": 1, "background_failures": 1}
+
+
+@pytest.fixture
+def market_state(monkeypatch):
+    """Fresh market caches and a version the test sets through `state["version"]`."""
+    state = {}
+
+    async def current_version():
+        return state["version"]
+
+    monkeypatch.setattr(market, "market_cache", LRUCache("market", 16))
+    monkeypatch.setattr(market, "market_loads", SingleFlight("market-loads"))
+    monkeypatch.setattr(market, "_current_version", current_version)
+    return state
+
+
+def version(token, observed_ago=0.0):
+    return MarketdataVersion(token, None, True, time.monotonic() - observed_ago)
+
+
+def history(price):
+    return {"points": [[1704067200, price]], "source": "watchcharts_csv", "points_count": 1}
+
+
+def request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_stale_response_is_served_while_one_refresh_runs(market_state, monkeypatch):
+    monkeypatch.setattr(market, "MARKET_STALE_SECONDS", 60.0)
+    release = threading.Event()
+    loads = []
+
+    def load(price, blocking=False):
+        loads.append(price)
+        if blocking:
+            release.wait(5)
+        return history(price)
+
+    async def scenario():
+        market_state["version"] = version("v1")
+        first = await market._versioned_response(request(), "history", "w1", lambda: load(100))
+        assert b"100" in first.body
+
+        # The data changed moments ago: the old body is served at once, and
+        # concurrent requests share a single background refresh.
+        market_state["version"] = version("v2")
+        stale = await asyncio.gather(
+            *(market._versioned_response(request(), "history", "w1", lambda: load(200, True)) for _ in range(3))
+        )
+        assert all(response.body == first.body for response in stale)
+        assert all(response.headers["ETag"] == first.headers["ETag"] for response in stale)
+        assert market.market_loads.stats()["inflight"] == 1
+
+        release.set()
+        while market.market_loads.stats()["inflight"]:
+            await asyncio.sleep(0.01)
+        fresh = await market._versioned_response(request(), "history", "w1", lambda: load(300))
+        assert b"200" in fresh.body
+        assert fresh.headers["ETag"] != first.headers["ETag"]
+        assert "-v2" in fresh.headers["ETag"]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+    assert loads == [100, 200]
+
+
+def test_old_versions_are_not_served_stale(market_state, monkeypatch):
+    monkeypatch.setattr(market, "MARKET_STALE_SECONDS", 60.0)
+
+    async def scenario():
+        market_state["version"] = version("v1")
+        first = await market._versioned_response(request(), "history", "w1", lambda: history(100))
+
+        # A version first seen longer ago than MARKET_STALE_SECONDS waits for the load.
+        market_state["version"] = version("v2", observed_ago=61.0)
+        fresh = await market._versioned_response(request(), "history", "w1", lambda: history(200))
+        assert b"200" in fresh.body
+        assert fresh.headers["ETag"] != first.headers["ETag"]
+
+    asyncio.run(scenario())
+
+
+def test_stale_response_honours_its_own_etag(market_state, monkeypatch):
+    monkeypatch.setattr(market, "MARKET_STALE_SECONDS", 60.0)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return history(200)
+
+    async def scenario():
+        market_state["version"] = version("v1")
+        first = await market._versioned_response(request(), "history", "w1", lambda: history(100))
+        market_state["version"] = version("v2")
+        response = await market._versioned_response(
+            request(if_none_match=first.headers["ETag"]), "history", "w1", slow
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == first.headers["ETag"]
+        release.set()
+        while market.market_loads.stats()["inflight"]:
+            await asyncio.sleep(0.01)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
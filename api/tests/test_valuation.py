@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import database
+from valuation import DAY_SECONDS, WeeklySeries, load_weekly_series, portfolio_value, week_start, weekly_series
+
+WEEK = 7 * DAY_SECONDS
+
+
+def week_of(day: str) -> int:
+    return int((np.datetime64(day, "D").astype(np.int64) + 3) // 7)
+
+
+def test_week_start_is_monday_midnight_utc():
+    start = week_of("2024-01-01")
+    assert week_start(start) == 1704067200
+    assert week_of("2024-01-07") == start
+    assert week_of("2024-01-08") == start + 1
+
+
+def test_weekly_series_keeps_last_row_of_each_week_and_forward_fills():
+    series = weekly_series(
+        [
+            ("2024-01-01", 100),
+            ("2024-01-05", 110),
+            ("2024-01-09T12:00:00", 120),
+            # No rows in the weeks of 2024-01-15 and 2024-01-22.
+            ("2024-01-29", 150),
+        ]
+    )
+    assert series.start_week == week_of("2024-01-01")
+    assert series.prices.tolist() == [110, 120, 120, 120, 150]
+
+
+def test_weekly_series_single_row():
+    series = weekly_series([("2024-01-03", 42)])
+    assert series.start_week == week_of("2024-01-03")
+    assert series.prices.tolist() == [42]
+
+
+def test_portfolio_value_weights_by_quantity_and_aligns_weeks():
+    start = week_of("2024-01-01")
+    early = WeeklySeries(start, np.array([100.0, 110.0, 120.0]))
+    late = WeeklySeries(start + 2, np.array([1_000.0, 1_100.0, 1_200.0]))
+    timestamps, values = portfolio_value([(early, 2), (late, 3)])
+
+    assert timestamps.tolist() == [week_start(start) + i * WEEK for i in range(5)]
+    # `late` counts from its first week; `early` keeps its last price.
+    assert values.tolist() == [200, 220, 240 + 3_000, 240 + 3_300, 240 + 3_600]
+
+
+def test_portfolio_value_of_one_holding_is_its_series_times_quantity():
+    series = weekly_series([("2024-01-01", 100), ("2024-01-22", 130)])
+    _timestamps, values = portfolio_value([(series, 4)])
+    assert values.tolist() == [400, 400, 400, 520]
+
+
+@pytest.fixture
+def same_day_sources(marketdata_db):
+    rows = [
+        ("w1", "2024-01-01", "watchcharts_csv", 100),
+        ("w1", "2024-01-01", "chrono24", 90),
+        ("w1", "2024-01-08", "watchcharts_csv", 130),
+        ("w1", "2024-01-10", "chrono24", 125),
+        ("w1", "2024-01-10", "watchcharts_csv", 140),
+    ]
+    marketdata_db.executemany(
+        "INSERT INTO market_snapshot (watchcharts_id, brand_slug, reference, as_of_date, source, median_usd) "
+        "VALUES (?, 'rolex', '126610LN', ?, ?, ?)",
+        [(watch_id, day, source, price) for watch_id, day, source, price in rows],
+    )
+    marketdata_db.commit()
+    return marketdata_db
+
+
+def test_same_day_sources_resolve_like_summaries(same_day_sources):
+    rows = database.get_market_price_rows(["w1"])["w1"]
+    assert rows[-1] == ("2024-01-10", 125)
+
+    series = load_weekly_series(["w1"])["w1"]
+    assert series.prices.tolist() == [90, 125]
+    summary = database.get_market_summary("w1")
+    assert summary["price"] == series.prices[-1]
+
+
+def test_same_day_sources_resolve_like_materialized_summaries(same_day_sources):
+    from watchcollection_crawler.marketdata import refresh_market_summaries
+
+    refresh_market_summaries(same_day_sources, full=True)
+    assert database.get_market_summary("w1")["price"] == load_weekly_series(["w1"])["w1"].prices[-1] == 125
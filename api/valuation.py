@@ -0,0 +1,69 @@
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from database import get_market_price_rows
+
+DAY_SECONDS = 24 * 3600
+# 1970-01-01 was a Thursday; shifting by three days starts weeks on Monday.
+WEEK_OFFSET_DAYS = 3
+
+
+class WeeklySeries(NamedTuple):
+    """One watch's price on a Monday-aligned weekly grid, gaps forward-filled."""
+
+    # Weeks since the epoch week (see week_start) of prices[0]
+    start_week: int
+    prices: np.ndarray
+
+
+def week_start(week: int) -> int:
+    """Unix timestamp of the Monday 00:00 UTC starting `week`."""
+    return (week * 7 - WEEK_OFFSET_DAYS) * DAY_SECONDS
+
+
+def weekly_series(rows: Sequence[Tuple[str, int]]) -> WeeklySeries:
+    """Align date-ordered (as_of_date, price) rows onto the weekly grid.
+
+    Each week takes its last observation (get_market_price_rows orders a
+    day's rows so that is the source summaries use); weeks without one
+    carry the previous week's price forward.
+    """
+    days = np.array([as_of_date[:10] for as_of_date, _ in rows], dtype="datetime64[D]").astype(np.int64)
+    prices = np.array([price for _, price in rows], dtype=np.float64)
+    weeks = (days + WEEK_OFFSET_DAYS) // 7
+    last_in_week = np.flatnonzero(np.append(weeks[1:] != weeks[:-1], True))
+    weeks = weeks[last_in_week]
+
+    start = int(weeks[0])
+    observed = np.zeros(int(weeks[-1]) - start + 1, dtype=bool)
+    observed[weeks - start] = True
+    filled = np.full(len(observed), np.nan)
+    filled[weeks - start] = prices[last_in_week]
+    # Index of the latest observed week at or before each week.
+    latest = np.maximum.accumulate(np.where(observed, np.arange(len(observed)), 0))
+    return WeeklySeries(start, filled[latest])
+
+
+def load_weekly_series(watch_ids: List[str]) -> Dict[str, WeeklySeries]:
+    """Weekly series for every watch with price data, from one query."""
+    return {watch_id: weekly_series(rows) for watch_id, rows in get_market_price_rows(watch_ids).items()}
+
+
+def portfolio_value(holdings: Sequence[Tuple[WeeklySeries, int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Weekly timestamps and total value of `holdings` (series, quantity).
+
+    The grid runs from the earliest first week to the latest last week of
+    any holding. A holding counts from its first price onwards and keeps
+    its last price after its series ends.
+    """
+    start = min(series.start_week for series, _ in holdings)
+    end = max(series.start_week + len(series.prices) for series, _ in holdings)
+    matrix = np.zeros((len(holdings), end - start))
+    for row, (series, _quantity) in enumerate(holdings):
+        offset = series.start_week - start
+        matrix[row, offset:offset + len(series.prices)] = series.prices
+        matrix[row, offset + len(series.prices):] = series.prices[-1]
+    quantities = np.array([quantity for _, quantity in holdings], dtype=np.float64)
+    timestamps = week_start(start) + np.arange(end - start, dtype=np.int64) * 7 * DAY_SECONDS
+    return timestamps, quantities @ matrix
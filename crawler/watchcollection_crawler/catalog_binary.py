@@ -0,0 +1,320 @@
+"""Binary, memory-mappable catalog written next to catalog_bundle.json.
+
+Layout (native byte order, recorded in the header):
+
+    8 bytes   magic b"WCCAT002"
+    8 bytes   header length (unsigned, little-endian)
+    N bytes   JSON header: version, revision, model count, brand table
+              and the section table {name: [typecode, offset, count]}
+    padding   to an 8-byte boundary
+    sections  typed arrays, each 8-byte aligned, offsets relative to here
+
+Sections are the columns of api/catalog/compact.py: one array per scalar
+field indexed by model ordinal, (offsets, values) pairs for list fields,
+flat timestamp/price arrays for history points, and a string pool stored
+as offsets into one UTF-8 blob. The API maps the file and casts sections
+in place, so every worker shares the same page-cache pages.
+
+The catalog revision and one content hash per model (section
+`model_hashes`, HASH_SIZE bytes per model ordinal) are computed here from
+the bodies the API would serialize, so the API serves them as stored
+instead of re-encoding every model at load time. They match the values
+the API derives when it loads the JSON bundle of the same catalog.
+"""
+import hashlib
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MAGIC = b"WCCAT002"
+ALIGNMENT = 8
+HASH_SIZE = 8
+
+STR = "str"
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+STR_LIST = "str_list"
+POINTS = "points"
+
+NONE_INT = -(2 ** 63)
+NONE_STR = -1
+NONE_BOOL = -1
+
+# Mirrors MODEL_LAYOUT in api/catalog/compact.py. api/tests/test_catalog_binary.py
+# fails if the two drift or a written file does not read back as the JSON load.
+MODEL_LAYOUT = (
+    ("reference", STR),
+    ("reference_aliases", STR_LIST),
+    ("display_name", STR),
+    ("collection", STR),
+    ("style", STR),
+    ("production_year_start", INT),
+    ("production_year_end", INT),
+    ("case", (
+        ("diameter_mm", FLOAT),
+        ("thickness_mm", FLOAT),
+        ("material", STR),
+        ("bezel_material", STR),
+        ("crystal", STR),
+        ("water_resistance_m", INT),
+        ("lug_width_mm", FLOAT),
+        ("dial_color", STR),
+        ("dial_numerals", STR),
+    )),
+    ("movement", (
+        ("type", STR),
+        ("caliber", STR),
+        ("power_reserve_hours", INT),
+        ("frequency_bph", INT),
+        ("jewels_count", INT),
+    )),
+    ("complications", STR_LIST),
+    ("features", STR_LIST),
+    ("retail_price_usd", INT),
+    ("catalog_image_url", STR),
+    ("market_price", (
+        ("min_usd", INT),
+        ("max_usd", INT),
+        ("median_usd", INT),
+        ("listings", INT),
+        ("updated_at", STR),
+    )),
+    ("market_price_history", (
+        ("source", STR),
+        ("points", POINTS),
+    )),
+    ("watchcharts_id", STR),
+    ("watchcharts_url", STR),
+    ("is_current", BOOL),
+)
+
+TYPECODES = {STR: "i", INT: "q", FLOAT: "d", BOOL: "b"}
+
+
+def _encode(value: Any) -> bytes:
+    """Same bytes as `encode_json` in api/catalog/payloads.py."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def _content_hash(data: bytes) -> bytes:
+    """Same digest as `content_hash` in api/catalog/changes.py."""
+    return hashlib.blake2b(data, digest_size=HASH_SIZE).digest()
+
+
+REQUIRED_FIELDS = {"reference", "display_name"}
+
+
+def _invalid(path: str, value: Any, expected: str) -> ValueError:
+    return ValueError(f"{path}: expected {expected}, got {value!r}")
+
+
+def _as_str(path: str, value: Any) -> str:
+    if not isinstance(value, str):
+        raise _invalid(path, value, "a string")
+    return value
+
+
+def _as_int(path: str, value: Any) -> int:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise _invalid(path, value, "an integer")
+    return value
+
+
+def _as_float(path: str, value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise _invalid(path, value, "a finite number")
+    return float(value)
+
+
+def _as_list(path: str, value: Any) -> list:
+    if not isinstance(value, (list, tuple)):
+        raise _invalid(path, value, "a list")
+    return list(value)
+
+
+class _Packer:
+    def __init__(self) -> None:
+        self.string_ids: Dict[str, int] = {}
+        self.string_offsets = array("Q", [0])
+        self.string_data = bytearray()
+        self.sections: Dict[str, array] = {"brand": array("I")}
+        self._add_columns(MODEL_LAYOUT, "")
+
+    def _add_columns(self, layout: tuple, prefix: str) -> None:
+        for name, kind in layout:
+            path = prefix + name
+            if isinstance(kind, tuple):
+                self.sections[path] = array("b")
+                self._add_columns(kind, path + ".")
+            elif kind == STR_LIST:
+                self.sections[path + ".offsets"] = array("I", [0])
+                self.sections[path + ".values"] = array("i")
+            elif kind == POINTS:
+                self.sections[path] = array("b")
+                self.sections[path + ".offsets"] = array("I", [0])
+                self.sections[path + ".ts"] = array("d")
+                self.sections[path + ".price"] = array("d")
+            else:
+                self.sections[path] = array(TYPECODES[kind])
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE_STR
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.string_offsets) - 1
+            self.string_ids[value] = string_id
+            self.string_data += value.encode("utf-8")
+            self.string_offsets.append(len(self.string_data))
+        return string_id
+
+    def pack(self, layout: tuple, prefix: str, obj: Optional[dict]) -> Dict[str, Any]:
+        """Append one model's columns and return it as the API will read it back.
+
+        Values must already have the types the API's schema declares
+        (integral floats count as integers); anything the API would coerce
+        or reject raises ValueError, so a file that is written always reads
+        back exactly as the JSON bundle validates.
+        """
+        sections = self.sections
+        result: Dict[str, Any] = {}
+        for name, kind in layout:
+            path = prefix + name
+            value = obj.get(name) if obj else None
+            if value is None and not prefix and name in REQUIRED_FIELDS:
+                raise _invalid(path, value, "a value")
+            if isinstance(kind, tuple):
+                if value is not None and not isinstance(value, dict):
+                    raise _invalid(path, value, "an object")
+                sections[path].append(0 if value is None else 1)
+                packed = self.pack(kind, path + ".", value)
+                result[name] = None if value is None else packed
+            elif kind == STR:
+                text = None if value is None else _as_str(path, value)
+                sections[path].append(self.intern(text))
+                result[name] = text
+            elif kind == INT:
+                number = None if value is None else _as_int(path, value)
+                sections[path].append(NONE_INT if number is None else number)
+                result[name] = number
+            elif kind == FLOAT:
+                number = None if value is None else _as_float(path, value)
+                sections[path].append(float("nan") if number is None else number)
+                result[name] = number
+            elif kind == BOOL:
+                if value is not None and not isinstance(value, bool):
+                    raise _invalid(path, value, "true or false")
+                sections[path].append(NONE_BOOL if value is None else int(value))
+                result[name] = value
+            elif kind == STR_LIST:
+                if value is None and obj and name in obj:
+                    raise _invalid(path, value, "a list")
+                items = [_as_str(path, item) for item in _as_list(path, value or [])]
+                values = sections[path + ".values"]
+                for item in items:
+                    values.append(self.intern(item))
+                sections[path + ".offsets"].append(len(values))
+                result[name] = items
+            elif kind == POINTS:
+                timestamps = sections[path + ".ts"]
+                prices = sections[path + ".price"]
+                sections[path].append(0 if value is None else 1)
+                points = []
+                for point in _as_list(path, value or []):
+                    point = _as_list(path, point)
+                    if len(point) != 2:
+                        raise _invalid(path, point, "[timestamp, price]")
+                    points.append([_as_float(path, point[0]), _as_float(path, point[1])])
+                    timestamps.append(points[-1][0])
+                    prices.append(points[-1][1])
+                sections[path + ".offsets"].append(len(timestamps))
+                result[name] = None if value is None else points
+        return result
+
+
+def write_catalog_binary(catalog: dict, output_file: Path) -> int:
+    """Write `catalog` (the bundle dict) as a mappable file. Returns model count.
+
+    The file is written to a temporary name and renamed into place, so a
+    process that has the previous file mapped keeps reading intact pages.
+    Model hashes and the revision are digests of the serialized model,
+    brand and catalog bodies, assembled exactly as the API's `/catalog`
+    body is. Raises ValueError, before anything is written, if a value
+    does not have the type the API's schema declares.
+    """
+    packer = _Packer()
+    version = catalog.get("version", "0.0.0")
+    brands: List[list] = []
+    brand_bodies: List[bytes] = []
+    model_hashes = bytearray()
+    count = 0
+    for brand in catalog.get("brands", []):
+        _as_str("brand.id", brand.get("id"))
+        _as_str("brand.name", brand.get("name"))
+        for field in ("country", "tier"):
+            if brand.get(field) is not None:
+                _as_str(f"brand.{field}", brand[field])
+        start = count
+        model_bodies: List[bytes] = []
+        for model in _as_list("brand.models", brand.get("models")):
+            if not isinstance(model, dict):
+                raise _invalid("model", model, "an object")
+            packer.sections["brand"].append(len(brands))
+            body = _encode(packer.pack(MODEL_LAYOUT, "", model))
+            model_hashes += _content_hash(body)
+            model_bodies.append(body)
+            count += 1
+        info = {"id": brand["id"], "name": brand["name"], "country": brand.get("country"), "tier": brand.get("tier")}
+        brand_bodies.append(_encode(info)[:-1] + b',"models":[' + b",".join(model_bodies) + b"]}")
+        brands.append([brand["id"], brand["name"], brand.get("country"), brand.get("tier"), start, count])
+
+    catalog_body = b'{"version":' + _encode(version) + b',"brands":[' + b",".join(brand_bodies) + b"]}"
+    revision = _content_hash(catalog_body).hex()
+    del brand_bodies, catalog_body
+
+    packer.sections["strings.offsets"] = packer.string_offsets
+    packer.sections["strings.data"] = array("B", bytes(packer.string_data))
+    packer.sections["model_hashes"] = array("B", bytes(model_hashes))
+
+    table: Dict[str, list] = {}
+    offset = 0
+    for name, values in packer.sections.items():
+        table[name] = [values.typecode, offset, len(values)]
+        size = len(values) * values.itemsize
+        offset += size + (-size % ALIGNMENT)
+
+    header = json.dumps({
+        "version": version,
+        "revision": revision,
+        "byteorder": sys.byteorder,
+        "count": count,
+        "brands": brands,
+        "sections": table,
+    }).encode("utf-8")
+    prefix = MAGIC + struct.pack("<Q", len(header)) + header
+    prefix += b"\0" * (-len(prefix) % ALIGNMENT)
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=output_file.parent, prefix=f".{output_file.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(prefix)
+            for values in packer.sections.values():
+                data = values.tobytes()
+                f.write(data)
+                f.write(b"\0" * (-len(data) % ALIGNMENT))
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, output_file)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return count
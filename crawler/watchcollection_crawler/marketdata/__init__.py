@@ -5,6 +5,8 @@ from .db import (
     start_ingest_run,
     finish_ingest_run,
     record_ingest_run,
+    refresh_market_summaries,
+    refresh_snapshot_coverage,
     insert_snapshot,
     insert_snapshots_batch,
     upsert_snapshot,
@@ -28,6 +30,14 @@ from .import_watchcharts_csv import (
     build_catalog_lookup,
     iter_csv_files,
 )
+from .downsample import (
+    MODES as DOWNSAMPLE_MODES,
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+    week_numbers,
+    weekly_indices,
+)
 from .series import (
     get_history_points,
     get_combined_source_label,
@@ -44,6 +54,8 @@ __all__ = [
     "start_ingest_run",
     "finish_ingest_run",
     "record_ingest_run",
+    "refresh_market_summaries",
+    "refresh_snapshot_coverage",
     "insert_snapshot",
     "insert_snapshots_batch",
     "upsert_snapshot",
@@ -68,4 +80,10 @@ __all__ = [
     "get_all_snapshots",
     "downsample_weekly",
     "HistoryPoint",
+    "DOWNSAMPLE_MODES",
+    "downsample_indices",
+    "lttb_indices",
+    "minmax_indices",
+    "week_numbers",
+    "weekly_indices",
 ]
@@ -19,6 +19,16 @@ def init_schema(conn: sqlite3.Connection) -> None:
     schema_sql = schema_path.read_text()
     conn.executescript(schema_sql)
     conn.commit()
+    if not conn.execute("SELECT EXISTS (SELECT 1 FROM market_snapshot)").fetchone()[0]:
+        return
+    if not conn.execute("SELECT EXISTS (SELECT 1 FROM market_summary)").fetchone()[0]:
+        # Summary table added to an existing database: backfill it once, so
+        # the API never mixes materialized rows with watches it has to
+        # compute against today's date.
+        refresh_market_summaries(conn, full=True)
+    if not conn.execute("SELECT EXISTS (SELECT 1 FROM snapshot_coverage)").fetchone()[0]:
+        # Coverage table added to an existing database: backfill it once.
+        refresh_snapshot_coverage(conn, full=True)
 
 
 @contextmanager
@@ -70,6 +80,147 @@ def finish_ingest_run(
         ),
     )
     conn.commit()
+    refresh_market_summaries(conn)
+    refresh_snapshot_coverage(conn)
+
+
+_SUMMARY_PRICE_AT = """
+    (SELECT p.median_usd FROM market_snapshot p
+     WHERE p.watchcharts_id = l.watchcharts_id AND p.median_usd IS NOT NULL
+       AND p.as_of_date <= date('now', '{offset}')
+     ORDER BY p.as_of_date DESC, p.source LIMIT 1)
+"""
+
+
+def _change_pct(offset: str) -> str:
+    price_at = _SUMMARY_PRICE_AT.format(offset=offset)
+    return f"CASE WHEN {price_at} <> 0 THEN ROUND((l.median_usd - {price_at}) * 100.0 / {price_at}, 2) END"
+
+
+def refresh_market_summaries(conn: sqlite3.Connection, full: bool = False) -> int:
+    """Recompute market_summary rows for the watches queued by the snapshot triggers.
+
+    Rows refreshed on an earlier day are redone too, so the 1m/6m/1y
+    comparison dates keep moving. `full` rebuilds every watch. Returns the
+    number of watches recomputed.
+    """
+    if full:
+        conn.execute(
+            "INSERT OR IGNORE INTO market_summary_dirty (watchcharts_id) "
+            "SELECT DISTINCT watchcharts_id FROM market_snapshot"
+        )
+    conn.execute(
+        "INSERT OR IGNORE INTO market_summary_dirty (watchcharts_id) "
+        "SELECT watchcharts_id FROM market_summary WHERE refreshed_at < date('now')"
+    )
+    count = conn.execute("SELECT COUNT(*) FROM market_summary_dirty").fetchone()[0]
+    if not count:
+        return 0
+
+    conn.execute("DELETE FROM market_summary WHERE watchcharts_id IN (SELECT watchcharts_id FROM market_summary_dirty)")
+    conn.execute(
+        f"""
+        INSERT INTO market_summary (
+            watchcharts_id, as_of_date, median_usd, min_usd, max_usd, listings_count,
+            change_1m_pct, change_6m_pct, change_1y_pct, refreshed_at
+        )
+        WITH latest AS (
+            SELECT s.watchcharts_id, s.as_of_date, s.median_usd, s.min_usd, s.max_usd, s.listings_count,
+                   ROW_NUMBER() OVER (PARTITION BY s.watchcharts_id ORDER BY s.as_of_date DESC, s.source) AS rn
+            FROM market_snapshot s
+            JOIN market_summary_dirty d ON d.watchcharts_id = s.watchcharts_id
+            WHERE s.median_usd IS NOT NULL
+        )
+        SELECT l.watchcharts_id, l.as_of_date, l.median_usd, l.min_usd, l.max_usd, l.listings_count,
+               {_change_pct("-30 days")},
+               {_change_pct("-180 days")},
+               {_change_pct("-365 days")},
+               datetime('now')
+        FROM latest l
+        WHERE l.rn = 1
+        """
+    )
+    conn.execute("DELETE FROM market_summary_dirty")
+    conn.commit()
+    return count
+
+
+def refresh_snapshot_coverage(conn: sqlite3.Connection, full: bool = False) -> int:
+    """Recompute snapshot_coverage rows for the watches queued by the snapshot triggers.
+
+    Snapshots that extend a watch's series are applied by a trigger as they
+    are inserted; this handles new watches and out-of-order, updated or
+    deleted snapshots. `full` rebuilds every watch. Returns the number of
+    watches recomputed.
+    """
+    if full:
+        conn.execute("DELETE FROM snapshot_coverage")
+        conn.execute(
+            "INSERT OR IGNORE INTO snapshot_coverage_dirty (watchcharts_id) "
+            "SELECT DISTINCT watchcharts_id FROM market_snapshot"
+        )
+    count = conn.execute("SELECT COUNT(*) FROM snapshot_coverage_dirty").fetchone()[0]
+    if not count:
+        return 0
+
+    unregistered = conn.execute(
+        """
+        SELECT DISTINCT s.source
+        FROM market_snapshot s
+        JOIN snapshot_coverage_dirty d ON d.watchcharts_id = s.watchcharts_id
+        WHERE s.source NOT IN (SELECT source FROM snapshot_source)
+        """
+    ).fetchall()
+    for (source,) in unregistered:
+        conn.execute(
+            "INSERT INTO snapshot_source (source, bit) "
+            "VALUES (?, (SELECT COALESCE(MAX(bit) * 2, 1) FROM snapshot_source))",
+            (source,),
+        )
+
+    conn.execute(
+        "DELETE FROM snapshot_coverage WHERE watchcharts_id IN (SELECT watchcharts_id FROM snapshot_coverage_dirty)"
+    )
+    conn.execute(
+        """
+        INSERT INTO snapshot_coverage (
+            watchcharts_id, brand_slug, reference, first_date, last_date,
+            points, days, sources, gap_count, largest_gap_days
+        )
+        WITH rows AS (
+            SELECT s.watchcharts_id, s.brand_slug, s.reference, s.as_of_date, s.source
+            FROM market_snapshot s
+            JOIN snapshot_coverage_dirty d ON d.watchcharts_id = s.watchcharts_id
+        ),
+        days AS (
+            SELECT watchcharts_id, as_of_date, COUNT(*) AS points,
+                   julianday(as_of_date)
+                   - julianday(LAG(as_of_date) OVER (PARTITION BY watchcharts_id ORDER BY as_of_date)) AS gap
+            FROM rows
+            GROUP BY watchcharts_id, as_of_date
+        ),
+        source_bits AS (
+            SELECT watchcharts_id, SUM(bit) AS sources
+            FROM (SELECT DISTINCT r.watchcharts_id, b.bit FROM rows r JOIN snapshot_source b ON b.source = r.source)
+            GROUP BY watchcharts_id
+        ),
+        latest AS (
+            SELECT watchcharts_id, brand_slug, reference,
+                   ROW_NUMBER() OVER (PARTITION BY watchcharts_id ORDER BY as_of_date DESC, source) AS rn
+            FROM rows
+        )
+        SELECT d.watchcharts_id, l.brand_slug, l.reference, MIN(d.as_of_date), MAX(d.as_of_date),
+               SUM(d.points), COUNT(*), IFNULL(b.sources, 0),
+               COUNT(CASE WHEN d.gap > 7 THEN 1 END), IFNULL(CAST(MAX(d.gap) AS INTEGER), 0)
+        FROM days d
+        JOIN latest l ON l.watchcharts_id = d.watchcharts_id AND l.rn = 1
+        LEFT JOIN source_bits b ON b.watchcharts_id = d.watchcharts_id
+        GROUP BY d.watchcharts_id
+        """
+    )
+    conn.execute("DELETE FROM snapshot_coverage_dirty")
+    conn.commit()
+    return count
 
 
 def record_ingest_run(
@@ -38,3 +38,143 @@ CREATE TABLE IF NOT EXISTS ingest_run (
 
 CREATE INDEX IF NOT EXISTS idx_ingest_pipeline ON ingest_run(pipeline);
 CREATE INDEX IF NOT EXISTS idx_ingest_started_at ON ingest_run(started_at);
+
+-- Latest price and 1m/6m/1y changes per watch, so API summary reads are a
+-- single primary-key lookup. Refreshed by refresh_market_summaries at the
+-- end of every ingest run; the triggers below queue the watches to redo.
+--
+-- Triggers are recreated on every init_schema so existing databases pick up
+-- changes. They queue watches with INSERT ... WHERE NOT EXISTS rather than
+-- INSERT OR IGNORE: inside an upsert's DO UPDATE, SQLite applies the outer
+-- statement's conflict policy, so OR IGNORE would abort the upsert.
+CREATE TABLE IF NOT EXISTS market_summary (
+    watchcharts_id TEXT PRIMARY KEY,
+    as_of_date TEXT NOT NULL,
+    median_usd INTEGER NOT NULL,
+    min_usd INTEGER,
+    max_usd INTEGER,
+    listings_count INTEGER,
+    change_1m_pct REAL,
+    change_6m_pct REAL,
+    change_1y_pct REAL,
+    refreshed_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS market_summary_dirty (
+    watchcharts_id TEXT PRIMARY KEY
+) WITHOUT ROWID;
+
+DROP TRIGGER IF EXISTS trg_snapshot_insert_summary;
+CREATE TRIGGER trg_snapshot_insert_summary AFTER INSERT ON market_snapshot
+BEGIN
+    INSERT INTO market_summary_dirty (watchcharts_id) SELECT NEW.watchcharts_id
+    WHERE NOT EXISTS (SELECT 1 FROM market_summary_dirty WHERE watchcharts_id = NEW.watchcharts_id);
+END;
+
+DROP TRIGGER IF EXISTS trg_snapshot_update_summary;
+CREATE TRIGGER trg_snapshot_update_summary AFTER UPDATE ON market_snapshot
+BEGIN
+    INSERT INTO market_summary_dirty (watchcharts_id) SELECT OLD.watchcharts_id
+    WHERE NOT EXISTS (SELECT 1 FROM market_summary_dirty WHERE watchcharts_id = OLD.watchcharts_id);
+    INSERT INTO market_summary_dirty (watchcharts_id) SELECT NEW.watchcharts_id
+    WHERE NOT EXISTS (SELECT 1 FROM market_summary_dirty WHERE watchcharts_id = NEW.watchcharts_id);
+END;
+
+DROP TRIGGER IF EXISTS trg_snapshot_delete_summary;
+CREATE TRIGGER trg_snapshot_delete_summary AFTER DELETE ON market_snapshot
+BEGIN
+    INSERT INTO market_summary_dirty (watchcharts_id) SELECT OLD.watchcharts_id
+    WHERE NOT EXISTS (SELECT 1 FROM market_summary_dirty WHERE watchcharts_id = OLD.watchcharts_id);
+END;
+
+-- One bit per snapshot source, for snapshot_coverage.sources. Sources not
+-- listed here get the next free bit on their first insert.
+CREATE TABLE IF NOT EXISTS snapshot_source (
+    source TEXT PRIMARY KEY,
+    bit INTEGER NOT NULL UNIQUE
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO snapshot_source (source, bit) VALUES ('watchcharts_csv', 1), ('chrono24', 2);
+
+-- History coverage per watch, so /stats/coverage does not scan
+-- market_snapshot. A gap is more than 7 days between consecutive observed
+-- days (from any source). The insert trigger below updates a row in place
+-- when a snapshot extends the series; new watches and out-of-order,
+-- updated or deleted snapshots are queued and recomputed by
+-- refresh_snapshot_coverage at the end of every ingest run.
+CREATE TABLE IF NOT EXISTS snapshot_coverage (
+    watchcharts_id TEXT PRIMARY KEY,
+    brand_slug TEXT NOT NULL,
+    reference TEXT NOT NULL,
+    first_date TEXT NOT NULL,
+    last_date TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    days INTEGER NOT NULL,
+    sources INTEGER NOT NULL,
+    gap_count INTEGER NOT NULL,
+    largest_gap_days INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_coverage_brand_slug ON snapshot_coverage(brand_slug, reference);
+
+CREATE TABLE IF NOT EXISTS snapshot_coverage_dirty (
+    watchcharts_id TEXT PRIMARY KEY
+) WITHOUT ROWID;
+
+DROP TRIGGER IF EXISTS trg_snapshot_register_source;
+CREATE TRIGGER trg_snapshot_register_source BEFORE INSERT ON market_snapshot
+BEGIN
+    INSERT INTO snapshot_source (source, bit)
+    SELECT NEW.source, (SELECT COALESCE(MAX(bit) * 2, 1) FROM snapshot_source)
+    WHERE NOT EXISTS (SELECT 1 FROM snapshot_source WHERE source = NEW.source);
+END;
+
+DROP TRIGGER IF EXISTS trg_snapshot_register_source_update;
+CREATE TRIGGER trg_snapshot_register_source_update BEFORE UPDATE OF source ON market_snapshot
+BEGIN
+    INSERT INTO snapshot_source (source, bit)
+    SELECT NEW.source, (SELECT COALESCE(MAX(bit) * 2, 1) FROM snapshot_source)
+    WHERE NOT EXISTS (SELECT 1 FROM snapshot_source WHERE source = NEW.source);
+END;
+
+DROP TRIGGER IF EXISTS trg_snapshot_append_coverage;
+CREATE TRIGGER trg_snapshot_append_coverage AFTER INSERT ON market_snapshot
+WHEN NEW.as_of_date >= (SELECT last_date FROM snapshot_coverage WHERE watchcharts_id = NEW.watchcharts_id)
+BEGIN
+    UPDATE snapshot_coverage SET
+        brand_slug = NEW.brand_slug,
+        reference = NEW.reference,
+        points = points + 1,
+        days = days + (NEW.as_of_date > last_date),
+        sources = sources | (SELECT bit FROM snapshot_source WHERE source = NEW.source),
+        gap_count = gap_count + (julianday(NEW.as_of_date) - julianday(last_date) > 7),
+        largest_gap_days = MAX(largest_gap_days, CAST(julianday(NEW.as_of_date) - julianday(last_date) AS INTEGER)),
+        last_date = NEW.as_of_date
+    WHERE watchcharts_id = NEW.watchcharts_id;
+END;
+
+DROP TRIGGER IF EXISTS trg_snapshot_insert_coverage;
+CREATE TRIGGER trg_snapshot_insert_coverage AFTER INSERT ON market_snapshot
+WHEN NOT EXISTS (SELECT 1 FROM snapshot_coverage WHERE watchcharts_id = NEW.watchcharts_id)
+  OR NEW.as_of_date < (SELECT last_date FROM snapshot_coverage WHERE watchcharts_id = NEW.watchcharts_id)
+BEGIN
+    INSERT INTO snapshot_coverage_dirty (watchcharts_id) SELECT NEW.watchcharts_id
+    WHERE NOT EXISTS (SELECT 1 FROM snapshot_coverage_dirty WHERE watchcharts_id = NEW.watchcharts_id);
+END;
+
+DROP TRIGGER IF EXISTS trg_snapshot_update_coverage;
+CREATE TRIGGER trg_snapshot_update_coverage
+AFTER UPDATE OF watchcharts_id, as_of_date, source ON market_snapshot
+BEGIN
+    INSERT INTO snapshot_coverage_dirty (watchcharts_id) SELECT OLD.watchcharts_id
+    WHERE NOT EXISTS (SELECT 1 FROM snapshot_coverage_dirty WHERE watchcharts_id = OLD.watchcharts_id);
+    INSERT INTO snapshot_coverage_dirty (watchcharts_id) SELECT NEW.watchcharts_id
+    WHERE NOT EXISTS (SELECT 1 FROM snapshot_coverage_dirty WHERE watchcharts_id = NEW.watchcharts_id);
+END;
+
+DROP TRIGGER IF EXISTS trg_snapshot_delete_coverage;
+CREATE TRIGGER trg_snapshot_delete_coverage AFTER DELETE ON market_snapshot
+BEGIN
+    INSERT INTO snapshot_coverage_dirty (watchcharts_id) SELECT OLD.watchcharts_id
+    WHERE NOT EXISTS (SELECT 1 FROM snapshot_coverage_dirty WHERE watchcharts_id = OLD.watchcharts_id);
+END;
@@ -3,6 +3,7 @@ from datetime import date
 from sqlite3 import Connection
 from typing import List, Optional, Tuple
 
+from .downsample import weekly_indices
 from .models import SnapshotSource
 
 
@@ -47,29 +48,10 @@ def get_all_snapshots(
 
 
 def downsample_weekly(points: List[HistoryPoint]) -> List[HistoryPoint]:
+    """Last point of each ISO week, bucketed exactly like the API's history."""
     if not points:
         return []
-
-    result = []
-    current_week = None
-    current_point = None
-
-    for pt in points:
-        pt_date = date.fromtimestamp(pt.timestamp)
-        week_start = pt_date.isocalendar()[:2]
-
-        if week_start != current_week:
-            if current_point is not None:
-                result.append(current_point)
-            current_week = week_start
-            current_point = pt
-        else:
-            current_point = pt
-
-    if current_point is not None:
-        result.append(current_point)
-
-    return result
+    return [points[i] for i in weekly_indices([pt.timestamp for pt in points])]
 
 
 def get_history_points(
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+import argparse
+import time
+from pathlib import Path
+
+from watchcollection_crawler.core.paths import MARKETDATA_DB_PATH
+from watchcollection_crawler.marketdata import get_db, refresh_market_summaries, refresh_snapshot_coverage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh the materialized market_summary and snapshot_coverage tables")
+    parser.add_argument(
+        "--db-path",
+        type=str,
+        default=None,
+        help=f"Path to marketdata SQLite DB (default: {MARKETDATA_DB_PATH})",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Recompute every watch instead of only those changed since the last refresh",
+    )
+    args = parser.parse_args()
+
+    db_path = Path(args.db_path) if args.db_path else MARKETDATA_DB_PATH
+    start = time.perf_counter()
+    with get_db(db_path) as conn:
+        count = refresh_market_summaries(conn, full=args.full)
+        coverage_count = refresh_snapshot_coverage(conn, full=args.full)
+    print(
+        f"Refreshed {count} market summaries and {coverage_count} coverage rows "
+        f"in {time.perf_counter() - start:.1f}s",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
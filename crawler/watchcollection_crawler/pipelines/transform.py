@@ -10,6 +10,7 @@ from watchcollection_crawler.config import get_brand_by_name
 from watchcollection_crawler.core.paths import WATCHCHARTS_OUTPUT_DIR, API_DATA_DIR, MARKETDATA_DB_PATH
 from watchcollection_crawler.utils.strings import slugify
 from watchcollection_crawler.brand_rules import clean_display_name
+from watchcollection_crawler.catalog_binary import write_catalog_binary
 from watchcollection_crawler.reference_matcher import generate_aliases
 from watchcollection_crawler.marketdata.series import get_history_points, get_combined_source_label, get_latest_price
 from watchcollection_crawler.marketdata.models import SnapshotSource
@@ -276,6 +277,7 @@ def transform_all(
     manifest_dir: Path,
     brand_slug: Optional[str],
     db_path: Optional[Path] = None,
+    binary_output: Optional[Path] = None,
 ) -> None:
     brands = []
     db_conn = None
@@ -320,6 +322,14 @@ def transform_all(
 
         total_models = sum(len(b["models"]) for b in brands)
         print(f"\nDone! Saved {len(brands)} brands, {total_models} models to {output_file}")
+
+        if binary_output:
+            try:
+                write_catalog_binary(catalog, binary_output)
+            except ValueError as exc:
+                print(f"Skipped memory-mappable catalog, the API will load the JSON bundle: {exc}")
+            else:
+                print(f"Saved memory-mappable catalog to {binary_output}")
     finally:
         if db_conn:
             db_conn.close()
@@ -336,6 +346,11 @@ def main() -> None:
         type=str,
         help=f"Path to marketdata SQLite DB (default: {MARKETDATA_DB_PATH})",
     )
+    parser.add_argument(
+        "--no-binary",
+        action="store_true",
+        help="Skip the memory-mappable catalog_bundle.bin written next to the bundle",
+    )
     args = parser.parse_args()
 
     input_dir = Path(args.input_dir) if args.input_dir else WATCHCHARTS_OUTPUT_DIR
@@ -343,7 +358,9 @@ def main() -> None:
     output_file = Path(args.output) if args.output else API_DATA_DIR / "catalog_bundle.json"
     db_path = Path(args.marketdata_db) if args.marketdata_db else MARKETDATA_DB_PATH
 
-    transform_all(input_dir, output_file, manifest_dir, args.brand_slug, db_path)
+    binary_output = None if args.no_binary else output_file.with_suffix(".bin")
+
+    transform_all(input_dir, output_file, manifest_dir, args.brand_slug, db_path, binary_output)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,9 @@
+"""Brand-specific reference normalization and alias generation.
+
+api/reference_matcher.py is a copy for /models/{reference}, so the API runs
+without the crawler; api/tests/test_reference_matcher.py checks that the
+two agree.
+"""
 import re
 import json
 from pathlib import Path